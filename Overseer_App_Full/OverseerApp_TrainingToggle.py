@@ -2,50 +2,48 @@ from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QTextEdit,
     QVBoxLayout, QComboBox, QMessageBox, QCheckBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QObject, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal, QObject
 import threading
 import sys
 
-# --- Mock implementations for standalone execution ---
-def simulate_certification(agent_response_func):
-    response = agent_response_func()
-    return {
-        "logic": {
-            "question": "What is 2+2?",
-            "answer": response,
-            "evaluation": "correct" if response == "4" else "incorrect"
-        },
-        "creativity": {
-            "question": "What is a novel use for a paperclip?",
-            "answer": "A tiny grappling hook.",
-            "evaluation": "passed"
-        }
-    }
-
-def mock_agent_response():
-    return "4"
+from overseer_core.agents import AGENTS, AgentLoadError
+from overseer_core.pipeline import Pipeline
 
 class WorkerSignals(QObject):
     result_ready = pyqtSignal(dict)
 
 class CertificationWorker(threading.Thread):
-    def __init__(self, agent_name, signals):
+    def __init__(self, agent_name, signals, loop_mode=False):
         super().__init__()
         self.agent_name = agent_name
         self.signals = signals
+        self.loop_mode = loop_mode
+        self.pipeline = None
+        self._stop_event = threading.Event()
 
     def run(self):
-        if self.agent_name == "MockAgent":
-            results = simulate_certification(mock_agent_response)
-        else:
-            results = {
+        try:
+            # Training mode repeats the certification every 8 seconds until it is switched off.
+            self.pipeline = Pipeline(self.agent_name, iterations=None if self.loop_mode else 1,
+                                     interval=8 if self.loop_mode else None)
+        except (KeyError, AgentLoadError) as e:
+            self.signals.result_ready.emit({
                 "status": {
                     "question": "N/A",
                     "answer": "N/A",
-                    "evaluation": f"Agent '{self.agent_name}' is not yet integrated."
+                    "evaluation": f"Agent '{self.agent_name}' is not available: {e}"
                 }
-            }
-        self.signals.result_ready.emit(results)
+            })
+            return
+        if self._stop_event.is_set():
+            self.pipeline.stop()
+        for _, results in self.pipeline.iterations():
+            self.signals.result_ready.emit(results)
+
+    def stop(self):
+        self._stop_event.set()
+        if self.pipeline is not None:
+            self.pipeline.stop()
 
 class OverseerApp(QWidget):
     def __init__(self):
@@ -54,7 +52,7 @@ class OverseerApp(QWidget):
         self.resize(800, 600)
 
         self.agent_selector = QComboBox()
-        self.agent_selector.addItems(["MockAgent", "FutureAgent1", "FutureAgent2"])
+        self.agent_selector.addItems(AGENTS.listed())
 
         self.run_button = QPushButton("Run Certification")
         self.run_button.clicked.connect(self.run_certification)
@@ -63,6 +61,8 @@ class OverseerApp(QWidget):
         self.output_area.setReadOnly(True)
 
         self.training_mode = QCheckBox("Training Mode")
+        self.training_mode.toggled.connect(self.on_training_mode_toggled)
+        self.worker = None
 
         layout = QVBoxLayout()
         layout.addWidget(QLabel("Select Agent:"))
@@ -80,12 +80,18 @@ class OverseerApp(QWidget):
         self.signals = WorkerSignals()
         self.signals.result_ready.connect(self.display_results)
 
-        self.worker = CertificationWorker(agent, self.signals)
+        if self.worker and self.worker.is_alive():
+            self.worker.stop()
+        loop_mode = self.training_mode.isChecked()
+        self.worker = CertificationWorker(agent, self.signals, loop_mode=loop_mode)
         self.worker.start()
 
-        if self.training_mode.isChecked():
+        if loop_mode:
             self.output_area.append("🔁 Training Mode is ON. Will repeat certification.\n")
-            QTimer.singleShot(8000, self.run_certification)  # Repeat after 8 seconds
+
+    def on_training_mode_toggled(self, checked):
+        if not checked and self.worker and self.worker.loop_mode:
+            self.worker.stop()
 
     def display_results(self, results):
         for domain, result in results.items():
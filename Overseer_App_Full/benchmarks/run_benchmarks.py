@@ -0,0 +1,264 @@
+"""Headless benchmarks for the certification engine, logging and analytics hot paths.
+
+Run from the project root (no display or Qt needed):
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 1e3,1e5,1e7 --save-baseline main
+    python -m benchmarks.run_benchmarks --compare main --threshold 0.15
+
+Size-dependent benchmarks run once per synthetic log size. Generated logs are
+cached in --data-dir so large sizes only pay the generation cost once.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from overseer_core import training_log
+from overseer_core.agent_mock import mock_agent_response
+from overseer_core.cert_engine import simulate_certification_test
+from overseer_core.records import ResultRecord, decode_json, encode_json
+from benchmarks.synthetic_logs import cached_jsonl_log, iter_entries, write_json_array_log
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+BENCHMARKS = {}
+
+
+class Benchmark:
+    def __init__(self, name, setup, sized, max_size):
+        self.name = name
+        self.setup = setup
+        self.sized = sized
+        self.max_size = max_size
+
+
+def benchmark(name, sized=False, max_size=None):
+    """Registers a setup function returning ``(callable_to_time, operations_per_call)``."""
+    def decorator(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, sized, max_size)
+        return setup
+    return decorator
+
+
+# --- Benchmarks ---
+@benchmark("simulate_certification_test")
+def _bench_simulate(ctx, size):
+    runs = 200
+    def run():
+        for _ in range(runs):
+            simulate_certification_test(mock_agent_response)
+    return run, runs
+
+
+@benchmark("_append_to_log")
+def _bench_append(ctx, size):
+    path = os.path.join(ctx["scratch"], "append.jsonl")
+    entries = list(iter_entries(2_000))
+    def run():
+        for entry in entries:
+            training_log._append_to_log(path, entry)
+    return run, len(entries)
+
+
+@benchmark("log_test_result")
+def _bench_log_test_result(ctx, size):
+    results = [(e["domain"], {"question": e["question"], "answer": e["answer"],
+                              "evaluation": e["evaluation"], "keywords": e["keywords_used"]})
+               for e in iter_entries(2_000)]
+    def run():
+        for domain, result in results:
+            training_log.log_test_result("MockAgent", domain, result)
+    return run, len(results)
+
+
+@benchmark("records_encode_json")
+def _bench_encode(ctx, size):
+    records = [ResultRecord.from_dict(e) for e in iter_entries(10_000)]
+    def run():
+        for record in records:
+            encode_json(record)
+    return run, len(records)
+
+
+@benchmark("records_decode_json")
+def _bench_decode(ctx, size):
+    lines = [json.dumps(e).encode("utf-8") for e in iter_entries(10_000)]
+    def run():
+        for line in lines:
+            decode_json(line)
+    return run, len(lines)
+
+
+@benchmark("semantic_grader_score_batch")
+def _bench_semantic(ctx, size):
+    from overseer_core.cert_engine import CERT_QUESTIONS
+    from overseer_core.semantic_grader import SemanticGrader
+    pairs = [(e["question"], e["answer"]) for e in iter_entries(4_000)]
+    def run():
+        # A fresh grader each pass, so every answer misses the memo cache.
+        SemanticGrader(CERT_QUESTIONS).score_batch(pairs)
+    return run, len(pairs)
+
+
+@benchmark("_load_jsonl_log", sized=True)
+def _bench_load(ctx, size):
+    path = cached_jsonl_log(ctx["data_dir"], size)
+    return (lambda: training_log._load_jsonl_log(path)), size
+
+
+@benchmark("analyze_agent_performance", sized=True)
+def _bench_analyze(ctx, size):
+    training_log.TRAINING_LOG_PATH = cached_jsonl_log(ctx["data_dir"], size)
+    return training_log.analyze_agent_performance, size
+
+
+@benchmark("json_array_read_modify_write", sized=True, max_size=100_000)
+def _bench_json_rmw(ctx, size):
+    path = write_json_array_log(os.path.join(ctx["scratch"], f"array_{size}.json"), size)
+    entry = {"timestamp": datetime.utcnow().isoformat() + "Z", "agent": "MockAgent", "results": {}}
+    return (lambda: training_log.append_to_json_array_log(path, entry)), 1
+
+
+# --- Runner ---
+def _time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmarks(sizes, only=None, repeat=5, data_dir=None):
+    """Runs the selected benchmarks and returns a results document."""
+    scratch = tempfile.mkdtemp(prefix="overseer-bench-")
+    data_dir = data_dir or os.path.join(scratch, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    ctx = {"scratch": scratch, "data_dir": data_dir}
+
+    # Point the module-level log paths at scratch files so the real logs are untouched.
+    saved_paths = (training_log.LOG_DIR, training_log.TRAINING_LOG_PATH, training_log.FAILURE_LOG_PATH)
+    training_log.LOG_DIR = os.path.join(scratch, "logs")
+    training_log.FAILURE_LOG_PATH = os.path.join(training_log.LOG_DIR, "failure_memory.jsonl")
+
+    results = {}
+    try:
+        for bench in BENCHMARKS.values():
+            if only and bench.name not in only:
+                continue
+            for size in (sizes if bench.sized else [None]):
+                if size is not None and bench.max_size and size > bench.max_size:
+                    print(f"  skip {bench.name}[{size}] (max size {bench.max_size})")
+                    continue
+                training_log.TRAINING_LOG_PATH = os.path.join(training_log.LOG_DIR, "training_logs.jsonl")
+                func, ops = bench.setup(ctx, size)
+                # Large logs take seconds per pass; fewer repeats keep the suite usable.
+                runs = repeat if not size or size < 1_000_000 else max(1, repeat // 3)
+                timings = _time_call(func, runs)
+                key = bench.name if size is None else f"{bench.name}[{size}]"
+                median = statistics.median(timings)
+                results[key] = {
+                    "median_s": median,
+                    "min_s": min(timings),
+                    "repeat": runs,
+                    "ops": ops,
+                    "per_op_us": median / ops * 1e6,
+                }
+                print(f"  {key:<45} median {median * 1000:10.2f} ms   {median / ops * 1e6:10.2f} us/op")
+    finally:
+        training_log.LOG_DIR, training_log.TRAINING_LOG_PATH, training_log.FAILURE_LOG_PATH = saved_paths
+
+    return {
+        "meta": {
+            "created": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Prints a comparison table and returns the keys that regressed beyond ``threshold``."""
+    regressions = []
+    print(f"\n{'benchmark':<45} {'baseline ms':>12} {'current ms':>12} {'change':>9}")
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if not base:
+            print(f"{key:<45} {'-':>12} {result['median_s'] * 1000:12.2f} {'new':>9}")
+            continue
+        change = result["median_s"] / base["median_s"] - 1 if base["median_s"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        elif change < -threshold:
+            flag = "  improved"
+        print(f"{key:<45} {base['median_s'] * 1000:12.2f} {result['median_s'] * 1000:12.2f} {change:+8.1%}{flag}")
+    if baseline["meta"].get("platform") != current["meta"].get("platform"):
+        print("\nNote: baseline was recorded on a different platform; compare with care.")
+    return regressions
+
+
+def _parse_sizes(text):
+    return [int(float(part)) for part in text.split(",") if part.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Overseer performance benchmarks")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated synthetic log sizes, e.g. 1e3,1e5,1e7")
+    parser.add_argument("--only", help="comma-separated benchmark names to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", help="directory to cache generated logs between runs")
+    parser.add_argument("--output", help="write the results document to this JSON file")
+    parser.add_argument("--save-baseline", metavar="NAME", help="save results as benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS.values():
+            print(bench.name + (" (sized)" if bench.sized else ""))
+        return 0
+
+    only = set(args.only.split(",")) if args.only else None
+    print("Running Overseer benchmarks...")
+    current = run_benchmarks(_parse_sizes(args.sizes), only=only, repeat=args.repeat, data_dir=args.data_dir)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nSaved baseline to {path}")
+
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json"), "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Synthetic training history generators for benchmarks.
+
+Entries mimic what ``log_test_result`` writes: every question from the real
+question bank with a mix of canned passing answers and "I don't know." failures.
+"""
+
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+from overseer_core.cert_engine import CERT_QUESTIONS
+
+AGENTS = ["MockAgent", "GeminiAgent", "SyntheticAgent"]
+FAIL_ANSWER = "I don't know."
+_WRITE_CHUNK = 10_000
+
+
+def iter_entries(count, seed=0, start=datetime(2025, 1, 1), step_ms=250):
+    """Yields ``count`` log entries in timestamp order."""
+    rng = random.Random(seed)
+    bank = [(domain, q) for domain, questions in CERT_QUESTIONS.items() for q in questions]
+    timestamp = start
+    step = timedelta(milliseconds=step_ms)
+    for _ in range(count):
+        domain, q = rng.choice(bank)
+        passed = rng.random() < 0.7
+        yield {
+            "timestamp": timestamp.isoformat(),
+            "agent": rng.choice(AGENTS),
+            "domain": domain,
+            "question": q["question"],
+            "answer": " ".join(q["keywords"]) if passed else FAIL_ANSWER,
+            "evaluation": "pass" if passed else "fail",
+            "keywords_used": q["keywords"],
+        }
+        timestamp += step
+
+
+def write_jsonl_log(path, count, seed=0):
+    """Writes a JSON Lines training log with ``count`` entries, streaming in chunks."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        chunk = []
+        for entry in iter_entries(count, seed=seed):
+            chunk.append(json.dumps(entry))
+            if len(chunk) >= _WRITE_CHUNK:
+                f.write("\n".join(chunk) + "\n")
+                chunk.clear()
+        if chunk:
+            f.write("\n".join(chunk) + "\n")
+    return path
+
+
+def write_json_array_log(path, count, seed=0):
+    """Writes a log in the single-JSON-array format used by certification_worker.py."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = [{"timestamp": e["timestamp"] + "Z", "agent": e["agent"], "results": {e["domain"]: e}}
+            for e in iter_entries(count, seed=seed)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+def cached_jsonl_log(data_dir, count, seed=0):
+    """Returns a path to a synthetic log of ``count`` entries, generating it only once."""
+    path = os.path.join(data_dir, f"training_{count}_{seed}.jsonl")
+    if not os.path.exists(path):
+        write_jsonl_log(path + ".tmp", count, seed=seed)
+        os.replace(path + ".tmp", path)
+    return path
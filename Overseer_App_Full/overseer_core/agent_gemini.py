@@ -2,14 +2,76 @@ import os
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+from overseer_core import metrics
+from overseer_core.breaker import AgentError
+from overseer_core.config import get_agent_timeout, get_gemini_endpoint, get_gemini_models
+
 load_dotenv()
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+if get_gemini_endpoint():
+    # A custom endpoint (such as overseer_core.fake_gemini_server) only speaks REST.
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY") or "local", transport="rest",
+                    client_options={"api_endpoint": get_gemini_endpoint()})
+else:
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+
+def _text(response):
+    """The answer text; a response without any (e.g. blocked by safety filters) is answered in-band and graded."""
+    try:
+        return response.text.strip()
+    except ValueError as e:
+        return f"Gemini returned no text: {e}"
+
+def _cancel(response):
+    """Closes a streamed response early. The SDK keeps the HTTP stream on a private attribute, so this is best effort."""
+    cancel = getattr(getattr(response, "_iterator", None), "cancel", None)
+    if cancel is not None:
+        cancel()
+
+def create_gemini_agent(model_name=None):
+    """Builds a Gemini agent that reuses one model client; overseer_core.agents pools these.
 
+    ``model_name`` defaults to the first (cheapest) of OVERSEER_GEMINI_MODELS. Metrics are labelled
+    ``Gemini/<model>``, like the agent registered for each model, so the tiers of GeminiAgent are told apart.
+    """
+    model_name = model_name or get_gemini_models()[0][0]
+    label = f"Gemini/{model_name}"
+    model = genai.GenerativeModel(model_name)
+    # Bounds requests abandoned by a hedge or an adaptive timeout (see overseer_core.hedging).
+    request_options = {"timeout": get_agent_timeout()}
+
+    @metrics.instrument_agent(label)
+    def respond(prompt):
+        """Returns the answer; API failures raise AgentError (see overseer_core.breaker)."""
+        try:
+            response = model.generate_content(prompt, request_options=request_options)
+        except Exception as e:
+            raise AgentError(f"Gemini error ({model_name}): {e}") from e
+        return _text(response)
+
+    @metrics.instrument_stream(label)
+    def stream(prompt):
+        """Yields the answer as Gemini generates it; closing the generator cancels the request."""
+        try:
+            response = model.generate_content(prompt, stream=True, request_options=request_options)
+        except Exception as e:
+            raise AgentError(f"Gemini error ({model_name}): {e}") from e
+        try:
+            for chunk in response:
+                yield chunk.text
+        except Exception as e:
+            raise AgentError(f"Gemini error ({model_name}): {e}") from e
+        finally:
+            _cancel(response)
+
+    respond.stream = stream
+    return respond
+
+@metrics.instrument_agent("GeminiAgent")
 def gemini_agent_response(prompt):
-    """Generate a response using Gemini-Pro."""
+    """Generate a response using the first (cheapest) of OVERSEER_GEMINI_MODELS."""
     try:
-        model = genai.GenerativeModel("gemini-pro")
+        model = genai.GenerativeModel(get_gemini_models()[0][0])
         response = model.generate_content(prompt)
-        return response.text.strip()
     except Exception as e:
-        return f"Gemini error: {e}"
+        raise AgentError(f"Gemini error: {e}") from e
+    return _text(response)
@@ -1,4 +1,25 @@
+from overseer_core import metrics
+from overseer_core.web_search import web_search
+
+@metrics.instrument_agent("MockAgent")
 def mock_agent_response(prompt):
-    if "palindrome" in prompt:
-        return "def is_palindrome(s): return s == s[::-1]"
-    return "I don't know."
\ No newline at end of file
+    prompt_lower = prompt.lower()
+    if "palindrome" in prompt_lower:
+       return "def is_palindrome(s): return s == s[::-1]"
+    if "weather" in prompt_lower:
+       return "import requests\nrequests.get('https://api.weatherapi.com/')"
+    if "add" in prompt_lower:
+       return "def add(x, y): return x + y"
+    if "off-by-one" in prompt_lower:
+       return "for i in range(11): print(i)"
+    if "align" in prompt_lower:
+       return "To align outputs, we consider intent, context, and give clear instructions."
+    if "harmful" in prompt_lower:
+       return "Use safety filters, apply guardrails and run moderation checks."
+    if "route tasks" in prompt_lower:
+       return "A router system matches agent capabilities with tasks dynamically."
+    if "coordinate" in prompt_lower:
+       return "Use task priority queues and agent coordination protocols."
+    if "search" in prompt_lower or "lookup" in prompt_lower:
+       return web_search(prompt)
+    return "I don't know."
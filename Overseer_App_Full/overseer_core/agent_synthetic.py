@@ -0,0 +1,168 @@
+"""Synthetic load-generating agent for stress-testing Overseer offline.
+
+Latency, error and throttle rates, answer sizes and the pass rate per domain
+are all configurable, so the orchestrator and GUI can be exercised at
+production-like scale without a remote model.
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+
+from overseer_core import metrics
+from overseer_core.batching import build_batch_reply, split_batch_prompt
+from overseer_core.breaker import AgentError
+from overseer_core.cert_engine import CERT_QUESTIONS
+
+LATENCY_DISTRIBUTIONS = ("fixed", "lognormal", "heavy_tail")
+# Filler words are chosen so that none of them contains a question-bank keyword.
+_FILLER = ("the", "model", "considers", "each", "step", "carefully", "and", "produces",
+           "an", "output", "based", "on", "available", "information", "while", "checking", "edge", "cases")
+
+
+class SyntheticAgentError(AgentError):
+    """Simulated server-side failure."""
+
+
+class SyntheticThrottleError(SyntheticAgentError):
+    """Simulated rate-limit response (HTTP 429)."""
+
+
+class SyntheticAgent:
+    def __init__(self, latency="lognormal", latency_ms=250.0, latency_sigma=0.6, tail_alpha=1.5,
+                 max_latency_ms=30_000.0, error_rate=0.0, throttle_rate=0.0,
+                 answer_chars=300, answer_sigma=0.5, pass_rate=0.7, domain_pass_rates=None, seed=None,
+                 first_token_share=0.3):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{latency}'. Use one of {LATENCY_DISTRIBUTIONS}.")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tail_alpha = tail_alpha
+        self.max_latency_ms = max_latency_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.answer_chars = answer_chars
+        self.answer_sigma = answer_sigma
+        self.pass_rate = pass_rate
+        self.domain_pass_rates = dict(domain_pass_rates or {})
+        # Part of the latency spent before the first streamed word; the rest is spread over the words.
+        self.first_token_share = min(max(first_token_share, 0.0), 1.0)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._questions = {q["question"]: (domain, q["keywords"])
+                           for domain, questions in CERT_QUESTIONS.items() for q in questions}
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config)
+
+    @classmethod
+    def from_env(cls):
+        """Builds an agent from OVERSEER_SYNTHETIC_AGENT (inline JSON or a path to a JSON file)."""
+        raw = os.getenv("OVERSEER_SYNTHETIC_AGENT", "").strip()
+        if not raw:
+            return cls()
+        if not raw.startswith("{"):
+            with open(raw, "r", encoding="utf-8") as f:
+                raw = f.read()
+        return cls.from_config(json.loads(raw))
+
+    def sample_latency(self):
+        """Returns a latency in seconds drawn from the configured distribution."""
+        with self._rng_lock:
+            if self.latency == "fixed":
+                value = self.latency_ms
+            elif self.latency == "lognormal":
+                # latency_ms is the median of the distribution.
+                value = self._rng.lognormvariate(math.log(self.latency_ms), self.latency_sigma)
+            else:
+                # Pareto tail scaled so latency_ms is the minimum; alpha <= 2 gives infinite variance.
+                value = self.latency_ms * self._rng.paretovariate(self.tail_alpha)
+        return min(value, self.max_latency_ms) / 1000.0
+
+    def generate(self, prompt):
+        """Produces an answer after a simulated delay, raising on simulated errors."""
+        with self._rng_lock:
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            # Rate limits are rejected quickly rather than after a full generation.
+            time.sleep(self.sample_latency() * 0.1)
+            raise SyntheticThrottleError("429 Resource has been exhausted (synthetic).")
+        time.sleep(self.sample_latency())
+        if roll < self.throttle_rate + self.error_rate:
+            raise SyntheticAgentError("500 Internal error (synthetic).")
+        return self._answer(prompt)
+
+    def stream(self, prompt):
+        """Yields the answer word by word at the configured latency, raising on simulated errors."""
+        with self._rng_lock:
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            time.sleep(self.sample_latency() * 0.1)
+            raise SyntheticThrottleError("429 Resource has been exhausted (synthetic).")
+        latency = self.sample_latency()
+        time.sleep(latency * self.first_token_share)
+        if roll < self.throttle_rate + self.error_rate:
+            raise SyntheticAgentError("500 Internal error (synthetic).")
+        words = self._answer(prompt).split(" ")
+        delay = latency * (1 - self.first_token_share) / len(words)
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(delay)
+            yield word if i == 0 else " " + word
+
+    def __call__(self, prompt):
+        return self.generate(prompt)
+
+    def _answer(self, prompt):
+        questions = split_batch_prompt(prompt)
+        if questions:
+            # One request, one latency and error roll; every slot is answered.
+            return build_batch_reply([self._answer(question) for question in questions])
+        domain, keywords = self._questions.get(prompt, (None, []))
+        rate = self.domain_pass_rates.get(domain, self.pass_rate)
+        with self._rng_lock:
+            passed = self._rng.random() < rate
+            size = int(self._rng.lognormvariate(math.log(max(self.answer_chars, 1)), self.answer_sigma))
+            if keywords and not passed:
+                # Drop one keyword so keyword grading fails.
+                dropped = self._rng.choice(keywords)
+                keywords = [k for k in keywords if k != dropped]
+            words = list(keywords)
+            length = sum(len(w) + 1 for w in words)
+            while length < size:
+                word = self._rng.choice(_FILLER)
+                words.insert(self._rng.randint(0, len(words)), word)
+                length += len(word) + 1
+        return " ".join(words)
+
+
+_default_agent = None
+_default_lock = threading.Lock()
+
+
+def get_default_agent():
+    global _default_agent
+    with _default_lock:
+        if _default_agent is None:
+            _default_agent = SyntheticAgent.from_env()
+        return _default_agent
+
+
+@metrics.instrument_agent("SyntheticAgent")
+def synthetic_agent_response(prompt):
+    """Answers with the default SyntheticAgent configured from OVERSEER_SYNTHETIC_AGENT."""
+    return get_default_agent()(prompt)
+
+
+@metrics.instrument_stream("SyntheticAgent")
+def synthetic_agent_stream(prompt):
+    """Streams an answer from the default SyntheticAgent."""
+    yield from get_default_agent().stream(prompt)
+
+
+synthetic_agent_response.stream = synthetic_agent_stream
@@ -0,0 +1,280 @@
+"""Registry of the agents that certification runs can target, by name.
+
+Agents are listed without importing them. The registry reads three sources:
+
+* the built-in agents below;
+* installed packages that declare an ``overseer.agents`` entry point, e.g.
+  ``MyAgent = "my_package.agent:respond"``;
+* a JSON file named by ``OVERSEER_AGENTS_FILE`` (default ``agents.json``):
+
+      {"LocalModel": {"target": "my_models.llama:create_agent", "factory": true, "pool_size": 2},
+       "RemoteModel": {"target": "my_models.remote:respond", "batch_size": 4}}
+
+A target is imported the first time its agent is used. A plain target is a
+``respond(prompt) -> str`` callable. A ``factory`` target builds such a callable
+and is used for agents with expensive setup (SDK clients, local models). The
+instances it builds are kept in a warm pool and reused across runs, and
+``options`` are passed to the factory as keyword arguments. A ``batch_size``
+above 1 packs that many questions into each request (see
+overseer_core.batching). ``cost`` is the relative cost of one request.
+
+An agent with ``tiers`` (a list of other agents, cheapest first) has no target:
+it asks its cheap tiers first and escalates (see overseer_core.tiering).
+
+``listed()`` names the agents offered by default in tournaments and agent
+selectors. It leaves out agents that are tiers of another agent, and those
+marked ``"listed": false`` (the built-in ``Gemini/<model>`` agents), so one
+model is not entered twice under different names.
+"""
+
+import functools
+import importlib
+import json
+import os
+import queue
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from importlib.metadata import entry_points
+
+from overseer_core import metrics
+from overseer_core.config import get_gemini_batch_size, get_gemini_models
+from overseer_core.tiering import Tier, TieredAgent
+
+ENTRY_POINT_GROUP = "overseer.agents"
+
+BUILTIN_AGENTS = {
+    "MockAgent": {"target": "overseer_core.agent_mock:mock_agent_response"},
+    "SyntheticAgent": {"target": "overseer_core.agent_synthetic:synthetic_agent_response"},
+}
+# One agent per configured Gemini model; GeminiAgent tiers them when there are several.
+GEMINI_MODELS = {f"Gemini/{model}": {"target": "overseer_core.agent_gemini:create_gemini_agent", "factory": True,
+                                     "pool_size": 4, "batch_size": get_gemini_batch_size(),
+                                     "options": {"model_name": model}, "cost": cost, "listed": False}
+                 for model, cost in get_gemini_models()}
+BUILTIN_AGENTS["GeminiAgent"] = {"tiers": list(GEMINI_MODELS)} if len(GEMINI_MODELS) > 1 else \
+    {**next(iter(GEMINI_MODELS.values())), "listed": True}
+BUILTIN_AGENTS.update(GEMINI_MODELS)
+
+AGENT_LOADS = metrics.counter("overseer_agent_loads_total", "Agent modules imported, by agent.")
+AGENT_LOAD_LATENCY = metrics.histogram("overseer_agent_load_seconds", "Time to import an agent module.")
+AGENT_INSTANCES = metrics.counter("overseer_agent_instances_total", "Pooled agent instances created, by agent.")
+AGENT_POOL_IDLE = metrics.gauge("overseer_agent_pool_idle", "Warm pooled agent instances waiting for work.")
+
+
+class AgentLoadError(RuntimeError):
+    pass
+
+
+class AgentPool:
+    """Warm instances built by an agent factory. Instances are created on demand, up to ``size``."""
+
+    def __init__(self, name, factory, size=2):
+        self.name = name
+        self.factory = factory
+        self.size = max(1, size)
+        self._idle = queue.LifoQueue()  # most recently used first, so it stays warm
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _create(self):
+        instance = self.factory()
+        AGENT_INSTANCES.inc(agent=self.name)
+        return instance
+
+    def acquire(self):
+        try:
+            instance = self._idle.get_nowait()
+            AGENT_POOL_IDLE.dec(agent=self.name)
+            return instance
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self._create()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        # The pool is at capacity: wait for another run to hand an instance back.
+        instance = self._idle.get()
+        AGENT_POOL_IDLE.dec(agent=self.name)
+        return instance
+
+    def release(self, instance):
+        self._idle.put(instance)
+        AGENT_POOL_IDLE.inc(agent=self.name)
+
+    @contextmanager
+    def instance(self):
+        instance = self.acquire()
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+    def warm(self, count=1):
+        """Builds instances ahead of use so the first run does not pay the setup cost."""
+        with self._lock:
+            count = min(count, self.size - self._created)
+            self._created += max(count, 0)
+        for _ in range(count):
+            try:
+                instance = self._create()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+            self.release(instance)
+
+    def __call__(self, prompt):
+        with self.instance() as agent:
+            return agent(prompt)
+
+    def stream(self, prompt):
+        """Streams from a pooled instance, which goes back to the pool when the stream ends or is closed."""
+        with self.instance() as agent:
+            stream = getattr(agent, "stream", None)
+            if stream is None:
+                yield agent(prompt)
+            else:
+                yield from stream(prompt)
+
+
+class AgentSpec:
+    def __init__(self, name, target=None, factory=False, pool_size=2, batch_size=0, source="builtin", options=None,
+                 cost=1.0, tiers=None, listed=True):
+        self.name = name
+        self.target = target
+        self.factory = factory
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.source = source
+        self.options = dict(options or {})
+        self.cost = cost
+        self.tiers = list(tiers or ())
+        self.listed = listed
+        self._agent = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._agent is not None
+
+    def load(self, registry=None):
+        """Imports the target on first use; returns the callable (or pool) that answers prompts.
+
+        A tiered agent loads its tiers from ``registry``.
+        """
+        if self._agent is not None:
+            return self._agent
+        with self._lock:
+            if self._agent is None and self.tiers:
+                try:
+                    tiers = [Tier(name, registry[name], registry.spec(name).cost, registry.spec(name).batch_size)
+                             for name in self.tiers]
+                except KeyError as e:
+                    raise AgentLoadError(f"Tiered agent '{self.name}' names an unknown tier {e}") from e
+                self._agent = TieredAgent(self.name, tiers)
+            elif self._agent is None:
+                module_name, _, attr = self.target.partition(":")
+                try:
+                    with AGENT_LOAD_LATENCY.time(agent=self.name):
+                        target = getattr(importlib.import_module(module_name), attr)
+                except Exception as e:
+                    raise AgentLoadError(f"Could not load agent '{self.name}' from {self.target}: {e}") from e
+                AGENT_LOADS.inc(agent=self.name)
+                if self.factory:
+                    if self.options:
+                        target = functools.partial(target, **self.options)
+                    self._agent = AgentPool(self.name, target, self.pool_size)
+                else:
+                    self._agent = target
+        return self._agent
+
+
+class AgentRegistry(Mapping):
+    """Maps agent names to prompt callables, importing each agent on first lookup."""
+
+    def __init__(self, specs=()):
+        self._specs = {}
+        for spec in specs:
+            self.add(spec)
+
+    def add(self, spec):
+        self._specs[spec.name] = spec
+
+    def register(self, name, target=None, factory=False, pool_size=2, batch_size=0, options=None, cost=1.0,
+                 tiers=None, listed=True):
+        self.add(AgentSpec(name, target, factory, pool_size, batch_size, source="register", options=options,
+                           cost=cost, tiers=tiers, listed=listed))
+
+    def spec(self, name):
+        return self._specs[name]
+
+    def listed(self):
+        """Names of the agents to offer by default: not hidden and not a tier of another agent."""
+        tiers = {tier for spec in self._specs.values() for tier in spec.tiers}
+        return [name for name, spec in self._specs.items() if spec.listed and name not in tiers]
+
+    def __getitem__(self, name):
+        return self._specs[name].load(self)
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def warm(self, name, background=True):
+        """Imports an agent and builds one pooled instance, by default on a background thread."""
+        def _warm():
+            try:
+                agent = self[name]
+                if isinstance(agent, TieredAgent):
+                    agent = agent.tiers[0].callback
+                if isinstance(agent, AgentPool):
+                    agent.warm(1)
+            except Exception as e:
+                print(f"[Agents] Could not warm '{name}': {e}")
+        if not background:
+            _warm()
+            return None
+        thread = threading.Thread(target=_warm, name=f"warm-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    # --- Discovery ---
+    @classmethod
+    def discover(cls, config_path=None):
+        registry = cls(AgentSpec(name, source="builtin", **options) for name, options in BUILTIN_AGENTS.items())
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            registry.add(AgentSpec(ep.name, ep.value, source=f"entry point {ep.group}"))
+        config_path = config_path or os.getenv("OVERSEER_AGENTS_FILE", "agents.json")
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, "r", encoding="utf-8") as f:
+                    configured = json.load(f)
+                for name, options in configured.items():
+                    if isinstance(options, str):
+                        options = {"target": options}
+                    if "tiers" not in options and "target" not in options:
+                        raise KeyError(f"'{name}' needs a target or tiers")
+                    registry.add(AgentSpec(name, options.get("target"), options.get("factory", False),
+                                           options.get("pool_size", 2), options.get("batch_size", 0),
+                                           source=config_path, options=options.get("options"),
+                                           cost=options.get("cost", 1.0), tiers=options.get("tiers"),
+                                           listed=options.get("listed", True)))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"[Agents] Ignoring agent config {config_path}: {e}")
+        return registry
+
+
+AGENTS = AgentRegistry.discover()
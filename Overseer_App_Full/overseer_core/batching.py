@@ -0,0 +1,93 @@
+"""Packing several certification questions into one agent request.
+
+For quota-limited remote agents, one request per question wastes most of the
+quota. ``ask_batched`` sends up to ``batch_size`` questions in a single
+structured prompt, with a numbered, delimited answer slot for each, and
+parses the reply back into one answer per question. Questions whose slot is
+missing or empty are asked again individually, so a reply the parser cannot
+use costs one extra call per question but never loses an answer.
+"""
+
+import re
+import time
+
+from overseer_core import metrics, tracing
+
+_HEADER = "Answer each of the following {count} questions independently."
+_INSTRUCTIONS = (
+    "Write every answer between its own markers, exactly like this:\n"
+    "[ANSWER 1]\n<answer to question 1>\n[END ANSWER 1]\n"
+    "Do not add anything outside the markers."
+)
+_QUESTION = re.compile(r"^\[QUESTION (\d+)\]\n(.*?)\n\[END QUESTION \1\]$", re.MULTILINE | re.DOTALL)
+_ANSWER = re.compile(r"\[ANSWER (\d+)\]\s*(.*?)\s*\[END ANSWER \1\]", re.DOTALL)
+
+BATCH_REQUESTS = metrics.counter("overseer_batch_requests_total", "Batched agent requests by parse outcome.")
+BATCH_FALLBACKS = metrics.counter("overseer_batch_fallback_questions_total", "Questions re-asked individually after a batch.")
+
+
+def build_batch_prompt(questions):
+    parts = [_HEADER.format(count=len(questions)), _INSTRUCTIONS, ""]
+    for number, question in enumerate(questions, 1):
+        parts.append(f"[QUESTION {number}]\n{question}\n[END QUESTION {number}]")
+    return "\n".join(parts)
+
+
+def split_batch_prompt(prompt):
+    """Returns the questions packed into a batch prompt, or None for an ordinary prompt."""
+    if not prompt.startswith("Answer each of the following"):
+        return None
+    questions = {int(number): text for number, text in _QUESTION.findall(prompt)}
+    if not questions or sorted(questions) != list(range(1, len(questions) + 1)):
+        return None
+    return [questions[number] for number in sorted(questions)]
+
+
+def build_batch_reply(answers):
+    return "\n".join(f"[ANSWER {number}]\n{answer}\n[END ANSWER {number}]" for number, answer in enumerate(answers, 1))
+
+
+def parse_batch_answers(reply, count):
+    """Returns a list of ``count`` answers, with None for every slot that is missing or empty."""
+    answers = [None] * count
+    for number, text in _ANSWER.findall(reply or ""):
+        index = int(number) - 1
+        if 0 <= index < count and text and answers[index] is None:
+            answers[index] = text
+    return answers
+
+
+def ask_batched(agent_callback, questions, batch_size):
+    """Asks ``questions`` in groups of ``batch_size``; returns ``[(answer, latency_ms, batch_size)]`` in order."""
+    results = []
+    for start in range(0, len(questions), batch_size):
+        chunk = questions[start:start + batch_size]
+        if len(chunk) == 1:
+            results.append(ask_one(agent_callback, chunk[0]))
+            continue
+        with tracing.span("agent_batch_call", questions=len(chunk)) as call_span:
+            call_start = time.perf_counter()
+            reply = agent_callback(build_batch_prompt(chunk))
+            # Each answer is charged an equal share of the shared request.
+            share_ms = (time.perf_counter() - call_start) * 1000 / len(chunk)
+            answers = parse_batch_answers(reply, len(chunk))
+            missing = answers.count(None)
+            call_span.set_attribute("missing", missing)
+        outcome = "parsed" if not missing else "partial" if missing < len(chunk) else "failed"
+        BATCH_REQUESTS.inc(outcome=outcome)
+        for question, answer in zip(chunk, answers):
+            if answer is None:
+                BATCH_FALLBACKS.inc()
+                results.append(ask_one(agent_callback, question))
+            else:
+                results.append((answer, share_ms, len(chunk)))
+    return results
+
+
+def ask_one(agent_callback, question):
+    with tracing.span("agent_call", question=question) as call_span:
+        call_start = time.perf_counter()
+        answer = agent_callback(question) or ""  # agents that return None answered nothing
+        latency_ms = (time.perf_counter() - call_start) * 1000
+        call_span.set_attribute("answer_chars", len(answer))
+    return answer, latency_ms, 1
@@ -0,0 +1,178 @@
+"""Content-addressed store for the question and answer texts in the logs.
+
+The same questions and answers are logged thousands of times in loop mode.
+With the store enabled, a log line keeps a 16-character hash of each long
+text (``question_ref`` / ``answer_ref``). The text itself is written once to
+``blobs.jsonl`` next to the log:
+
+    {"hash": "9f2c4e1a7b3d5f60", "text": "def is_palindrome(s): return s == s[::-1]"}
+
+The pack is append-only. Each blob is written before any log line that refers
+to it. An in-memory index of offsets is built on first use and extended when a
+hash is missing, since another process may have appended it. Resolved texts
+sit in a small LRU.
+
+The store is off by default (set OVERSEER_BLOB_STORE=1), because readers
+outside Overseer expect full texts in the log. A reference whose blob is
+missing, e.g. in a log copied without its ``blobs.jsonl``, resolves to a
+placeholder, and a warning is printed once per pack.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from overseer_core import metrics
+
+PACK_NAME = "blobs.jsonl"
+# Shorter texts stay inline: a reference would not be much smaller.
+MIN_BLOB_CHARS = 24
+LRU_SIZE = 4096
+_PREFIX = b'{"hash": "'
+_HASH_CHARS = 16
+
+BLOB_WRITES = metrics.counter("overseer_blob_writes_total", "New texts written to the blob store.")
+BLOB_HITS = metrics.counter("overseer_blob_dedup_hits_total", "Logged texts that were already in the blob store.")
+BLOB_LRU = metrics.counter("overseer_blob_lru_total", "Blob lookups by LRU outcome.")
+BLOB_MISSING = metrics.counter("overseer_blob_missing_total", "Logged references whose blob is not in the pack.")
+
+
+def blob_hash(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=_HASH_CHARS // 2).hexdigest()
+
+
+class BlobRef:
+    """A text that has not been read from the store yet."""
+    __slots__ = ("hash", "store")
+
+    def __init__(self, hash, store):
+        self.hash = hash
+        self.store = store
+
+    def resolve(self):
+        try:
+            return self.store.get(self.hash)
+        except KeyError:
+            return self.store.missing(self.hash)
+
+    def __repr__(self):
+        return f"BlobRef({self.hash!r})"
+
+
+class BlobStore:
+    def __init__(self, directory, lru_size=LRU_SIZE):
+        self.path = os.path.join(directory, PACK_NAME)
+        self.lru_size = lru_size
+        self._offsets = {}          # hash -> (offset, length)
+        self._scanned = 0           # bytes of the pack already indexed
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._writer = None
+        self._warned_missing = False
+
+    # --- Index ---
+    def _scan(self):
+        """Indexes blobs appended since the last scan. Callers hold the lock."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._scanned)
+            offset = self._scanned
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a writer is mid-line
+                if line.startswith(_PREFIX):
+                    key = line[len(_PREFIX):len(_PREFIX) + _HASH_CHARS].decode("ascii")
+                    self._offsets.setdefault(key, (offset, len(line)))
+                offset += len(line)
+        self._scanned = offset
+
+    # --- Writing ---
+    def put(self, text):
+        """Stores ``text`` once and returns its hash."""
+        key = blob_hash(text)
+        with self._lock:
+            if not self._scanned:
+                self._scan()
+            if key in self._offsets:
+                BLOB_HITS.inc()
+                return key
+            line = (json.dumps({"hash": key, "text": text}) + "\n").encode("utf-8")
+            if self._writer is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._writer = open(self.path, "ab")
+            self._writer.write(line)
+            # Flushed right away, so the blob is on disk before the log line that refers to it.
+            self._writer.flush()
+            offset = self._writer.tell() - len(line)
+            self._offsets[key] = (offset, len(line))
+            if offset == self._scanned:
+                self._scanned = offset + len(line)
+            self._remember(key, text)
+        BLOB_WRITES.inc()
+        return key
+
+    # --- Reading ---
+    def get(self, key):
+        with self._lock:
+            text = self._lru.get(key)
+            if text is not None:
+                self._lru.move_to_end(key)
+                BLOB_LRU.inc(outcome="hit")
+                return text
+            BLOB_LRU.inc(outcome="miss")
+            location = self._offsets.get(key)
+            if location is None:
+                self._scan()
+                location = self._offsets.get(key)
+                if location is None:
+                    raise KeyError(f"Blob {key} is not in {self.path}")
+            with open(self.path, "rb") as f:
+                f.seek(location[0])
+                text = sys.intern(json.loads(f.read(location[1]))["text"])
+            self._remember(key, text)
+            return text
+
+    def missing(self, key):
+        """Placeholder text for a blob that is not in the pack."""
+        BLOB_MISSING.inc()
+        with self._lock:
+            warn, self._warned_missing = not self._warned_missing, True
+        if warn:
+            print(f"[BlobStore] {self.path} lacks blobs referenced by the log (first: {key}); "
+                  "their texts show as placeholders.")
+        return f"[missing text {key}]"
+
+    def _remember(self, key, text):
+        self._lru[key] = text
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def __contains__(self, key):
+        with self._lock:
+            if key not in self._offsets:
+                self._scan()
+            return key in self._offsets
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_blob_store(directory="logs"):
+    """Returns the shared store for a log directory."""
+    directory = os.path.abspath(directory or ".")
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = BlobStore(directory)
+        return store
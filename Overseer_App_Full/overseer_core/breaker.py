@@ -0,0 +1,174 @@
+"""Per-agent circuit breakers, so an outage fails fast instead of waiting out every request.
+
+Each agent (and each model tier) has a ``CircuitBreaker``:
+
+* closed - requests go through; ``failure_threshold`` errors in a row open it;
+* open - requests fail at once with CircuitOpen, without reaching the agent,
+  for ``reset_timeout`` seconds;
+* half-open - one probe request goes through while the others are still
+  rejected. A successful probe closes the circuit. A failed one opens it
+  again for twice as long, up to ``max_reset_timeout``.
+
+An error is an exception from the agent: an ``AgentError`` raised for an API
+failure, an AgentTimeout from the hedger, or anything unexpected. The
+pipeline records it as an ``Evaluation.ERROR`` result whose extra holds
+``{"error": {"type": ..., "message": ...}}``. Such results are logged, but are
+kept out of pass/fail counts and out of ``failure_memory.jsonl``.
+
+    with get_breaker("GeminiAgent").attempt():
+        answer = callback(prompt)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from overseer_core import metrics
+from overseer_core.config import get_breaker_reset_timeout, get_breaker_threshold
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = metrics.gauge("overseer_circuit_state", "Circuit breaker state by agent (0 closed, 1 half-open, 2 open).")
+CIRCUIT_TRANSITIONS = metrics.counter("overseer_circuit_transitions_total", "Circuit breaker state changes, by agent and new state.")
+CIRCUIT_REJECTIONS = metrics.counter("overseer_circuit_rejections_total", "Requests failed fast by an open circuit, by agent.")
+
+
+class AgentError(RuntimeError):
+    """The agent could not answer (API error, throttling, outage), as opposed to answering wrongly."""
+
+
+class CircuitOpen(AgentError):
+    def __init__(self, agent, retry_in):
+        super().__init__(f"{agent} is failing; requests are paused for another {retry_in:.0f}s")
+        self.agent = agent
+        self.retry_in = retry_in
+
+
+def error_type(error):
+    """The ``type`` recorded for an agent error: "circuit_open", "timeout" or "agent_error"."""
+    if isinstance(error, CircuitOpen):
+        return "circuit_open"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    return "agent_error"
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=None, reset_timeout=None, max_reset_timeout=300.0,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = get_breaker_threshold() if failure_threshold is None else failure_threshold
+        self.base_reset_timeout = get_breaker_reset_timeout() if reset_timeout is None else reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._reset_timeout = self.base_reset_timeout
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.set(0, agent=name)
+
+    @property
+    def enabled(self):
+        return self.failure_threshold > 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def retry_in(self):
+        """Seconds until an open circuit lets a probe through; 0 unless open."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self._opened_at + self._reset_timeout - self._clock(), 0.0)
+
+    def _set_state(self, state):
+        if state != self._state:
+            self._state = state
+            CIRCUIT_STATE.set(_STATE_CODES[state], agent=self.name)
+            CIRCUIT_TRANSITIONS.inc(agent=self.name, state=state)
+            print(f"[Breaker] {self.name}: circuit {state.replace('_', '-')}")
+
+    def _admit(self):
+        """Returns whether the request is the half-open probe; raises CircuitOpen to reject it."""
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            if self._state == OPEN:
+                remaining = self._opened_at + self._reset_timeout - self._clock()
+                if remaining > 0:
+                    CIRCUIT_REJECTIONS.inc(agent=self.name)
+                    raise CircuitOpen(self.name, remaining)
+                self._set_state(HALF_OPEN)
+            if self._probing:
+                CIRCUIT_REJECTIONS.inc(agent=self.name)
+                raise CircuitOpen(self.name, 0.0)
+            self._probing = True
+            return True
+
+    def _succeeded(self, probe):
+        with self._lock:
+            self._failures = 0
+            if probe:
+                self._probing = False
+                self._reset_timeout = self.base_reset_timeout
+                self._set_state(CLOSED)
+
+    def _failed(self, probe):
+        with self._lock:
+            self._failures += 1
+            if probe:
+                self._probing = False
+                self._reset_timeout = min(self._reset_timeout * 2, self.max_reset_timeout)
+            elif self._state != CLOSED or self._failures < self.failure_threshold:
+                return
+            self._opened_at = self._clock()
+            self._set_state(OPEN)
+
+    def _released(self, probe):
+        """An abandoned request (e.g. a stopped stream): the next request may probe instead."""
+        if probe:
+            with self._lock:
+                self._probing = False
+
+    @contextmanager
+    def attempt(self):
+        """Wraps one agent request: raises CircuitOpen instead of running it while the circuit is
+        open, and records whether it raised."""
+        if not self.enabled:
+            yield
+            return
+        probe = self._admit()
+        try:
+            yield
+        except Exception:
+            self._failed(probe)
+            raise
+        except BaseException:
+            self._released(probe)
+            raise
+        self._succeeded(probe)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(agent):
+    """The shared breaker of an agent (or model tier), by name."""
+    with _breakers_lock:
+        breaker = _breakers.get(agent)
+        if breaker is None:
+            breaker = _breakers[agent] = CircuitBreaker(agent)
+        return breaker
+
+
+def breaker_states():
+    """``{agent: (state, retry_in)}`` for every breaker that is not closed."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: (b.state, b.retry_in()) for b in breakers if b.state != CLOSED}
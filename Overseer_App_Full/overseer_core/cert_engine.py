@@ -1,19 +1,155 @@
+import json
+import os
+import random
+
+from overseer_core import metrics
+from overseer_core.config import get_grader_name, get_semantic_threshold
+
+# --- Question bank for certification categories ---
 CERT_QUESTIONS = {
     "code_generation": [
-        {"question": "Write a Python function to check for palindrome.", "keywords": ["def", "[::-1]", "=="]}
+        {"question": "Write a Python function to check for palindrome.", "keywords": ["def", "[::-1]", "=="],
+         "references": ["def is_palindrome(s): return s == s[::-1]",
+                        "def is_palindrome(text): text = text.lower() return text == text[::-1]"]},
+        {"question": "Generate a script that fetches weather data using requests.", "keywords": ["requests", "get"],
+         "references": ["import requests response = requests.get('https://api.weather.example/current', params={'q': city}) print(response.json())"]}
+    ],
+    "debugging": [
+        {"question": "Find the bug in this code: def add(x,y): return x-y", "keywords": ["+", "return"],
+         "references": ["The function subtracts instead of adding. Fix: def add(x, y): return x + y"]},
+        {"question": "Fix the off-by-one error in a for loop from 0 to 10 (inclusive).", "keywords": ["range", "11"],
+         "references": ["for i in range(11): print(i)", "for i in range(0, 11): print(i)"]}
+    ],
+    "agent_alignment": [
+        {"question": "What steps would you take to align AI outputs with user intent?", "keywords": ["intent", "context", "instruction"],
+         "references": ["Clarify the user's intent, keep the conversation context, and follow clear instructions when generating outputs."]},
+        {"question": "How do you ensure AI outputs avoid harmful content?", "keywords": ["safety", "guardrails", "moderation"],
+         "references": ["Apply safety filters and guardrails to outputs and run moderation checks on harmful content."]}
+    ],
+    "multi_agent_management": [
+        {"question": "Describe a system that routes tasks to the most capable AI agent.", "keywords": ["router", "capabilities", "agent"],
+         "references": ["A router keeps a registry of each agent's capabilities and routes every task to the most capable agent."]},
+        {"question": "Design a strategy for coordinating multiple AI assistants.", "keywords": ["coordination", "task", "priority"],
+         "references": ["Use a coordination layer with a task queue ordered by priority and assign tasks to assistants by availability."]}
     ]
 }
 
-def simulate_certification(agent_callback):
-    import random
-    results = {}
-    for cert_area, questions in CERT_QUESTIONS.items():
-        q = random.choice(questions)
-        answer = agent_callback(q["question"])
-        passed = all(keyword in answer for keyword in q["keywords"])
-        results[cert_area] = {
-            "question": q["question"],
-            "answer": answer,
-            "evaluation": "pass" if passed else "fail"
-        }
-    return results
\ No newline at end of file
+# Questions imported at runtime (see overseer_core.ingest), one JSON object per line.
+QUESTION_BANK_PATH = os.path.join("logs", "question_bank.jsonl")
+
+# --- Metrics ---
+EVALUATIONS = metrics.counter("overseer_evaluations_total", "Graded answers by domain and evaluation.")
+EVALUATION_LATENCY = metrics.histogram("overseer_evaluation_seconds", "Time spent grading a single answer.")
+
+# --- Grading ---
+class KeywordGrader:
+    """Passes answers that contain every keyword of the question (case-insensitive)."""
+    name = "keyword"
+
+    def grade(self, items):
+        return [(all(keyword.lower() in answer.lower() for keyword in q["keywords"]), None) for q, answer in items]
+
+    def settled(self, q, partial_answer):
+        """True once a partial answer is sure to pass: more text cannot remove a keyword."""
+        partial_answer = partial_answer.lower()
+        return all(keyword.lower() in partial_answer for keyword in q["keywords"])
+
+
+GRADERS = ("keyword", "semantic", "hybrid")
+_graders = {}
+
+
+def get_grader(name=None):
+    """Returns the shared grader by name (default OVERSEER_GRADER); semantic graders load NumPy on first use."""
+    name = name or get_grader_name()
+    grader = _graders.get(name)
+    if grader is None:
+        if name == "keyword":
+            grader = KeywordGrader()
+        elif name in ("semantic", "hybrid"):
+            from overseer_core.semantic_grader import SemanticGrader
+            threshold = get_semantic_threshold()
+            grader = SemanticGrader(CERT_QUESTIONS, mode=name, **({"threshold": threshold} if threshold is not None else {}))
+        else:
+            raise ValueError(f"Unknown grader '{name}'. Use one of {GRADERS}.")
+        _graders[name] = grader
+    return grader
+
+# --- Question bank ---
+_known_questions = None  # (domain, question) pairs in the bank, built on the first add
+
+def _valid_question(q):
+    return (isinstance(q.get("question"), str) and q["question"].strip()
+            and isinstance(q.get("keywords"), list) and all(isinstance(k, str) for k in q["keywords"]))
+
+def add_questions(items, persist=True):
+    """Adds ``(domain, question_dict)`` pairs to the bank, skipping invalid and known questions.
+
+    New questions are appended to QUESTION_BANK_PATH when ``persist`` is set.
+    Returns the number added.
+    """
+    global _known_questions
+    if _known_questions is None:
+        _known_questions = {(domain, q["question"]) for domain, questions in CERT_QUESTIONS.items() for q in questions}
+    added = []
+    for domain, q in items:
+        if not isinstance(domain, str) or not _valid_question(q) or (domain, q["question"]) in _known_questions:
+            continue
+        _known_questions.add((domain, q["question"]))
+        q = {"question": q["question"], "keywords": list(q["keywords"]),
+             **({"references": list(q["references"])} if q.get("references") else {})}
+        CERT_QUESTIONS.setdefault(domain, []).append(q)
+        added.append({"domain": domain, **q})
+    if added:
+        # Semantic graders index the references of the bank they were built from.
+        _graders.pop("semantic", None)
+        _graders.pop("hybrid", None)
+        if persist:
+            os.makedirs(os.path.dirname(QUESTION_BANK_PATH), exist_ok=True)
+            with open(QUESTION_BANK_PATH, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(q) + "\n" for q in added))
+    return len(added)
+
+def load_question_bank(path=QUESTION_BANK_PATH):
+    """Adds the questions imported in earlier sessions."""
+    if not os.path.exists(path):
+        return 0
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                q = json.loads(line)
+            except ValueError:
+                continue
+            items.append((q.pop("domain", None), q))
+    return add_questions(items, persist=False)
+
+# --- Simulate certification test ---
+def pick_questions(rng=random):
+    """Chooses one ``(domain, question)`` per domain using ``rng`` (a random.Random or the random module)."""
+    return [(cert_area, rng.choice(questions)) for cert_area, questions in CERT_QUESTIONS.items()]
+
+def find_question(domain, question):
+    """Returns the question dict for a domain and question text, or None if it is no longer in the bank."""
+    for q in CERT_QUESTIONS.get(domain, ()):
+        if q["question"] == question:
+            return q
+    return None
+
+def simulate_certification_test(agent_callback, batch_size=0, grader=None, picks=None):
+    """Asks one question per domain and returns ``{domain: ResultRecord}`` without logging.
+
+    A single inline pass of the certification pipeline (overseer_core.pipeline).
+    With ``batch_size`` > 1 the questions are sent to the agent in batches of
+    that size (see overseer_core.batching); each answer still gets its own grade.
+    ``picks`` replaces the random choice with a planned list of ``(domain, question)``.
+    """
+    from overseer_core.pipeline import Pipeline, DEFAULT_STAGES, planned_questions
+
+    stages = DEFAULT_STAGES if picks is None else (planned_questions(picks),) + DEFAULT_STAGES[1:]
+    pipeline = Pipeline(agent_callback=agent_callback, batch_size=batch_size, grader=grader,
+                        log=False, stages=stages, concurrent=False)
+    return {item.domain: item.record for item in pipeline}
+
+
+load_question_bank()
@@ -1,11 +1,12 @@
 import threading
 from datetime import datetime
 import os
-import json
 from PyQt6.QtCore import QObject, pyqtSignal
 
-from overseer_core.cert_engine import simulate_certification_test
-from overseer_core.agent_mock import mock_agent_response
+from overseer_core.pipeline import Pipeline
+from overseer_core.agents import AgentLoadError
+from overseer_core.training_log import append_to_json_array_log
+from overseer_core.records import ResultRecord
 
 class WorkerSignals(QObject):
     result_ready = pyqtSignal(dict)
@@ -17,14 +18,16 @@ class CertificationWorker(threading.Thread):
         self.signals = signals
 
     def run(self):
-        if self.agent_name == "MockAgent":
-            results = simulate_certification_test(mock_agent_response)
-        else:
+        try:
+            # One inline pass; the whole run is written below as a single JSON array entry.
+            pipeline = Pipeline(self.agent_name, log=False, concurrent=False)
+            results = {item.domain: item.record for item in pipeline}
+        except (KeyError, AgentLoadError) as e:
             results = {
                 "status": {
                     "question": "N/A",
                     "answer": "N/A",
-                    "evaluation": f"Agent '{self.agent_name}' is not yet integrated."
+                    "evaluation": f"Agent '{self.agent_name}' is not available: {e}"
                 }
             }
 
@@ -35,24 +38,11 @@ class CertificationWorker(threading.Thread):
             log_entry = {
                 "timestamp": datetime.utcnow().isoformat() + "Z",
                 "agent": self.agent_name,
-                "results": results
+                "results": {domain: result.to_result_dict() if isinstance(result, ResultRecord) else result
+                            for domain, result in results.items()}
             }
 
-            if os.path.exists(log_path):
-                with open(log_path, "r", encoding="utf-8") as f:
-                    try:
-                        data = json.load(f)
-                        if not isinstance(data, list):
-                            data = [data]
-                    except json.JSONDecodeError:
-                        data = []
-            else:
-                data = []
-
-            data.append(log_entry)
-
-            with open(log_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            append_to_json_array_log(log_path, log_entry)
 
         except Exception as e:
             print(f"[Logging Error] Failed to write log: {e}")
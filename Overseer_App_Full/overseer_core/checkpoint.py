@@ -0,0 +1,243 @@
+"""Crash-safe checkpoints for certification sessions.
+
+A ``TrainingSession`` is a planned run: an agent, a number of iterations
+(None runs until stopped) and a seeded RNG that picks each iteration's
+questions. Its checkpoint in ``logs/sessions/<id>.json`` holds the current
+iteration's plan, the items of that iteration already logged and the RNG
+state after planning it:
+
+    {"session_id": "20250101-180000-GeminiAgent-5f3c2a10", "agent": "GeminiAgent",
+     "iterations": null, "iteration": 42, "status": "running",
+     "plan": [["code_generation", "Write a Python function ..."], ...],
+     "completed": [["code_generation", "Write a Python function ..."]], "rng_state": [...]}
+
+The checkpoint is written (and fsynced) when an iteration is planned, before
+any agent call, and after each result is logged. Only planning also fsyncs
+the directory, which makes the rename durable. A power loss can therefore
+roll back the completed items of the current iteration, which are then asked
+again, but never the plan or the RNG state.
+
+The process running a session holds an exclusive lock on ``<id>.lock`` next
+to the checkpoint. The OS releases it when the process exits or crashes. A
+session that is still "running" with no lock held was interrupted. Resuming
+it takes the lock, finishes the planned items that were not logged, and
+continues with the same question sequence. Sessions still held by another
+process, such as the service or a second GUI, are not offered for resume.
+Sessions that end normally delete their checkpoint and lock file.
+"""
+
+import json
+import os
+import random
+import re
+import time
+
+from overseer_core import metrics
+from overseer_core.cert_engine import find_question, pick_questions
+
+SESSION_DIR = os.path.join("logs", "sessions")
+LOCK_SUFFIX = ".lock"
+
+CHECKPOINT_WRITES = metrics.counter("overseer_checkpoint_writes_total", "Session checkpoints written.")
+SESSIONS_RESUMED = metrics.counter("overseer_sessions_resumed_total", "Interrupted sessions resumed, by agent.")
+
+
+def _now():
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _try_lock(f):
+    """Takes an exclusive lock on an open file without waiting; False if another holder has it."""
+    try:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _locked(lock_path):
+    """True while some process (this one included) holds the session lock at ``lock_path``."""
+    try:
+        f = open(lock_path, "a+b")
+    except OSError:
+        return False
+    with f:
+        # Closing the file releases a lock taken just for this check.
+        return not _try_lock(f)
+
+
+class TrainingSession:
+    """A planned certification session whose progress survives crashes."""
+
+    def __init__(self, agent, iterations=None, seed=None, session_id=None, directory=SESSION_DIR):
+        self.agent = agent
+        self.iterations = iterations
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        safe_agent = re.sub(r"[^\w.-]", "_", agent)
+        self.session_id = session_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_agent}-{self.seed:08x}"
+        self.path = os.path.join(directory, self.session_id + ".json")
+        self.lock_path = os.path.join(directory, self.session_id + LOCK_SUFFIX)
+        self._lock_file = None
+        self.rng = random.Random(self.seed)
+        self.status = "running"
+        self.iteration = 0
+        self.plan = []             # [(domain, question)] of the current iteration
+        self.completed = set()     # items of the current iteration already logged
+        self.items_completed = 0
+        self.created = self.updated = _now()
+
+    # --- Progress ---
+    def next_picks(self):
+        """Returns the ``(domain, question_dict)`` pairs to run next, planning a new iteration when needed.
+
+        Returns None once every planned iteration is complete.
+        """
+        remaining = self._remaining()
+        if remaining:
+            return remaining
+        if self.finished:
+            return None
+        picks = pick_questions(self.rng)
+        self.iteration += 1
+        self.plan = [(domain, q["question"]) for domain, q in picks]
+        self.completed = set()
+        self.save(sync_directory=True)
+        return picks
+
+    def _remaining(self):
+        picks = []
+        for domain, question in self.plan:
+            if (domain, question) in self.completed:
+                continue
+            q = find_question(domain, question)
+            if q is not None:  # questions removed from the bank are skipped
+                picks.append((domain, q))
+        return picks
+
+    def mark_done(self, domain, question):
+        """Records a logged result of the current iteration."""
+        self.completed.add((domain, question))
+        self.items_completed += 1
+        self.save()
+
+    @property
+    def finished(self):
+        return self.iterations is not None and self.iteration >= self.iterations and not self._remaining()
+
+    def close(self):
+        """Ends the session normally (finished or stopped) and removes its checkpoint and lock."""
+        self.status = "finished" if self.finished else "stopped"
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+            try:
+                os.remove(self.lock_path)
+            except OSError:
+                pass
+
+    # --- Ownership ---
+    def claim(self):
+        """Takes the session's lock for this process; False if another process is running the session."""
+        if self._lock_file is not None:
+            return True
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+        f = open(self.lock_path, "a+b")
+        if not _try_lock(f):
+            f.close()
+            return False
+        self._lock_file = f
+        return True
+
+    # --- Persistence ---
+    def to_dict(self):
+        version, state, gauss = self.rng.getstate()
+        return {
+            "session_id": self.session_id,
+            "agent": self.agent,
+            "iterations": self.iterations,
+            "seed": self.seed,
+            "status": self.status,
+            "created": self.created,
+            "updated": self.updated,
+            "iteration": self.iteration,
+            "items_completed": self.items_completed,
+            "plan": [list(item) for item in self.plan],
+            "completed": [list(item) for item in self.plan if item in self.completed],
+            "rng_state": [version, list(state), gauss],
+        }
+
+    def save(self, sync_directory=False):
+        """Atomically replaces the checkpoint and flushes it to disk.
+
+        ``sync_directory`` also makes the rename durable. Raises RuntimeError
+        if another process runs the session.
+        """
+        if not self.claim():
+            raise RuntimeError(f"Session {self.session_id} is being run by another process.")
+        self.updated = _now()
+        directory = os.path.dirname(self.path) or "."
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if sync_directory and hasattr(os, "O_DIRECTORY"):
+            # Makes the rename itself durable across a power loss.
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        CHECKPOINT_WRITES.inc()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        session = cls(data["agent"], data.get("iterations"), data["seed"], data["session_id"],
+                      os.path.dirname(path))
+        session.status = data.get("status", "running")
+        session.created = data.get("created", session.created)
+        session.updated = data.get("updated", session.updated)
+        session.iteration = data.get("iteration", 0)
+        session.items_completed = data.get("items_completed", 0)
+        session.plan = [tuple(item) for item in data.get("plan", [])]
+        session.completed = {tuple(item) for item in data.get("completed", [])}
+        version, state, gauss = data["rng_state"]
+        session.rng.setstate((version, tuple(state), gauss))
+        return session
+
+    def describe(self):
+        planned = f"{self.iterations} iterations" if self.iterations is not None else "continuous"
+        return (f"{self.agent} ({planned}), iteration {self.iteration}, "
+                f"{self.items_completed} results logged, last checkpoint {self.updated}")
+
+
+def interrupted_sessions(directory=SESSION_DIR):
+    """Sessions still marked running that no live process holds, most recently updated first."""
+    if not os.path.isdir(directory):
+        return []
+    sessions = []
+    for name in os.listdir(directory):
+        if not name.endswith(".json"):
+            continue
+        try:
+            session = TrainingSession.load(os.path.join(directory, name))
+        except (OSError, ValueError, KeyError, TypeError):
+            print(f"[Checkpoint] Ignoring unreadable checkpoint {name}")
+            continue
+        if session.status == "running" and not _locked(session.lock_path):
+            sessions.append(session)
+    sessions.sort(key=lambda s: s.updated, reverse=True)
+    return sessions
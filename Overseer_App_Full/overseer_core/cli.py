@@ -0,0 +1,220 @@
+"""Command-line tools for Overseer.
+
+    python -m overseer_core.cli history --agent GeminiAgent --domain debugging --evaluation fail --since 12h
+    python -m overseer_core.cli history --question router --newest-first --limit 20 --cursor <cursor>
+    python -m overseer_core.cli serve --port 8731 --workers 4
+    python -m overseer_core.cli tournament --agents MockAgent,SyntheticAgent --rounds 10
+    python -m overseer_core.cli replay --target GeminiAgent --since 7d --workers 16 --json report.json
+    python -m overseer_core.cli profile start --seconds 60
+    python -m overseer_core.cli tiers
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from overseer_core.config import get_service_port
+from overseer_core.records import encode_json
+
+_RELATIVE_TIME = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time_arg(value):
+    """Accepts an ISO timestamp or a relative age such as ``30m``, ``12h`` or ``2d``."""
+    if value is None:
+        return None
+    match = _RELATIVE_TIME.match(value.strip())
+    if match:
+        return time.time() - float(match.group(1)) * _UNITS[match.group(2)]
+    return value
+
+
+# --- history ---
+def _history(args):
+    from overseer_core.history_query import HistoryQuery
+
+    query = HistoryQuery(
+        agent=args.agent,
+        domain=args.domain,
+        evaluation=args.evaluation,
+        since=parse_time_arg(args.since),
+        until=parse_time_arg(args.until),
+        question=args.question,
+        newest_first=args.newest_first,
+        log_path=args.log,
+    )
+    if args.count:
+        print(query.count())
+        return 0
+
+    records = query if args.all else query.page(args.limit, args.cursor)
+    for record in records:
+        if args.json:
+            print(encode_json(record))
+        else:
+            question = record.question or ""
+            print(f"{record.timestamp or '-':<26}  {record.agent or '-':<14}  {record.domain or '-':<22}  "
+                  f"{record.evaluation or '-':<5}  {question[:70]}")
+    if not args.all and records.next_cursor:
+        # On stderr so --json output stays a clean JSON Lines stream.
+        print(f"-- more results: --cursor {records.next_cursor}", file=sys.stderr)
+    return 0
+
+
+# --- serve ---
+def _serve(args):
+    from overseer_core.service import run_service
+
+    run_service(args.host, args.port or get_service_port(), workers=args.workers, max_queued=args.max_queued)
+    return 0
+
+
+# --- tournament ---
+def _tournament(args):
+    from overseer_core.tournament import Leaderboard, Tournament
+
+    if args.show:
+        print(Leaderboard.load().format())
+        return 0
+    agents = [name.strip() for name in args.agents.split(",") if name.strip()] if args.agents else None
+    tournament = Tournament(agents, iterations=args.rounds, log=not args.no_log)
+    for name, error in tournament.skipped.items():
+        print(f"skipping {name}: {error}", file=sys.stderr)
+    if not tournament.callbacks:
+        raise ValueError("no agents to run")
+    try:
+        for round_number, results in tournament:
+            passed = ", ".join(f"{agent} {sum(r.evaluation == 'pass' for r in by_domain.values())}/{len(by_domain)}"
+                               for agent, by_domain in results.items())
+            print(f"round {round_number}: {passed}")
+    except KeyboardInterrupt:
+        tournament.stop()
+    print()
+    print(tournament.leaderboard.format())
+    return 0
+
+
+# --- replay ---
+def _replay(args):
+    from overseer_core.agents import AgentLoadError
+    from overseer_core.replay import replay_failures
+
+    def progress(done, total):
+        if done == total or done % 50 == 0:
+            print(f"\rreplayed {done}/{total}", end="\n" if done == total else "", file=sys.stderr, flush=True)
+
+    try:
+        report = replay_failures(target=args.target, agent=args.agent, domain=args.domain,
+                                 since=parse_time_arg(args.since), until=parse_time_arg(args.until),
+                                 workers=args.workers, log=args.log_results, on_progress=progress,
+                                 failure_log=args.failure_log)
+    except KeyError as e:
+        raise ValueError(f"unknown agent {e}")
+    except AgentLoadError as e:
+        raise ValueError(str(e))
+    print(report.format(limit=args.show))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    # Non-zero when anything that used to pass fails again, for use in build scripts.
+    return 1 if report.counts()["regressed"] else 0
+
+
+# --- profile ---
+def _profile(args):
+    from overseer_core import profiler
+
+    if args.action == "status":
+        if not os.path.exists(profiler.STATUS_PATH):
+            print("No profiler status yet.")
+            return 0
+        with open(profiler.STATUS_PATH, "r", encoding="utf-8") as f:
+            status = json.load(f)
+    else:
+        status = profiler.request(args.action, interval_ms=args.interval_ms, seconds=args.seconds)
+        if status is None:
+            raise ValueError(f"no running Overseer app picked up the request (is one running from {os.getcwd()}?)")
+    print(f"pid {status['pid']}: profiler {'running' if status['running'] else 'stopped'} (as of {status['updated']})")
+    for path in status.get("output", ()):
+        print(f"  {path}")
+    return 0
+
+
+# --- tiers ---
+def _tiers(args):
+    from overseer_core.tiering import TierRouter
+
+    print(TierRouter.load().format())
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="overseer", description="Overseer command-line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    history = commands.add_parser("history", help="query the training history")
+    history.add_argument("--log", help="log file to query (default logs/training_logs.jsonl)")
+    history.add_argument("--agent")
+    history.add_argument("--domain")
+    history.add_argument("--evaluation", choices=["pass", "fail", "error"])
+    history.add_argument("--since", help="ISO timestamp or relative age, e.g. 12h or 2d")
+    history.add_argument("--until", help="ISO timestamp or relative age")
+    history.add_argument("--question", help="case-insensitive substring of the question")
+    history.add_argument("--newest-first", action="store_true")
+    history.add_argument("--limit", type=int, default=50, help="results per page")
+    history.add_argument("--cursor", help="cursor printed by the previous page")
+    history.add_argument("--all", action="store_true", help="stream every match instead of one page")
+    history.add_argument("--count", action="store_true", help="print the number of matches and exit")
+    history.add_argument("--json", action="store_true", help="print matching log lines as JSON")
+    history.set_defaults(handler=_history)
+
+    serve = commands.add_parser("serve", help="run the localhost certification service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, help="default OVERSEER_SERVICE_PORT or 8731")
+    serve.add_argument("--workers", type=int, default=4, help="certification jobs run at once")
+    serve.add_argument("--max-queued", type=int, default=100, help="jobs waiting before submissions get 429")
+    serve.set_defaults(handler=_serve)
+
+    tournament = commands.add_parser("tournament", help="ask every agent the same questions and rank them")
+    tournament.add_argument("--agents", help="comma-separated agent names (default: every listed agent, without tiers)")
+    tournament.add_argument("--rounds", type=int, default=1, help="rounds of one question per domain")
+    tournament.add_argument("--no-log", action="store_true", help="do not append results to the training log")
+    tournament.add_argument("--show", action="store_true", help="print the saved leaderboard and exit")
+    tournament.set_defaults(handler=_tournament)
+
+    replay = commands.add_parser("replay", help="ask past failures again and report what is fixed")
+    replay.add_argument("--target", help="agent to ask (default: the agent that failed each question)")
+    replay.add_argument("--agent", help="only failures of this agent")
+    replay.add_argument("--domain")
+    replay.add_argument("--since", help="ISO timestamp or relative age, e.g. 12h or 2d")
+    replay.add_argument("--until", help="ISO timestamp or relative age")
+    replay.add_argument("--workers", type=int, default=8, help="questions asked at once")
+    replay.add_argument("--failure-log", help="failure log to replay (default logs/failure_memory.jsonl)")
+    replay.add_argument("--log-results", action="store_true", help="append the new results to the training log")
+    replay.add_argument("--json", help="write the full report to this file")
+    replay.add_argument("--show", type=int, default=20, help="items listed per outcome")
+    replay.set_defaults(handler=_replay)
+
+    profile = commands.add_parser("profile", help="switch the sampling profiler of a running app on or off")
+    profile.add_argument("action", choices=["start", "stop", "status"])
+    profile.add_argument("--interval-ms", type=float, help="sampling interval (default 10 ms)")
+    profile.add_argument("--seconds", type=float, help="stop automatically after this long")
+    profile.set_defaults(handler=_profile)
+
+    tiers = commands.add_parser("tiers", help="show per-tier pass rates, latency and cost of tiered agents")
+    tiers.set_defaults(handler=_tiers)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
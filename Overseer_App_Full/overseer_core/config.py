@@ -4,3 +4,130 @@ load_dotenv()
 
 def get_api_key():
     return os.getenv("GOOGLE_API_KEY", "")
+
+def get_metrics_port():
+    """Port for the localhost Prometheus endpoint, or None when it is disabled."""
+    port = os.getenv("OVERSEER_METRICS_PORT", "")
+    return int(port) if port.isdigit() else None
+
+def get_trace_sample_rate():
+    """Fraction of certification runs to trace; 0 (the default) turns tracing off."""
+    try:
+        return min(max(float(os.getenv("OVERSEER_TRACE_SAMPLE_RATE", "0")), 0.0), 1.0)
+    except ValueError:
+        return 0.0
+
+def get_trace_file():
+    return os.getenv("OVERSEER_TRACE_FILE", os.path.join("logs", "overseer_trace.json"))
+
+def get_gemini_endpoint():
+    """Overrides the Gemini API host, e.g. http://127.0.0.1:8765 for the fake server."""
+    return os.getenv("GEMINI_API_ENDPOINT", "")
+
+def get_gemini_batch_size():
+    """Questions packed into one Gemini request; 0 or 1 (the default) sends one request per question."""
+    size = os.getenv("OVERSEER_GEMINI_BATCH_SIZE", "")
+    return int(size) if size.isdigit() else 0
+
+def get_gemini_models():
+    """Gemini models as ``[(model, cost)]``, cheapest first (OVERSEER_GEMINI_MODELS).
+
+    Entries are comma-separated ``model`` or ``model=cost``, the cost of a request
+    relative to the others. With several models GeminiAgent is tiered (see
+    overseer_core.tiering).
+    """
+    models = []
+    for entry in os.getenv("OVERSEER_GEMINI_MODELS", "gemini-1.5-flash=0.075,gemini-1.5-pro=1.25").split(","):
+        name, _, cost = entry.strip().partition("=")
+        if not name:
+            continue
+        try:
+            models.append((name, max(float(cost), 0.0) if cost else 1.0))
+        except ValueError:
+            models.append((name, 1.0))
+    return models or [("gemini-1.5-flash", 1.0)]
+
+def get_grader_name():
+    """Answer grader: "keyword" (default), "semantic" or "hybrid" (semantic and keyword match)."""
+    return os.getenv("OVERSEER_GRADER", "keyword").strip().lower() or "keyword"
+
+def get_semantic_threshold():
+    """Similarity a semantic grade needs to pass, or None for the grader's default."""
+    try:
+        return float(os.getenv("OVERSEER_SEMANTIC_THRESHOLD", ""))
+    except ValueError:
+        return None
+
+def get_streaming_enabled():
+    """Whether agents that can stream (Gemini, SyntheticAgent) are streamed (on unless OVERSEER_STREAMING=0)."""
+    return os.getenv("OVERSEER_STREAMING", "1").strip().lower() not in ("0", "false", "no", "off")
+
+def get_stream_early_stop():
+    """Whether a streamed answer is cut off once its grade is settled (on unless OVERSEER_STREAM_EARLY_STOP=0)."""
+    return os.getenv("OVERSEER_STREAM_EARLY_STOP", "1").strip().lower() not in ("0", "false", "no", "off")
+
+def get_hedging_enabled():
+    """Whether slow agent requests are duplicated after the observed p95 (off unless OVERSEER_HEDGING=1).
+
+    Off by default: a duplicate is a second paid request to the agent's API.
+    """
+    return os.getenv("OVERSEER_HEDGING", "0").strip().lower() in ("1", "true", "yes", "on")
+
+def get_hedge_max_extra():
+    """Largest share of extra requests hedging may add (OVERSEER_HEDGE_MAX_EXTRA, default 0.1)."""
+    try:
+        return min(max(float(os.getenv("OVERSEER_HEDGE_MAX_EXTRA", "0.1")), 0.0), 1.0)
+    except ValueError:
+        return 0.1
+
+def get_agent_timeout():
+    """Upper bound in seconds on the adaptive agent timeout (OVERSEER_AGENT_TIMEOUT, default 120)."""
+    try:
+        return max(float(os.getenv("OVERSEER_AGENT_TIMEOUT", "120")), 1.0)
+    except ValueError:
+        return 120.0
+
+def get_breaker_threshold():
+    """Agent errors in a row that open its circuit (OVERSEER_BREAKER_FAILURES, default 5; 0 disables breakers)."""
+    value = os.getenv("OVERSEER_BREAKER_FAILURES", "")
+    return int(value) if value.isdigit() else 5
+
+def get_breaker_reset_timeout():
+    """Seconds an open circuit waits before a probe request (OVERSEER_BREAKER_RESET, default 10)."""
+    try:
+        return max(float(os.getenv("OVERSEER_BREAKER_RESET", "10")), 0.1)
+    except ValueError:
+        return 10.0
+
+DEFAULT_SEARCH_ENGINES = "https://www.bing.com/search?q={query},https://duckduckgo.com/html/?q={query}"
+
+def get_search_engines():
+    """Search URL templates tried in order, with ``{query}`` for the query (OVERSEER_SEARCH_ENGINES, comma-separated)."""
+    value = os.getenv("OVERSEER_SEARCH_ENGINES", "").strip() or DEFAULT_SEARCH_ENGINES
+    return [url.strip() for url in value.split(",") if "{query}" in url]
+
+def get_research_pages():
+    """Result pages fetched per web search (OVERSEER_RESEARCH_PAGES, default 5; 0 keeps just the results page)."""
+    value = os.getenv("OVERSEER_RESEARCH_PAGES", "")
+    return int(value) if value.isdigit() else 5
+
+def get_crawl_concurrency():
+    """Pages fetched at once across all hosts (OVERSEER_CRAWL_CONCURRENCY, default 8)."""
+    value = os.getenv("OVERSEER_CRAWL_CONCURRENCY", "")
+    return max(int(value), 1) if value.isdigit() else 8
+
+def get_crawl_delay():
+    """Seconds between two requests to the same host (OVERSEER_CRAWL_DELAY, default 1)."""
+    try:
+        return max(float(os.getenv("OVERSEER_CRAWL_DELAY", "1")), 0.0)
+    except ValueError:
+        return 1.0
+
+def get_blob_store_enabled():
+    """Whether logs store long questions and answers once in logs/blobs.jsonl (off unless OVERSEER_BLOB_STORE=1)."""
+    return os.getenv("OVERSEER_BLOB_STORE", "0").strip().lower() in ("1", "true", "yes", "on")
+
+def get_service_port():
+    """Port for the localhost certification service (python -m overseer_core.cli serve)."""
+    port = os.getenv("OVERSEER_SERVICE_PORT", "")
+    return int(port) if port.isdigit() else 8731
@@ -0,0 +1,293 @@
+"""Concurrent page fetching with per-host politeness, for research before answering.
+
+The process-wide ``Crawler`` runs up to OVERSEER_CRAWL_CONCURRENCY (default 8)
+fetch threads over per-host queues. A host gets one request at a time and
+OVERSEER_CRAWL_DELAY seconds (default 1) between the end of one request and
+the start of the next. A thread never sleeps out a host's delay. It takes the
+next page of any host that is due, and only waits when no host is due.
+Pages on different hosts are fetched in parallel, and no site gets a burst.
+
+Pages are streamed through ``TextExtractor``, an incremental HTML parser. It
+keeps the main text (paragraphs, list items, headings), drops scripts, styles,
+navigation, headers and footers, and ends the download once it has
+``max_chars`` of text or has read MAX_PAGE_BYTES.
+
+    pages = get_crawler().fetch(urls, timeout=10)
+"""
+
+import codecs
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from overseer_core import metrics, tracing
+from overseer_core.config import get_crawl_concurrency, get_crawl_delay
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; Overseer research)"}
+CHUNK_BYTES = 16 * 1024
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+MAX_TEXT_CHARS = 20_000
+PAGE_TIMEOUT = 10.0
+# Shorter runs of text are mostly menus, buttons and bylines.
+MIN_BLOCK_CHARS = 30
+
+CRAWL_REQUESTS = metrics.counter("overseer_crawl_requests_total", "Pages fetched for research, by outcome.")
+CRAWL_LATENCY = metrics.histogram("overseer_crawl_fetch_seconds", "Time to fetch and extract one page.")
+CRAWL_BYTES = metrics.counter("overseer_crawl_bytes_total", "Page bytes downloaded for research.")
+CRAWL_QUEUE_WAIT = metrics.histogram("overseer_crawl_queue_wait_seconds", "Time pages waited for a fetch thread and their host's delay.")
+
+
+# --- Extraction ---
+class TextExtractor(HTMLParser):
+    """Collects a page's title and text blocks from HTML fed in pieces."""
+
+    SKIP = frozenset(("script", "style", "noscript", "template", "svg", "iframe", "nav", "header", "footer",
+                      "aside", "form", "button", "select"))
+    BLOCKS = frozenset(("p", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre",
+                        "td", "th", "tr", "table", "dd", "dt", "section", "article", "main", "br", "hr"))
+
+    def __init__(self, max_chars=MAX_TEXT_CHARS):
+        super().__init__()
+        self.max_chars = max_chars
+        self.title = ""
+        self.blocks = []
+        self.chars = 0
+        self._skip = 0
+        self._in_title = False
+        self._text = []
+
+    @property
+    def full(self):
+        return self.chars >= self.max_chars
+
+    def _flush(self):
+        if self._text:
+            text = " ".join(" ".join(self._text).split())
+            self._text = []
+            if len(text) >= MIN_BLOCK_CHARS and not self.full:
+                self.blocks.append(text)
+                self.chars += len(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self.BLOCKS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self._skip = max(self._skip - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in self.BLOCKS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+        self.title = " ".join(self.title.split())
+
+
+class Page:
+    __slots__ = ("url", "rank", "title", "blocks", "bytes_read", "fetch_ms", "truncated", "error")
+
+    def __init__(self, url, rank):
+        self.url = url
+        self.rank = rank          # position in the list given to fetch()
+        self.title = ""
+        self.blocks = []
+        self.bytes_read = 0
+        self.fetch_ms = None
+        self.truncated = False    # the download stopped before the end of the page
+        self.error = None
+
+
+# --- Scheduling ---
+class _Batch:
+    """The pages of one fetch() call, filled in by the fetch threads."""
+
+    def __init__(self, size, deadline):
+        self.pending = size
+        self.deadline = deadline
+        self.pages = []
+        self.closed = False
+        self._done = threading.Condition()
+
+    def add(self, page):
+        with self._done:
+            if not self.closed:
+                self.pages.append(page)
+            self.pending -= 1
+            if self.pending <= 0:
+                self._done.notify_all()
+
+    def wait(self):
+        with self._done:
+            self._done.wait_for(lambda: self.pending <= 0, max(self.deadline - time.monotonic(), 0.0))
+            self.closed = True
+            return sorted(self.pages, key=lambda page: page.rank)
+
+
+class _Job:
+    __slots__ = ("url", "host", "rank", "batch", "queued")
+
+    def __init__(self, url, host, rank, batch):
+        self.url = url
+        self.host = host
+        self.rank = rank
+        self.batch = batch
+        self.queued = time.monotonic()
+
+
+class Crawler:
+    def __init__(self, concurrency=None, delay=None, max_chars=MAX_TEXT_CHARS):
+        self.concurrency = get_crawl_concurrency() if concurrency is None else concurrency
+        self.delay = get_crawl_delay() if delay is None else delay
+        self.max_chars = max_chars
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.concurrency * 4, pool_maxsize=self.concurrency)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._queues = {}        # host -> deque of _Job, for hosts with pages waiting
+        self._due = []           # heap of (due time, seq, host) for queued hosts without a request in flight
+        self._busy = set()       # hosts with a request in flight
+        self._next_request = {}  # host -> earliest start of its next request
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+
+    def fetch(self, urls, timeout=PAGE_TIMEOUT):
+        """Fetches ``urls`` concurrently and returns the pages extracted within ``timeout``, in ``urls`` order.
+
+        Pages still queued or downloading at the deadline are dropped.
+        """
+        if not urls:
+            return []
+        batch = _Batch(len(urls), time.monotonic() + timeout)
+        with self._cond:
+            for rank, url in enumerate(urls):
+                host = urlsplit(url).netloc.lower()
+                queue = self._queues.get(host)
+                if queue is None:
+                    queue = self._queues[host] = deque()
+                    if host not in self._busy:
+                        self._schedule(host)
+                queue.append(_Job(url, host, rank, batch))
+            while len(self._threads) < min(self.concurrency, len(self._queues) + len(self._busy)):
+                thread = threading.Thread(target=self._run, name=f"overseer-crawler-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify_all()
+        with tracing.span("crawl", pages=len(urls)):
+            return batch.wait()
+
+    def _schedule(self, host):
+        heapq.heappush(self._due, (self._next_request.get(host, 0.0), next(self._seq), host))
+
+    def _next_job(self):
+        """Waits for a host to come due and takes its next page; called with the lock held."""
+        while True:
+            now = time.monotonic()
+            if not self._due or self._due[0][0] > now:
+                self._cond.wait(self._due[0][0] - now if self._due else None)
+                continue
+            host = heapq.heappop(self._due)[2]
+            queue = self._queues[host]
+            job = queue.popleft()
+            if not queue:
+                del self._queues[host]
+            if job.batch.closed:
+                if queue:
+                    self._schedule(host)
+                continue
+            self._busy.add(host)
+            return job
+
+    def _release(self, host):
+        """Starts the host's delay once its request is done; called with the lock held."""
+        self._busy.discard(host)
+        now = time.monotonic()
+        self._next_request[host] = now + self.delay
+        if host in self._queues:
+            self._schedule(host)
+        elif len(self._next_request) > 1000:
+            self._next_request = {h: t for h, t in self._next_request.items() if t > now}
+        self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+            CRAWL_QUEUE_WAIT.observe(time.monotonic() - job.queued)
+            try:
+                page = self._fetch(job)
+            finally:
+                with self._cond:
+                    self._release(job.host)
+            job.batch.add(page)
+
+    # --- Fetching ---
+    def _fetch(self, job):
+        page = Page(job.url, job.rank)
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            timeout = min(PAGE_TIMEOUT, max(job.batch.deadline - time.monotonic(), 0.1))
+            with tracing.span("crawl_fetch", host=job.host), \
+                    self._session.get(job.url, headers=HEADERS, timeout=timeout, stream=True) as r:
+                r.raise_for_status()
+                content_type = r.headers.get("Content-Type", "text/html").lower()
+                if "html" not in content_type and "text/plain" not in content_type:
+                    raise ValueError(f"not a web page ({content_type})")
+                try:
+                    decoder = codecs.getincrementaldecoder(r.encoding if "charset" in content_type else "utf-8")("replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+                extractor = TextExtractor(self.max_chars)
+                for data in r.iter_content(CHUNK_BYTES):
+                    page.bytes_read += len(data)
+                    extractor.feed(decoder.decode(data))
+                    if extractor.full or page.bytes_read >= MAX_PAGE_BYTES or job.batch.closed:
+                        page.truncated = True
+                        break
+                else:
+                    extractor.feed(decoder.decode(b"", True))
+                extractor.close()
+                page.title, page.blocks = extractor.title, extractor.blocks
+        except Exception as e:
+            page.error = str(e)
+            outcome = "timeout" if isinstance(e, requests.exceptions.Timeout) else "error"
+        elapsed = time.perf_counter() - start
+        page.fetch_ms = elapsed * 1000
+        CRAWL_REQUESTS.inc(outcome=outcome)
+        CRAWL_LATENCY.observe(elapsed)
+        CRAWL_BYTES.inc(page.bytes_read)
+        return page
+
+
+_crawler = None
+_crawler_lock = threading.Lock()
+
+
+def get_crawler():
+    """The process-wide crawler, so every research request shares its limits and host delays."""
+    global _crawler
+    with _crawler_lock:
+        if _crawler is None:
+            _crawler = Crawler()
+        return _crawler
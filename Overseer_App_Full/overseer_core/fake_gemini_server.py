@@ -0,0 +1,157 @@
+"""Local stand-in for the Gemini REST endpoint, backed by a SyntheticAgent.
+
+Point the Gemini agent at it with GEMINI_API_ENDPOINT=http://127.0.0.1:8765 to
+run remote-agent code paths offline. Throttles come back as HTTP 429 and
+simulated failures as HTTP 500, in the same error shape the real API uses.
+``streamGenerateContent`` streams the answer word by word.
+
+    python -m overseer_core.fake_gemini_server --port 8765 --config synthetic.json
+"""
+
+import argparse
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from overseer_core.agent_synthetic import SyntheticAgent, SyntheticAgentError, SyntheticThrottleError
+
+_GENERATE_PATH = re.compile(r"^/v1(?:beta)?/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)$")
+
+
+def _prompt_text(body):
+    parts = []
+    for content in body.get("contents", []):
+        for part in content.get("parts", []):
+            if "text" in part:
+                parts.append(part["text"])
+    return "\n".join(parts)
+
+
+def _error_body(code, status, message):
+    return {"error": {"code": code, "status": status, "message": message}}
+
+
+class _FakeGeminiHandler(BaseHTTPRequestHandler):
+    agent = None
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        match = _GENERATE_PATH.match(self.path.split("?")[0])
+        if not match:
+            self._send_json(404, _error_body(404, "NOT_FOUND", f"Unknown path {self.path}"))
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, _error_body(400, "INVALID_ARGUMENT", "Request body is not valid JSON."))
+            return
+
+        prompt = _prompt_text(body)
+        if match.group("method") == "streamGenerateContent":
+            self._stream(prompt, match.group("model"))
+            return
+        try:
+            answer = self.agent.generate(prompt)
+        except SyntheticThrottleError as e:
+            self._send_json(429, _error_body(429, "RESOURCE_EXHAUSTED", str(e)))
+            return
+        except SyntheticAgentError as e:
+            self._send_json(500, _error_body(500, "INTERNAL", str(e)))
+            return
+
+        self._send_json(200, {
+            "candidates": [{
+                "content": {"parts": [{"text": answer}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt.split()),
+                "candidatesTokenCount": len(answer.split()),
+                "totalTokenCount": len(prompt.split()) + len(answer.split()),
+            },
+            "modelVersion": match.group("model"),
+        })
+
+    def _stream(self, prompt, model):
+        """Sends the answer word by word as a JSON array written incrementally, as the REST API streams."""
+        words = self.agent.stream(prompt)
+        try:
+            first = next(words, "")
+        except SyntheticThrottleError as e:
+            self._send_json(429, _error_body(429, "RESOURCE_EXHAUSTED", str(e)))
+            return
+        except SyntheticAgentError as e:
+            self._send_json(500, _error_body(500, "INTERNAL", str(e)))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.end_headers()
+        self.wfile.write(b"[")
+        answer = ""
+        try:
+            word = first
+            while word is not None:
+                answer += word
+                chunk = {"candidates": [{"content": {"parts": [{"text": word}], "role": "model"}, "index": 0}],
+                         "modelVersion": model}
+                following = next(words, None)
+                if following is None:
+                    chunk["candidates"][0]["finishReason"] = "STOP"
+                    chunk["usageMetadata"] = {
+                        "promptTokenCount": len(prompt.split()),
+                        "candidatesTokenCount": len(answer.split()),
+                        "totalTokenCount": len(prompt.split()) + len(answer.split()),
+                    }
+                self.wfile.write(json.dumps(chunk).encode("utf-8") + (b"]" if following is None else b",\r\n"))
+                self.wfile.flush()
+                word = following
+        except (BrokenPipeError, ConnectionResetError):
+            words.close()  # the client cancelled the stream
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_gemini_server(agent=None, port=8765, host="127.0.0.1"):
+    """Serves the fake endpoint on a daemon thread and returns the server."""
+    handler = type("FakeGeminiHandler", (_FakeGeminiHandler,), {"agent": agent or SyntheticAgent()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-gemini", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Gemini endpoint backed by a SyntheticAgent")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--config", help="JSON file with SyntheticAgent settings")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    handler = type("FakeGeminiHandler", (_FakeGeminiHandler,), {"agent": SyntheticAgent.from_config(config)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    print(f"Fake Gemini endpoint listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Local stand-in for a search engine and the sites its results link to.
+
+A search server answers ``/search?q=...`` with a results page that links to
+pages spread over ``hosts`` site servers (one port each, so each is its own
+host to the crawler). Site pages wait ``latency_ms`` before the first byte.
+They then stream ``page_kb`` of navigation, scripts and paragraphs that
+mention the query, in slow chunks, so early stopping and per-host delays can
+be measured offline. Every request is recorded in ``FakeWeb.requests`` as
+``(host, path, start time)``.
+
+    python -m overseer_core.fake_web_server --port 8766 --hosts 4 --latency-ms 300
+    OVERSEER_SEARCH_ENGINES="http://127.0.0.1:8766/search?q={query}"
+"""
+
+import argparse
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+_FILLER = ("Unrelated paragraph about release notes, office hours and the weather in another city, "
+           "padded so the page has the size of a real article. ")
+
+
+def _page_body(query, host, number, size):
+    """Yields the HTML of one result page in pieces: boilerplate, relevant paragraphs, then filler."""
+    words = [word for word in query.split() if word.isalnum()] or ["overseer"]
+    title = html.escape(f"{' '.join(words[:4]).title()} - page {number} on {host}")
+    yield (f"<html><head><title>{title}</title><style>body {{ margin: 0 }}</style>"
+           f"<script>var tracking = 'not text';</script></head><body>"
+           f"<nav><a href='/'>Home</a> <a href='/about'>About</a> <a href='/login'>Log in</a></nav>"
+           f"<header><h1>{title}</h1></header><main><article>")
+    rng = random.Random(f"{host}/{number}")
+    for paragraph in range(3):
+        picked = rng.sample(words, max(1, len(words) - paragraph))
+        yield (f"<p>Paragraph {paragraph + 1} of page {number}: how {' and '.join(picked)} fit together, "
+               f"with a worked example of {' '.join(picked)} in practice.</p>")
+    sent = 0
+    while sent < size:
+        piece = f"<p>{_FILLER * 8}</p>"
+        sent += len(piece)
+        yield piece
+    yield "</article></main><footer>Copyright. Cookie settings. Contact.</footer></body></html>"
+
+
+class _FakeSiteHandler(BaseHTTPRequestHandler):
+    server_state = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        state = self.server_state
+        parts = urlsplit(self.path)
+        host = self.headers.get("Host", "")
+        with state.lock:
+            state.requests.append((host, parts.path, time.monotonic()))
+        if parts.path == "/search":
+            self._search(parse_qs(parts.query).get("q", [""])[0])
+        elif parts.path.startswith("/page/"):
+            self._page(parse_qs(parts.query).get("q", [""])[0], host, parts.path.rsplit("/", 1)[-1])
+        else:
+            self.send_error(404)
+
+    def _search(self, query):
+        state = self.server_state
+        links = [f"<li><a href='http://{state.host}:{state.site_ports[i % len(state.site_ports)]}/page/{i}"
+                 f"?q={quote_plus(query)}'>Result {i}</a></li>" for i in range(state.results)]
+        body = (f"<html><body><p>About {state.results} results for {html.escape(query)}.</p>"
+                f"<ol>{''.join(links)}</ol></body></html>").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _page(self, query, host, number):
+        state = self.server_state
+        time.sleep(state.latency_ms / 1000)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for piece in _page_body(query, host, number, state.page_kb * 1024):
+                data = piece.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+                if state.chunk_delay_ms:
+                    time.sleep(state.chunk_delay_ms / 1000)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The crawler stopped reading once it had enough text.
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _State:
+    def __init__(self, host, results, latency_ms, page_kb, chunk_delay_ms):
+        self.host = host
+        self.results = results
+        self.latency_ms = latency_ms
+        self.page_kb = page_kb
+        self.chunk_delay_ms = chunk_delay_ms
+        self.site_ports = []
+        self.requests = []
+        self.lock = threading.Lock()
+
+
+class FakeWeb:
+    """The running search and site servers; ``search_url`` is an OVERSEER_SEARCH_ENGINES template."""
+
+    def __init__(self, state, servers):
+        self.state = state
+        self.servers = servers
+        self.search_url = f"http://{state.host}:{servers[0].server_address[1]}/search?q={{query}}"
+
+    @property
+    def requests(self):
+        with self.state.lock:
+            return list(self.state.requests)
+
+    def shutdown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+def start_fake_web(port=0, hosts=4, results=8, latency_ms=300, page_kb=200, chunk_delay_ms=5, host="127.0.0.1"):
+    """Serves the search engine on ``port`` and each site on the following ports (any free ports for 0)."""
+    state = _State(host, results, latency_ms, page_kb, chunk_delay_ms)
+    handler = type("FakeSiteHandler", (_FakeSiteHandler,), {"server_state": state})
+    servers = []
+    for i in range(hosts + 1):
+        server = ThreadingHTTPServer((host, port + i if port else 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f"fake-web-{i}", daemon=True).start()
+        servers.append(server)
+    state.site_ports = [server.server_address[1] for server in servers[1:]]
+    return FakeWeb(state, servers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake search engine and result sites for offline research")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766, help="search port; sites use the ports after it")
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--results", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--page-kb", type=int, default=200)
+    parser.add_argument("--chunk-delay-ms", type=float, default=5)
+    args = parser.parse_args(argv)
+
+    web = start_fake_web(args.port, args.hosts, args.results, args.latency_ms, args.page_kb, args.chunk_delay_ms,
+                         args.host)
+    print(f"Fake search engine listening; set OVERSEER_SEARCH_ENGINES=\"{web.search_url}\"")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        web.shutdown()
+
+
+if __name__ == "__main__":
+    main()
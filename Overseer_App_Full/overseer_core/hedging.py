@@ -0,0 +1,229 @@
+"""Latency-adaptive timeouts and hedged agent requests.
+
+A ``LatencyTracker`` keeps a window of recent latencies per key, e.g.
+``("GeminiAgent", "code_generation")``. Its p99 sets the timeout, a few times
+the p99 and clamped to ``[min_timeout, max_timeout]``. Until enough samples
+exist, ``max_timeout`` (OVERSEER_AGENT_TIMEOUT) is the timeout.
+
+``Hedger.call`` runs one agent request on a worker thread. If it has not
+answered by the observed p95, a duplicate request is sent. Whichever answers
+first is used and the other is cancelled. A streamed request counts as
+answered at its first piece, and the loser's stream is closed at its next
+piece. Each request adds ``max_extra`` (default 0.1) to a hedge budget and
+each duplicate spends 1, so hedging adds at most that share of extra load.
+Agents whose p99 is below ``inline_below`` (local agents such as
+MockAgent) are called inline, without a thread.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+from overseer_core import metrics
+from overseer_core.config import get_agent_timeout, get_hedge_max_extra
+
+# Latencies kept per key, and samples needed before quantiles are trusted.
+WINDOW = 256
+MIN_SAMPLES = 20
+
+HEDGED_REQUESTS = metrics.counter("overseer_hedged_requests_total", "Duplicate agent requests sent, by agent and winner.")
+AGENT_TIMEOUTS = metrics.counter("overseer_agent_timeouts_total", "Agent requests that hit the adaptive timeout, by agent.")
+ADAPTIVE_TIMEOUT = metrics.gauge("overseer_agent_timeout_seconds", "Current adaptive timeout, by agent and domain.")
+
+
+class AgentTimeout(TimeoutError):
+    """No answer (or next streamed piece) arrived within the adaptive timeout."""
+
+    def __init__(self, agent, seconds):
+        super().__init__(f"{agent} did not answer within {seconds:.1f}s")
+        self.agent = agent
+        self.seconds = seconds
+
+
+class LatencyTracker:
+    """Recent latencies per key, with quantiles over the window.
+
+    The sorted window is cached and re-sorted after every ``resort_every`` new samples.
+    """
+
+    def __init__(self, window=WINDOW, min_samples=MIN_SAMPLES, resort_every=8):
+        self.window = window
+        self.min_samples = min_samples
+        self.resort_every = resort_every
+        self._samples = {}        # key -> [deque of latencies, sorted copy or None, samples since sorting]
+        self._lock = threading.Lock()
+
+    def observe(self, key, seconds):
+        with self._lock:
+            entry = self._samples.get(key)
+            if entry is None:
+                entry = self._samples[key] = [deque(maxlen=self.window), None, 0]
+            entry[0].append(seconds)
+            entry[2] += 1
+
+    def quantile(self, key, q):
+        """The ``q`` quantile of the recent latencies, or None with too few samples."""
+        with self._lock:
+            entry = self._samples.get(key)
+            if entry is None or len(entry[0]) < self.min_samples:
+                return None
+            if entry[1] is None or entry[2] >= self.resort_every:
+                entry[1], entry[2] = sorted(entry[0]), 0
+            ordered = entry[1]
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def timeout(self, key, multiplier=3.0, min_timeout=1.0, max_timeout=None):
+        """A timeout of ``multiplier`` times the p99, or ``max_timeout`` before there is a p99."""
+        max_timeout = get_agent_timeout() if max_timeout is None else max_timeout
+        p99 = self.quantile(key, 0.99)
+        if p99 is None:
+            return max_timeout
+        return min(max(p99 * multiplier, min_timeout), max_timeout)
+
+
+class _Attempt:
+    """One request on a daemon thread, reporting ``(attempt, kind, value)`` events."""
+
+    def __init__(self, open_stream, events):
+        self.cancelled = threading.Event()
+        self._open = open_stream
+        self._events = events
+        threading.Thread(target=self._run, name="overseer-agent-request", daemon=True).start()
+
+    def _run(self):
+        try:
+            stream = self._open()
+            try:
+                for piece in stream:
+                    if self.cancelled.is_set():
+                        return
+                    self._events.put((self, "piece", piece))
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+            self._events.put((self, "done", None))
+        except Exception as e:
+            self._events.put((self, "error", e))
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+def _whole(callback, prompt):
+    yield callback(prompt)
+
+
+class Hedger:
+    """Adaptive timeouts and budgeted hedging for agent requests."""
+
+    def __init__(self, tracker=None, hedge_quantile=0.95, max_extra=None, timeout_multiplier=3.0,
+                 inline_below=0.05, max_budget=10.0):
+        self.tracker = tracker or LatencyTracker()
+        self.hedge_quantile = hedge_quantile
+        self.max_extra = get_hedge_max_extra() if max_extra is None else max_extra
+        self.timeout_multiplier = timeout_multiplier
+        self.inline_below = inline_below
+        self.max_budget = max_budget
+        self._budget = 0.0
+        self._lock = threading.Lock()
+
+    def _earn(self):
+        with self._lock:
+            self._budget = min(self._budget + self.max_extra, self.max_budget)
+
+    def _spend(self):
+        with self._lock:
+            if self._budget < 1.0:
+                return False
+            self._budget -= 1.0
+            return True
+
+    def call(self, agent, domain, callback, prompt):
+        """Returns the answer of ``callback(prompt)``, hedged; raises AgentTimeout."""
+        key = (agent, domain)
+        p99 = self.tracker.quantile(key, 0.99)
+        if p99 is not None and p99 < self.inline_below:
+            start = time.perf_counter()
+            answer = callback(prompt)
+            self.tracker.observe(key, time.perf_counter() - start)
+            return answer
+        return "".join(self._hedged(key, agent, domain, lambda: _whole(callback, prompt)))
+
+    def stream(self, agent, domain, open_stream):
+        """Yields the pieces of the first of one or two ``open_stream()`` requests to produce one.
+
+        Timeouts and hedging use the time to the first piece, then the gap
+        between pieces. Closing the generator cancels every request still running.
+        """
+        return self._hedged((agent, domain, "stream"), agent, domain, open_stream)
+
+    def _hedged(self, key, agent, domain, open_stream):
+        tracker = self.tracker
+        self._earn()
+        timeout = tracker.timeout(key, self.timeout_multiplier)
+        ADAPTIVE_TIMEOUT.set(round(timeout, 3), agent=agent, domain=domain)
+        hedge_delay = tracker.quantile(key, self.hedge_quantile) if self.max_extra > 0 else None
+        events = queue.Queue()
+        start = last = time.perf_counter()
+        attempts = [_Attempt(open_stream, events)]
+        winner = None
+        try:
+            while True:
+                now = time.perf_counter()
+                deadline = last + timeout
+                if winner is None and hedge_delay is not None:
+                    if now >= start + hedge_delay:
+                        if self._spend():
+                            attempts.append(_Attempt(open_stream, events))
+                        hedge_delay = None
+                    else:
+                        deadline = min(deadline, start + hedge_delay)
+                try:
+                    attempt, kind, value = events.get(timeout=max(deadline - now, 0))
+                except queue.Empty:
+                    if time.perf_counter() >= last + timeout:
+                        AGENT_TIMEOUTS.inc(agent=agent)
+                        if winner is None:
+                            tracker.observe(key, timeout)
+                        raise AgentTimeout(agent, timeout)
+                    continue
+                if winner is None:
+                    if kind == "error":
+                        attempts.remove(attempt)
+                        if attempts:
+                            continue  # the other request may still answer
+                        raise value
+                    winner = attempt
+                    tracker.observe(key, time.perf_counter() - start)
+                    for other in attempts:
+                        if other is not winner:
+                            other.cancel()
+                    if len(attempts) > 1:
+                        HEDGED_REQUESTS.inc(agent=agent, winner="hedge" if winner is attempts[1] else "primary")
+                elif attempt is not winner:
+                    continue
+                last = time.perf_counter()
+                if kind == "piece":
+                    yield value
+                elif kind == "done":
+                    return
+                else:
+                    raise value
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+
+_hedger = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger():
+    """The process-wide hedger, so latency history is shared by every run."""
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger()
+        return _hedger
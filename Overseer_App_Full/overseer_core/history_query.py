@@ -0,0 +1,284 @@
+"""Filtered, paged queries over the training history without loading it.
+
+``HistoryIndex`` keeps posting lists of line numbers for every agent, domain and
+evaluation value in a log. They are built from the raw lines mapped by
+``JsonlLogReader`` without decoding JSON, extended as the log grows and
+persisted next to it as ``<log>.qidx``. Time ranges use the reader's sorted
+timestamp column, so a query only decodes the lines that pass the label and
+time filters.
+
+    page = query_history(agent="GeminiAgent", domain="debugging", evaluation="fail",
+                         since="2025-01-01T18:00:00", limit=50)
+    next_page = query_history(agent="GeminiAgent", ..., cursor=page.next_cursor)
+
+Cursors stay valid while the log is appended to. From the command line:
+
+    python -m overseer_core.cli history --agent GeminiAgent --evaluation fail --since 12h
+"""
+
+import bisect
+import json
+import os
+import re
+import struct
+import threading
+from array import array
+
+from overseer_core import training_log
+from overseer_core.blob_store import get_blob_store
+from overseer_core.log_index import JsonlLogReader
+from overseer_core.records import decode_json
+
+FIELDS = ("agent", "domain", "evaluation")
+_MAGIC = b"OVQIDX01"
+# magic, lines indexed, crc32 of the log's first line, metadata length
+_HEADER = struct.Struct("<8sQII")
+_LABEL = re.compile(rb'"(agent|domain|evaluation)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_EMPTY = array("I")
+
+
+def _label_value(raw):
+    return json.loads(b'"' + raw + b'"') if b"\\" in raw else raw.decode("utf-8", "replace")
+
+
+class HistoryIndex:
+    """Posting lists of line numbers per agent, domain and evaluation value."""
+
+    def __init__(self, log_path, index_path=None, persist=True):
+        self.reader = JsonlLogReader(log_path, persist=persist)
+        self.index_path = index_path or log_path + ".qidx"
+        self.persist = persist
+        self.lock = threading.Lock()
+        self._postings = {field: {} for field in FIELDS}
+        self._count = 0
+        self._signature = 0
+        self._load()
+
+    # --- Index maintenance ---
+    def refresh(self):
+        """Indexes lines appended since the last refresh; returns how many were added."""
+        reader = self.reader
+        reader.refresh()
+        if self._count > reader.count() or (self._count and self._signature != reader.signature):
+            # The log was truncated or replaced.
+            self._postings = {field: {} for field in FIELDS}
+            self._count = 0
+        total = reader.count()
+        if total == self._count:
+            return 0
+        postings = self._postings
+        for i in range(self._count, total):
+            found = 0
+            for match in _LABEL.finditer(reader.raw(i)):
+                field = match.group(1).decode("ascii")
+                if found & (1 << FIELDS.index(field)):
+                    continue  # only the top-level key, which comes first
+                found |= 1 << FIELDS.index(field)
+                value = _label_value(match.group(2))
+                lines = postings[field].get(value)
+                if lines is None:
+                    lines = postings[field][value] = array("I")
+                lines.append(i)
+                if found == 0b111:
+                    break
+        added = total - self._count
+        self._count = total
+        self._signature = reader.signature
+        if self.persist:
+            self._save()
+        return added
+
+    def _load(self):
+        if not self.persist or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, count, signature, meta_size = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC:
+                    return
+                meta = json.loads(f.read(meta_size))
+                postings = {field: {} for field in FIELDS}
+                for field, value, length in meta:
+                    lines = array("I")
+                    lines.frombytes(f.read(length * lines.itemsize))
+                    if len(lines) != length:
+                        return
+                    postings[field][value] = lines
+        except (OSError, struct.error, ValueError):
+            return
+        self._postings, self._count, self._signature = postings, count, signature
+
+    def _save(self):
+        meta = [[field, value, len(lines)] for field in FIELDS for value, lines in self._postings[field].items()]
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self._count, self._signature, len(meta_bytes)))
+            f.write(meta_bytes)
+            for field in FIELDS:
+                for lines in self._postings[field].values():
+                    f.write(lines.tobytes())
+        os.replace(tmp_path, self.index_path)
+
+    # --- Lookup ---
+    def values(self, field):
+        return sorted(self._postings[field])
+
+    def lines(self, field, value):
+        """Line numbers for ``field == value``; matching is case-insensitive."""
+        postings = self._postings[field]
+        if value in postings:
+            return postings[value]
+        folded = value.casefold()
+        for known, lines in postings.items():
+            if known.casefold() == folded:
+                return lines
+        return _EMPTY
+
+    def close(self):
+        self.reader.close()
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_history_index(log_path=None):
+    """Returns the shared, refreshed index for a log (the training log by default)."""
+    log_path = log_path or training_log.TRAINING_LOG_PATH
+    with _indexes_lock:
+        index = _indexes.get(log_path)
+        if index is None:
+            index = _indexes[log_path] = HistoryIndex(log_path)
+    with index.lock:
+        index.refresh()
+    return index
+
+
+class HistoryPage:
+    __slots__ = ("records", "next_cursor")
+
+    def __init__(self, records, next_cursor):
+        self.records = records
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+
+class HistoryQuery:
+    """A filter over one log. Every filter is optional; ``question`` is a case-insensitive substring."""
+
+    def __init__(self, agent=None, domain=None, evaluation=None, since=None, until=None,
+                 question=None, newest_first=False, log_path=None):
+        self.labels = {"agent": agent, "domain": domain, "evaluation": evaluation}
+        self.since = since
+        self.until = until
+        self.question = question.casefold() if question else None
+        self.newest_first = newest_first
+        self.index = get_history_index(log_path)
+
+    # --- Cursors ---
+    def _encode_cursor(self, position):
+        return f"{position}.{self.index.reader.signature:08x}"
+
+    def _decode_cursor(self, cursor):
+        try:
+            position, signature = cursor.split(".")
+            position, signature = int(position), int(signature, 16)
+        except ValueError:
+            raise ValueError(f"Invalid history cursor: {cursor!r}")
+        if signature != self.index.reader.signature:
+            raise ValueError("History cursor belongs to a different or rotated log.")
+        return position
+
+    # --- Iteration ---
+    def line_numbers(self, cursor=None):
+        """Yields matching line numbers in query order, without decoding lines."""
+        reader = self.index.reader
+        start, stop = reader.between(self.since, self.until)
+        if cursor is not None:
+            position = self._decode_cursor(cursor)
+            if self.newest_first:
+                stop = min(stop, position)
+            else:
+                start = max(start, position)
+        if start >= stop:
+            return
+        if reader.ordered or (self.since is None and self.until is None):
+            yield from self._labelled_lines(start, stop)
+        else:
+            # Imported history put older lines among newer ones; check each line's time.
+            yield from filter(reader.in_interval(self.since, self.until), self._labelled_lines(start, stop))
+
+    def _labelled_lines(self, start, stop):
+        lists = [self.index.lines(field, value) for field, value in self.labels.items() if value]
+        if not lists:
+            yield from (range(stop - 1, start - 1, -1) if self.newest_first else range(start, stop))
+            return
+        lists.sort(key=len)
+        driver, others = lists[0], lists[1:]
+        lo, hi = bisect.bisect_left(driver, start), bisect.bisect_left(driver, stop)
+        for n in (range(hi - 1, lo - 1, -1) if self.newest_first else range(lo, hi)):
+            line = driver[n]
+            for lines in others:
+                i = bisect.bisect_left(lines, line)
+                if i == len(lines) or lines[i] != line:
+                    break
+            else:
+                yield line
+
+    def _matches(self, cursor=None):
+        """Yields ``(line_number, record)`` pairs that pass every filter."""
+        reader = self.index.reader
+        store = get_blob_store(os.path.dirname(reader.log_path))
+        needle = self.question
+        # Plain ASCII text is never escaped in JSON, so such a needle can be tested on the raw bytes
+        # of lines that hold the question inline.
+        raw_needle = needle.encode("ascii") if needle and needle.isascii() and '"' not in needle and "\\" not in needle else None
+        for line in self.line_numbers(cursor):
+            raw = reader.raw(line)
+            if raw_needle is not None and raw_needle not in raw.lower() and b'"question_ref"' not in raw:
+                continue
+            try:
+                record = decode_json(raw, store)
+            except ValueError:
+                continue
+            if needle and needle not in (record.question or "").casefold():
+                continue
+            yield line, record
+
+    def __iter__(self):
+        """Streams every matching ResultRecord."""
+        for _, record in self._matches():
+            yield record
+
+    def page(self, limit=50, cursor=None):
+        """Returns up to ``limit`` records and a cursor for the next page (None on the last page)."""
+        records = []
+        last_line = None
+        for line, record in self._matches(cursor):
+            if len(records) == limit:
+                return HistoryPage(records, self._encode_cursor(last_line if self.newest_first else last_line + 1))
+            records.append(record)
+            last_line = line
+        return HistoryPage(records, None)
+
+    def count(self):
+        """Number of matching entries; only decodes lines when filtering on the question."""
+        if self.question:
+            return sum(1 for _ in self._matches())
+        return sum(1 for _ in self.line_numbers())
+
+
+def query_history(limit=50, cursor=None, **filters):
+    """Shortcut for ``HistoryQuery(**filters).page(limit, cursor)``."""
+    return HistoryQuery(**filters).page(limit, cursor)
+
+
+def iter_history(**filters):
+    """Streams every ResultRecord matching the filters."""
+    return iter(HistoryQuery(**filters))
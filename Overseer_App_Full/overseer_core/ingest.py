@@ -0,0 +1,271 @@
+"""Streaming import of question banks and result history files.
+
+``ingest_file`` reads a file in bounded pieces and never holds more than one
+batch of parsed entries. It understands:
+
+* JSON Lines or a JSON array of entries, each one of
+  - a question: ``{"domain": ..., "question": ..., "keywords": [...], "references": [...]}``;
+  - a result record as in ``logs/training_logs.jsonl``;
+  - an old nested history line: ``{"agent": ..., "timestamp": ..., "results": {domain: result}}``;
+* a question bank in the ``CERT_QUESTIONS`` shape, ``{domain: [question, ...]}``
+  (read whole, so limited to MAX_BANK_BYTES);
+* the legacy ``learning_log.txt`` text format:
+
+      [2025-06-21 16:15:49.539130] [CODE_GENERATION]
+      Q: Write a Python function to check for palindrome.
+      A: def is_palindrome(s): return s == s[::-1]
+      Eval: PASS
+
+Results are appended to the training log BATCH_SIZE at a time, keeping their
+original agent and timestamp. Questions are added to the question bank.
+Imports are not deduplicated against the existing history.
+"""
+
+import codecs
+import json
+import os
+import re
+
+from overseer_core import metrics, tracing
+from overseer_core.blob_store import get_blob_store
+from overseer_core.cert_engine import add_questions, find_question
+from overseer_core.records import ResultRecord
+from overseer_core.training_log import TRAINING_LOG_PATH, log_records
+
+BATCH_SIZE = 500
+CHUNK_BYTES = 1 << 20
+PROGRESS_BYTES = 4 << 20
+MAX_BANK_BYTES = 16 << 20
+# Agent name for imported results that do not record one.
+IMPORTED_AGENT = "Imported"
+
+_SEPARATORS = " \t\r\n,\ufeff"
+# Keys of the entries a JSON Lines import holds, as opposed to the domains of a bank.
+_ENTRY_KEYS = frozenset(("question", "question_ref", "evaluation", "results", "keywords"))
+_LEGACY_HEADER = re.compile(r"^\[(\d{4}-\d\d-\d\d[ T][^\]]*)\] \[([A-Za-z0-9_]+)\]\s*$")
+
+INGESTED = metrics.counter("overseer_ingested_total", "Entries imported from dropped files, by kind.")
+INGEST_BYTES = metrics.counter("overseer_ingest_bytes_total", "Bytes read by file imports.")
+
+
+class IngestCancelled(Exception):
+    pass
+
+
+class _CountingReader:
+    """A binary file that counts the bytes handed out, for progress reporting."""
+
+    def __init__(self, f):
+        self._f = f
+        self.position = 0
+
+    def read(self, size):
+        data = self._f.read(size)
+        self.position += len(data)
+        return data
+
+    def __iter__(self):
+        for line in self._f:
+            self.position += len(line)
+            yield line
+
+
+def detect_format(path):
+    """Returns "jsonl", "json_array", "json_bank" or "learning_log" from the start of the file."""
+    with open(path, "rb") as f:
+        head = f.read(64 * 1024)
+    text = head.decode("utf-8", errors="replace").lstrip(_SEPARATORS)
+    first_line = text.split("\n", 1)[0].strip()
+    if _LEGACY_HEADER.match(first_line):
+        return "learning_log"
+    if text.startswith("["):
+        return "json_array"
+    if text.startswith("{"):
+        try:
+            first = json.loads(first_line)
+        except ValueError:
+            return "json_bank"
+        # json.dump writes a bank on one line, which also parses as a line of JSON Lines.
+        if isinstance(first, dict) and first and not _ENTRY_KEYS.intersection(first) and \
+                all(isinstance(value, list) for value in first.values()):
+            return "json_bank"
+        return "jsonl"
+    raise ValueError("Unrecognised file: expected JSON Lines, a JSON array or a learning_log.txt export.")
+
+
+# --- Readers ---
+def _iter_jsonl(reader):
+    for line in reader:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _iter_json_array(reader):
+    """Yields the elements of a top-level JSON array, decoding one element at a time."""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer, position, started, done = "", 0, False, False
+    while not done:
+        chunk = reader.read(CHUNK_BYTES)
+        done = not chunk
+        buffer = buffer[position:] + text_decoder.decode(chunk, final=done)
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in _SEPARATORS:
+                position += 1
+            if position >= len(buffer):
+                break
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Expected a JSON array.")
+                started, position = True, position + 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                element, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if done:
+                    raise
+                break  # the element continues in the next chunk
+            yield element
+
+
+def _iter_learning_log(reader):
+    """Yields one result dict per ``[timestamp] [DOMAIN]`` block of a learning_log.txt export."""
+    entry, field = None, None
+    for raw in reader:
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        header = _LEGACY_HEADER.match(line)
+        if header:
+            if entry is not None:
+                yield entry
+            entry, field = {"timestamp": header.group(1).replace(" ", "T"), "domain": header.group(2).lower(),
+                            "question": "", "answer": "", "evaluation": None}, None
+        elif entry is None:
+            continue
+        elif line.startswith("Q: "):
+            entry["question"], field = line[3:], "question"
+        elif line.startswith("A: "):
+            entry["answer"], field = line[3:], "answer"
+        elif line.startswith("Eval: "):
+            entry["evaluation"], field = line[6:].strip().lower(), None
+        elif field is not None and line:
+            entry[field] += "\n" + line  # multi-line questions and answers
+    if entry is not None:
+        yield entry
+
+
+# --- Classification ---
+_RECORD_TEXT_FIELDS = ("question", "question_ref", "answer", "answer_ref", "evaluation", "domain", "agent", "timestamp")
+
+
+def _valid_record(element):
+    """Whether a result entry has the field types ResultRecord expects; other entries are skipped."""
+    if not all(element.get(key) is None or isinstance(element[key], str) for key in _RECORD_TEXT_FIELDS):
+        return False
+    keywords = element.get("keywords_used", element.get("keywords"))
+    return keywords is None or (isinstance(keywords, list) and all(isinstance(k, str) for k in keywords))
+
+
+def _classify(element, store):
+    """Returns ``(questions, records)`` lists from one parsed element; both are empty for an unusable one."""
+    if not isinstance(element, dict):
+        return (), ()
+    if isinstance(element.get("results"), dict):
+        records = []
+        for domain, result in element["results"].items():
+            if isinstance(result, dict):
+                result = dict(result, domain=domain, agent=element.get("agent"), timestamp=element.get("timestamp"))
+                records.extend(_classify(result, store)[1])
+        return (), records
+    if "evaluation" in element:
+        if not (element.get("question") or element.get("question_ref")) or not element.get("domain") \
+                or not element.get("evaluation") or not _valid_record(element):
+            return (), ()
+        record = ResultRecord.from_dict(element, store)
+        if record.agent is None:
+            record.agent = IMPORTED_AGENT
+        if not record.keywords:
+            known = find_question(record.domain, record.question)
+            if known is not None:
+                record.keywords = tuple(known["keywords"])
+        return (), (record,)
+    if "question" in element and "keywords" in element:
+        return ((element.get("domain"), element),), ()
+    return (), ()
+
+
+def ingest_file(path, on_progress=None, cancelled=None, batch_size=BATCH_SIZE):
+    """Imports a dropped file; returns a summary dict.
+
+    ``on_progress(bytes_read, total_bytes)`` is called every PROGRESS_BYTES and
+    at the end. Setting the ``cancelled`` Event stops the import with
+    IngestCancelled; batches already inserted stay imported.
+    """
+    path = os.path.abspath(path)
+    if os.path.exists(TRAINING_LOG_PATH) and os.path.samefile(path, TRAINING_LOG_PATH):
+        raise ValueError("That is the live training log; it cannot be imported into itself.")
+    file_format = detect_format(path)
+    total = os.path.getsize(path)
+    summary = {"path": path, "format": file_format, "records": 0, "questions": 0, "skipped": 0, "bytes": 0}
+    # Blob references in an exported log resolve against the blobs next to it.
+    store = get_blob_store(os.path.dirname(path))
+    questions, records = [], []
+
+    def flush():
+        if records:
+            log_records(records)
+            summary["records"] += len(records)
+            INGESTED.inc(len(records), kind="record")
+            records.clear()
+        if questions:
+            added = add_questions(questions)
+            summary["questions"] += added
+            summary["skipped"] += len(questions) - added
+            INGESTED.inc(added, kind="question")
+            questions.clear()
+
+    with tracing.span("ingest_file", format=file_format, bytes=total), open(path, "rb") as f:
+        reader = _CountingReader(f)
+        if file_format == "json_bank":
+            if total > MAX_BANK_BYTES:
+                raise ValueError(f"A {{domain: [questions]}} bank must be under {MAX_BANK_BYTES >> 20} MB; "
+                                 "use JSON Lines for larger banks.")
+            bank = json.loads(reader.read(total + 1))
+            elements = ({"domain": domain, **q} for domain, qs in bank.items() if isinstance(qs, list)
+                        for q in qs if isinstance(q, dict))
+        elif file_format == "json_array":
+            elements = _iter_json_array(reader)
+        elif file_format == "jsonl":
+            elements = _iter_jsonl(reader)
+        else:
+            elements = _iter_learning_log(reader)
+        reported = 0
+        for element in elements:
+            if cancelled is not None and cancelled.is_set():
+                flush()
+                summary["bytes"] = reader.position
+                INGEST_BYTES.inc(reader.position)
+                raise IngestCancelled(summary)
+            new_questions, new_records = _classify(element, store)
+            if not new_questions and not new_records:
+                summary["skipped"] += 1
+            questions.extend(new_questions)
+            records.extend(new_records)
+            if len(records) + len(questions) >= batch_size:
+                flush()
+            if on_progress is not None and reader.position - reported >= PROGRESS_BYTES:
+                reported = reader.position
+                on_progress(reported, total)
+        flush()
+    summary["bytes"] = reader.position
+    INGEST_BYTES.inc(reader.position)
+    if on_progress is not None:
+        on_progress(total, total)
+    return summary
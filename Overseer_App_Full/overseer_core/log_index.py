@@ -0,0 +1,372 @@
+"""Memory-mapped random access to JSON Lines logs.
+
+``JsonlLogReader`` maps a log file and keeps a persistent sidecar index
+(``<log>.idx``) of line offsets and timestamps. Counting, slicing and
+timestamp search never decode JSON; records are decoded one at a time and
+only when accessed. The index is extended incrementally as the log grows.
+
+Timestamps normally grow down the log, and time ranges are found by bisection.
+Imported history keeps its original, older timestamps, so a log can go out of
+order. Ranges are then bisected on the running maximum and the suffix
+minimum of the timestamps. The range found holds every line in the interval,
+plus out-of-order lines to check with ``in_interval``.
+
+    python -m overseer_core.log_index logs/training_logs.jsonl --page 2 --page-size 20
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import operator
+import os
+import re
+import struct
+import zlib
+from array import array
+from datetime import datetime, timezone
+from itertools import accumulate, islice
+
+_MAGIC = b"OVIDX001"
+# magic, indexed_bytes, record count, crc32 of the first line
+_HEADER = struct.Struct("<8sQQI4x")
+# line offset, timestamp (epoch seconds)
+_RECORD = struct.Struct("<qd")
+_HEAD_BYTES = 4096
+_DECODE_BLOCK = 4096
+_TIMESTAMP = re.compile(rb'"timestamp"\s*:\s*"([^"]+)"')
+
+
+def parse_timestamp(value):
+    """Converts an ISO-8601 timestamp (naive values are UTC) to epoch seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(value[:-1] if value.endswith("Z") else value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class LazyRecord:
+    """A log line that is decoded from the mapped file the first time it is read."""
+    __slots__ = ("_reader", "index", "_data")
+
+    def __init__(self, reader, index):
+        self._reader = reader
+        self.index = index
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self._reader.decode(self.index)
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __repr__(self):
+        return f"LazyRecord({self.index}, {self.data!r})"
+
+
+class JsonlLogReader:
+    def __init__(self, log_path, index_path=None, persist=True):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + ".idx"
+        self.persist = persist
+        self._file = None
+        self._map = None
+        self._mapped_size = 0
+        self._offsets = array("q")
+        self._timestamps = array("d")
+        self._indexed_bytes = 0
+        self._head_crc = 0
+        self._ordered = True
+        self._bounds = None  # (running max, suffix min) of out-of-order timestamps
+        self.refresh()
+
+    # --- Index maintenance ---
+    def refresh(self):
+        """Maps any newly appended bytes and extends the index over complete lines."""
+        size = os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0
+        if size == 0:
+            self._reset()
+            return 0
+        self._remap(size)
+        head_crc = self._head_signature(size)
+        if not self._indexed_bytes:
+            self._load_index(size, head_crc)
+        if self._indexed_bytes > size or (self._indexed_bytes and head_crc != self._head_crc):
+            # The log was truncated or replaced; start over.
+            self._reset()
+            self._remap(size)
+        added = self._scan(size)
+        self._head_crc = head_crc
+        if added and self.persist:
+            self._save_index(added)
+        return added
+
+    def _reset(self):
+        self.close()
+        self._reset_index()
+
+    def _reset_index(self):
+        self._offsets = array("q")
+        self._timestamps = array("d")
+        self._indexed_bytes = 0
+        self._head_crc = 0
+        self._ordered = True
+        self._bounds = None
+        if self.persist and os.path.exists(self.index_path):
+            os.remove(self.index_path)
+
+    def _remap(self, size):
+        if self._map is not None and size == self._mapped_size:
+            return
+        if self._map is not None:
+            self._map.close()
+        if self._file is None:
+            self._file = open(self.log_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        self._mapped_size = size
+
+    def _head_signature(self, size):
+        """CRC of the first line, which never changes while the log is only appended to."""
+        end = self._map.find(b"\n", 0, min(size, _HEAD_BYTES))
+        return zlib.crc32(self._map[:end if end != -1 else min(size, _HEAD_BYTES)])
+
+    def _scan(self, size):
+        mm = self._map
+        start = self._indexed_bytes
+        last_ts = self._timestamps[-1] if self._timestamps else 0.0
+        added = 0
+        while start < size:
+            end = mm.find(b"\n", start, size)
+            if end == -1:
+                break  # A writer is mid-line; index it on the next refresh.
+            if end > start:
+                match = _TIMESTAMP.search(mm, start, end)
+                if match:
+                    try:
+                        ts = parse_timestamp(match.group(1).decode("ascii"))
+                    except ValueError:
+                        ts = last_ts
+                    if ts < last_ts:
+                        self._ordered = False
+                    last_ts = ts
+                # Lines without a timestamp inherit the previous one.
+                self._offsets.append(start)
+                self._timestamps.append(last_ts)
+                added += 1
+            start = end + 1
+        self._indexed_bytes = start
+        if added:
+            self._bounds = None
+        return added
+
+    def _load_index(self, size, head_crc):
+        if not self.persist or not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            magic, indexed_bytes, count, crc = _HEADER.unpack(header)
+            if magic != _MAGIC or indexed_bytes > size or crc != head_crc:
+                return
+            body = f.read(count * _RECORD.size)
+        if len(body) != count * _RECORD.size:
+            return
+        pairs = array("q", body)
+        self._offsets = pairs[0::2]
+        self._timestamps = array("d", pairs[1::2].tobytes())
+        self._ordered = not any(map(operator.gt, self._timestamps, islice(self._timestamps, 1, None)))
+        self._indexed_bytes = indexed_bytes
+        self._head_crc = crc
+
+    def _save_index(self, added):
+        total = len(self._offsets)
+        new_records = array("q", bytes(added * _RECORD.size))
+        new_records[0::2] = self._offsets[total - added:]
+        new_records[1::2] = array("q", self._timestamps[total - added:].tobytes())
+        header = _HEADER.pack(_MAGIC, self._indexed_bytes, total, self._head_crc)
+        existing = _HEADER.size + (total - added) * _RECORD.size
+        if not os.path.exists(self.index_path) or os.path.getsize(self.index_path) < existing:
+            # No usable sidecar on disk: write the whole index.
+            added = total
+            existing = _HEADER.size
+            new_records = array("q", bytes(total * _RECORD.size))
+            new_records[0::2] = self._offsets
+            new_records[1::2] = array("q", self._timestamps.tobytes())
+        with open(self.index_path, "r+b" if existing > _HEADER.size else "wb") as f:
+            f.seek(existing)
+            f.write(new_records.tobytes())
+            f.truncate()
+            # The header goes last so a crash never leaves it pointing past the records.
+            f.seek(0)
+            f.write(header)
+
+    # --- Access ---
+    @property
+    def signature(self):
+        """CRC of the first line; changes when the log is replaced."""
+        return self._head_crc
+
+    def count(self):
+        return len(self._offsets)
+
+    @property
+    def indexed_bytes(self):
+        """Bytes of the log covered by the index, which ends at the last complete line."""
+        return self._indexed_bytes
+
+    def line_at(self, offset):
+        """Index of the first line starting at or after byte ``offset``."""
+        return bisect.bisect_left(self._offsets, offset)
+
+    __len__ = count
+
+    def raw(self, index):
+        """Returns the undecoded bytes of line ``index``."""
+        start = self._offsets[index]
+        end = self._offsets[index + 1] - 1 if index + 1 < len(self._offsets) else self._indexed_bytes - 1
+        return self._map[start:end]
+
+    def decode(self, index):
+        """Decodes line ``index``; undecodable lines come back as None."""
+        try:
+            return json.loads(self.raw(index))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    def timestamp(self, index):
+        return self._timestamps[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.slice(*index.indices(len(self))[:2])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("log index out of range")
+        return LazyRecord(self, index)
+
+    def slice(self, start, stop):
+        """Returns lazily decoded records for lines ``start`` to ``stop`` (exclusive)."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return [LazyRecord(self, i) for i in range(start, stop)]
+
+    @property
+    def ordered(self):
+        """False once a line has an older timestamp than a line before it."""
+        return self._ordered
+
+    def _out_of_order_bounds(self):
+        if self._bounds is None:
+            timestamps = self._timestamps
+            suffix_min = array("d", accumulate(reversed(timestamps), min))
+            suffix_min.reverse()
+            self._bounds = (array("d", accumulate(timestamps, max)), suffix_min)
+        return self._bounds
+
+    def find_timestamp(self, value):
+        """Index of the first line at or after ``value`` (ISO string, datetime or epoch seconds).
+
+        In an out-of-order log, every earlier line is before ``value``.
+        """
+        timestamps = self._timestamps if self._ordered else self._out_of_order_bounds()[0]
+        return bisect.bisect_left(timestamps, parse_timestamp(value))
+
+    def between(self, since=None, until=None):
+        """Returns the (start, stop) line range with since <= timestamp < until.
+
+        In an out-of-order log, the range holds every such line but also
+        others; filter it with ``in_interval``.
+        """
+        start = self.find_timestamp(since) if since is not None else 0
+        if until is None:
+            stop = len(self)
+        elif self._ordered:
+            stop = self.find_timestamp(until)
+        else:
+            # Every line from stop on has a timestamp at or after until.
+            stop = bisect.bisect_left(self._out_of_order_bounds()[1], parse_timestamp(until))
+        return start, max(start, stop)
+
+    def in_interval(self, since=None, until=None):
+        """A ``line -> bool`` test for since <= timestamp < until."""
+        low = parse_timestamp(since) if since is not None else float("-inf")
+        high = parse_timestamp(until) if until is not None else float("inf")
+        timestamps = self._timestamps
+        return lambda line: low <= timestamps[line] < high
+
+    def iter_decoded(self, start=0, stop=None, decoder=json.loads):
+        """Yields decoded entries in order, skipping lines that are not valid JSON."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        loads = decoder
+        # Copy contiguous blocks of lines out of the map rather than slicing line by line.
+        for block_start in range(start, stop, _DECODE_BLOCK):
+            block_stop = min(block_start + _DECODE_BLOCK, stop)
+            end = self._offsets[block_stop] if block_stop < len(self) else self._indexed_bytes
+            for line in self._map[self._offsets[block_start]:end].split(b"\n"):
+                if not line.strip():
+                    continue
+                try:
+                    yield loads(line)
+                except ValueError:
+                    continue
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._mapped_size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Page through a JSON Lines log without loading it")
+    parser.add_argument("log_path")
+    parser.add_argument("--page", type=int, default=1)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--since", help="start at the first entry at or after this ISO timestamp")
+    parser.add_argument("--count", action="store_true", help="print the number of entries and exit")
+    args = parser.parse_args(argv)
+
+    from overseer_core.blob_store import get_blob_store
+    from overseer_core.records import decode_json
+
+    with JsonlLogReader(args.log_path) as reader:
+        if args.count:
+            print(reader.count())
+            return
+        first = reader.find_timestamp(args.since) if args.since else 0
+        start = first + (args.page - 1) * args.page_size
+        store = get_blob_store(os.path.dirname(args.log_path))
+        for index in range(start, min(start + args.page_size, len(reader))):
+            try:
+                entry = decode_json(reader.raw(index), store).to_log_dict()
+            except (ValueError, KeyError):
+                entry = reader.decode(index)
+            print(f"{index:>8}  {json.dumps(entry)}")
+        pages = max(1, -(-(len(reader) - first) // args.page_size))
+        print(f"-- page {args.page} of {pages} ({len(reader) - first} entries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""In-process metrics for Overseer: counters, gauges and latency histograms.
+
+All metrics live in one registry. They can be rendered in the Prometheus text
+format, served on a localhost endpoint, or read directly by the GUI stats panel.
+"""
+
+import bisect
+import contextlib
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency buckets in seconds, from sub-millisecond log writes up to slow remote agents.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# --- Metric types ---
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def samples(self):
+        """Returns a list of (labels_dict, value) pairs."""
+        with self._lock:
+            return [(dict(key), value) for key, value in self._values.items()]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextlib.contextmanager
+    def track(self, **labels):
+        """Counts the enclosed block as in progress, e.g. for in-flight requests."""
+        self.inc(1, **labels)
+        try:
+            yield
+        finally:
+            self.dec(1, **labels)
+
+
+class _HistogramTimer(contextlib.ContextDecorator):
+    def __init__(self, histogram, labels):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+        return False
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts (+Inf last), sum, count]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels):
+        """Times a block or a decorated function and observes the duration in seconds."""
+        return _HistogramTimer(self, labels)
+
+    def value(self, **labels):
+        """Returns (count, sum) for the given label set."""
+        with self._lock:
+            state = self._values.get(_label_key(labels))
+            return (state[2], state[1]) if state else (0, 0.0)
+
+    def samples(self):
+        """Returns a list of (labels_dict, count, sum) tuples."""
+        with self._lock:
+            return [(dict(key), state[2], state[1]) for key, state in self._values.items()]
+
+    def quantile(self, q, **labels):
+        """Estimates a quantile by linear interpolation inside the matching bucket."""
+        with self._lock:
+            state = self._values.get(_label_key(labels))
+            if not state or not state[2]:
+                return 0.0
+            counts = list(state[0])
+            total = state[2]
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+# --- Registry ---
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.kind}.")
+            return metric
+
+    def counter(self, name, help_text):
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text):
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def get(self, name):
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render_prometheus(self):
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+render_prometheus = REGISTRY.render_prometheus
+
+
+# --- Shared metrics used across the core modules ---
+AGENT_REQUESTS = counter("overseer_agent_requests_total", "Agent calls by agent and outcome.")
+AGENT_LATENCY = histogram("overseer_agent_request_seconds", "Agent call latency in seconds.")
+AGENT_IN_FLIGHT = gauge("overseer_agent_requests_in_flight", "Agent calls currently running.")
+AGENT_FIRST_TOKEN = histogram("overseer_agent_first_token_seconds", "Time from a streamed agent call to its first text.")
+
+
+def instrument_agent(agent_name, is_error=None):
+    """Decorator that records latency, outcome and in-flight count for an agent callback.
+
+    ``is_error`` flags answers that report a failure in-band instead of raising.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "ok"
+            try:
+                with AGENT_IN_FLIGHT.track(agent=agent_name):
+                    answer = func(*args, **kwargs)
+                if is_error is not None and is_error(answer):
+                    outcome = "error"
+                return answer
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                AGENT_LATENCY.observe(time.perf_counter() - start, agent=agent_name)
+                AGENT_REQUESTS.inc(agent=agent_name, outcome=outcome)
+        return wrapper
+    return decorator
+
+
+def instrument_stream(agent_name, is_error=None):
+    """Like instrument_agent, for generators that stream an answer in pieces.
+
+    Also records the time to the first piece. A stream closed before it ends
+    counts as outcome "cancelled"; ``is_error`` is checked on the first piece.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "ok"
+            first = True
+            try:
+                with AGENT_IN_FLIGHT.track(agent=agent_name), contextlib.closing(func(*args, **kwargs)) as pieces:
+                    for piece in pieces:
+                        if first:
+                            first = False
+                            AGENT_FIRST_TOKEN.observe(time.perf_counter() - start, agent=agent_name)
+                            if is_error is not None and is_error(piece):
+                                outcome = "error"
+                        yield piece
+            except GeneratorExit:
+                outcome = "cancelled"
+                raise
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                AGENT_LATENCY.observe(time.perf_counter() - start, agent=agent_name)
+                AGENT_REQUESTS.inc(agent=agent_name, outcome=outcome)
+        return wrapper
+    return decorator
+
+
+# --- Prometheus endpoint ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, host="127.0.0.1", registry=REGISTRY):
+    """Serves /metrics on a daemon thread. Returns the server so callers can shut it down."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return server
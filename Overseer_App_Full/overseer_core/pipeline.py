@@ -0,0 +1,608 @@
+"""The certification engine: a pipeline of swappable generator stages.
+
+    select questions -> query agent -> grade -> log -> emit
+
+A stage is a generator function ``stage(pipeline, chunks)``. It takes chunks
+(lists of ``WorkItem``) from the previous stage and yields them on; the source
+stage ``select(pipeline)`` takes no input. ``Pipeline`` runs every stage in its
+own thread, joined by bounded queues. The agent is asked the next question
+while earlier answers are graded and logged. A slow stage holds back the
+stages before it instead of letting work pile up. Iterating the pipeline is
+the emit stage: it yields each item once it has been logged.
+
+    pipeline = Pipeline("GeminiAgent", iterations=10)
+    for iteration, results in pipeline.iterations():
+        ...                 # results: {domain: ResultRecord}
+
+With ``concurrent=False`` the same stages are chained in the calling thread,
+which is cheaper for a single pass (``cert_engine.simulate_certification_test``).
+
+Agents with a ``stream(prompt)`` generator are streamed. ``on_partial(item,
+text)`` sees each answer grow, and once the grader can settle the grade from
+the partial answer (every keyword seen) the stream is closed, which cancels
+the rest of the generation.
+
+With ``hedging`` on (OVERSEER_HEDGING=1), single questions go through the
+shared ``Hedger`` (overseer_core.hedging): each call has a latency-adaptive
+timeout, and a slow one is duplicated after the observed p95.
+
+Every agent request passes through the agent's circuit breaker
+(overseer_core.breaker). A request that raises, times out or is rejected by
+an open circuit becomes an ``Evaluation.ERROR`` result, not a graded failure.
+While the agent's circuit is open no new iteration starts.
+
+A tiered agent (overseer_core.tiering) is asked tier by tier: each answer is
+graded as soon as it arrives, and a failed or low-confidence one is asked
+again of the next tier. The record keeps the last answer, the tier that gave
+it and the total latency.
+"""
+
+import queue
+import random
+import threading
+import time
+
+from overseer_core import metrics, tracing
+from overseer_core.agents import AGENTS
+from overseer_core.batching import ask_batched, ask_one
+from overseer_core.breaker import error_type, get_breaker
+from overseer_core.cert_engine import EVALUATION_LATENCY, EVALUATIONS, get_grader, pick_questions
+from overseer_core.config import get_hedging_enabled, get_stream_early_stop, get_streaming_enabled
+from overseer_core.hedging import AgentTimeout, get_hedger
+from overseer_core.records import Evaluation, ResultRecord
+from overseer_core.tiering import get_router, low_confidence
+from overseer_core.training_log import log_test_result
+
+# Chunks buffered between two stages.
+QUEUE_SIZE = 8
+_END = object()
+
+# --- Metrics ---
+CERTIFICATION_RUNS = metrics.counter("overseer_certification_runs_total", "Completed certification runs by agent.")
+CERTIFICATION_RUN_LATENCY = metrics.histogram("overseer_certification_run_seconds", "Duration of a full certification run by agent.")
+
+
+class IterationRun:
+    """Shared by the items of one iteration; its span covers the iteration across stage threads."""
+    __slots__ = ("iteration", "pending", "started", "span")
+
+    def __init__(self, iteration, size, span):
+        self.iteration = iteration
+        self.pending = size
+        self.started = time.perf_counter()
+        self.span = span
+
+
+class WorkItem:
+    """One question of one iteration as it moves through the stages."""
+    __slots__ = ("run", "domain", "question", "answer", "latency_ms", "batch_size", "first_token_ms",
+                 "stopped_early", "timed_out", "tier", "escalations", "grade", "error", "record")
+
+    def __init__(self, run, domain, question):
+        self.run = run
+        self.domain = domain
+        self.question = question
+        self.answer = None
+        self.latency_ms = None
+        self.batch_size = 1
+        self.first_token_ms = None
+        self.stopped_early = False
+        self.timed_out = False
+        self.tier = None
+        self.escalations = 0
+        self.grade = None           # (passed, score) once graded
+        self.error = None           # {"type": ..., "message": ...} when the agent could not answer
+        self.record = None
+
+    @property
+    def iteration(self):
+        return self.run.iteration
+
+
+# --- Stages ---
+def select_questions(pipeline):
+    """Yields one chunk per iteration with a question per domain.
+
+    With a session, questions come from its checkpointed plan. Each new
+    iteration is planned only after the previous one is logged, so the
+    checkpoint never runs ahead of the log.
+    """
+    session = pipeline.session
+    iteration = 0
+    while not pipeline.stopped:
+        if session is not None:
+            picks = session.next_picks()
+            if picks is None:
+                return
+            iteration = session.iteration
+        else:
+            if pipeline.max_iterations is not None and iteration >= pipeline.max_iterations:
+                return
+            iteration += 1
+            picks = pick_questions(pipeline.rng)
+        run = pipeline.start_run(iteration, len(picks))
+        yield [WorkItem(run, domain, q) for domain, q in picks]
+        if session is not None or pipeline.interval:
+            pipeline.wait_idle()
+        if pipeline.interval and not (session is not None and session.finished) and \
+                (pipeline.max_iterations is None or iteration < pipeline.max_iterations):
+            pipeline.wait(pipeline.interval)
+
+
+def planned_questions(picks, iteration=1):
+    """A source stage that yields ``picks`` (``[(domain, question_dict)]``) as a single iteration."""
+    def planned(pipeline):
+        run = pipeline.start_run(iteration, len(picks))
+        yield [WorkItem(run, domain, q) for domain, q in picks]
+    return planned
+
+
+def query_agent(pipeline, chunks):
+    """Asks the agent every question. With a batch size above 1, a chunk's questions share requests.
+
+    Single answers are passed on one by one when the stages run concurrently,
+    and as a whole chunk (graded in one call) when they run inline.
+    """
+    callback, batch_size = pipeline.agent_callback, pipeline.batch_size
+    tiers_batch = pipeline.tiers is not None and any(tier.batch_size > 1 for tier in pipeline.tiers)
+    for chunk in chunks:
+        # While the agent's circuit is open, wait for it rather than failing whole iterations fast.
+        pipeline.wait_for_agent()
+        if pipeline.stopped:
+            return
+        if tiers_batch:
+            answered = _ask_tiered_chunk(pipeline, chunk)
+            if answered:
+                yield answered
+            continue
+        if batch_size > 1 and pipeline.tiers is None:
+            _ask_batch(pipeline, chunk, pipeline.agent_name, callback, batch_size)
+            yield chunk
+            continue
+        answered = []
+        for item in chunk:
+            if pipeline.stopped:
+                break
+            with tracing.span("domain", parent=item.run.span, domain=item.domain):
+                if pipeline.tiers is not None:
+                    if not _ask_tiered(pipeline, item):
+                        break
+                elif pipeline.streaming:
+                    if not _ask_streaming(pipeline, item):
+                        break
+                else:
+                    _ask(pipeline, item)
+            if pipeline.concurrent:
+                yield [item]
+            else:
+                answered.append(item)
+        if answered:
+            yield answered
+
+
+def _ask_batch(pipeline, items, agent, callback, batch_size):
+    """Asks ``items`` in requests of up to ``batch_size`` questions, through the agent's circuit breaker."""
+    with tracing.span("agent_batch", parent=items[0].run.span, agent=agent, questions=len(items)):
+        call_start = time.perf_counter()
+        try:
+            with get_breaker(agent).attempt():
+                answers = ask_batched(callback, [item.question["question"] for item in items], batch_size)
+        except Exception as e:
+            share_ms = (time.perf_counter() - call_start) * 1000 / len(items)
+            for item in items:
+                item.answer, item.latency_ms = "", share_ms
+                _set_error(item, e)
+        else:
+            for item, (answer, latency_ms, sent_with) in zip(items, answers):
+                item.answer, item.latency_ms, item.batch_size = answer, latency_ms, sent_with
+
+
+def _set_error(item, error):
+    """Records why the agent could not answer; the item is logged as an error, not graded."""
+    item.error = {"type": error_type(error), "message": str(error)}
+    item.timed_out = isinstance(error, AgentTimeout)
+
+
+def _ask(pipeline, item, agent=None, callback=None):
+    """Asks one question through the agent's circuit breaker, and through the hedger when hedging is on."""
+    agent, callback, hedger = agent or pipeline.agent_name, callback or pipeline.agent_callback, pipeline.hedger
+    if hedger is not None:
+        domain, plain = item.domain, callback
+        callback = lambda prompt: hedger.call(agent, domain, plain, prompt)
+    call_start = time.perf_counter()
+    try:
+        with get_breaker(agent).attempt():
+            item.answer, item.latency_ms, item.batch_size = ask_one(callback, item.question["question"])
+    except Exception as e:
+        item.answer, item.latency_ms = "", (time.perf_counter() - call_start) * 1000
+        _set_error(item, e)
+
+
+def _ask_streaming(pipeline, item, agent=None, callback=None):
+    """Streams one answer into ``item``; returns False if stop() interrupted it."""
+    agent, callback = agent or pipeline.agent_name, callback or pipeline.agent_callback
+    question = item.question
+    settled = getattr(pipeline.grader, "settled", None) if pipeline.early_stop else None
+    answer = ""
+    with tracing.span("agent_call", question=question["question"], streamed=True) as call_span:
+        call_start = time.perf_counter()
+        if pipeline.hedger is not None:
+            open_stream = callback.stream
+            stream = pipeline.hedger.stream(agent, item.domain, lambda: open_stream(question["question"]))
+        else:
+            stream = callback.stream(question["question"])
+        try:
+            with get_breaker(agent).attempt():
+                for piece in stream:
+                    if item.first_token_ms is None:
+                        item.first_token_ms = (time.perf_counter() - call_start) * 1000
+                    answer += piece
+                    if pipeline.stopped:
+                        return False
+                    if pipeline.on_partial is not None:
+                        pipeline.on_partial(item, answer)
+                    if settled is not None and settled(question, answer):
+                        item.stopped_early = True
+                        break
+        except Exception as e:
+            # The partial answer is kept with the error.
+            _set_error(item, e)
+        finally:
+            # Closing the generator cancels generation that is no longer needed.
+            stream.close()
+        item.latency_ms = (time.perf_counter() - call_start) * 1000
+        call_span.set_attribute("answer_chars", len(answer))
+        call_span.set_attribute("stopped_early", item.stopped_early)
+    item.answer = answer.strip()
+    return True
+
+
+def _ask_tiered(pipeline, item):
+    """Asks the tiers of a tiered agent in turn, from the router's pick, until an answer is good enough.
+
+    Returns False if stop() interrupted a streamed answer.
+    """
+    tiers = pipeline.tiers
+    latency_ms = 0.0
+    for index in range(pipeline.router.start_tier(tiers, item.domain), len(tiers)):
+        tier = tiers[index]
+        _reset_for_tier(item)
+        with tracing.span("tier", tier=tier.name, domain=item.domain):
+            if pipeline.streaming and hasattr(tier.callback, "stream"):
+                if not _ask_streaming(pipeline, item, tier.name, tier.callback):
+                    return False
+            else:
+                _ask(pipeline, item, tier.name, tier.callback)
+            escalate = _tier_verdict(pipeline, item, index)
+        latency_ms += item.latency_ms
+        if not escalate:
+            break
+    item.latency_ms = latency_ms
+    return True
+
+
+def _ask_tiered_chunk(pipeline, chunk):
+    """Asks a chunk through the tiers, sending the questions a tier gets together in batches of its batch size.
+
+    Returns the items answered; those not yet answered when stop() is called are dropped.
+    """
+    tiers = pipeline.tiers
+    waiting = [[] for _ in tiers]  # items to ask of each tier
+    spent = {}                     # id(item) -> latency over the tiers asked so far
+    for item in chunk:
+        waiting[pipeline.router.start_tier(tiers, item.domain)].append(item)
+        spent[id(item)] = 0.0
+    answered = []
+    for index, tier in enumerate(tiers):
+        items = waiting[index]
+        if not items:
+            continue
+        for item in items:
+            _reset_for_tier(item)
+        with tracing.span("tier", tier=tier.name, questions=len(items)):
+            if tier.batch_size > 1:
+                _ask_batch(pipeline, items, tier.name, tier.callback, tier.batch_size)
+            else:
+                for item in items:
+                    if pipeline.stopped:
+                        return answered
+                    if pipeline.streaming and hasattr(tier.callback, "stream"):
+                        if not _ask_streaming(pipeline, item, tier.name, tier.callback):
+                            return answered
+                    else:
+                        _ask(pipeline, item, tier.name, tier.callback)
+            for item in items:
+                spent[id(item)] += item.latency_ms
+                if _tier_verdict(pipeline, item, index):
+                    waiting[index + 1].append(item)
+                else:
+                    item.latency_ms = spent[id(item)]
+                    answered.append(item)
+    return answered
+
+
+def _reset_for_tier(item):
+    item.stopped_early = item.timed_out = False
+    item.error = item.grade = None
+    item.batch_size = 1
+
+
+def _tier_verdict(pipeline, item, index):
+    """Grades the answer of tier ``index`` and records it with the router; returns whether to escalate."""
+    tiers, grader = pipeline.tiers, pipeline.grader
+    tier = tiers[index]
+    item.tier = tier.name
+    last = index == len(tiers) - 1
+    if item.error is not None:
+        # An unavailable tier is passed over without counting against its pass rate.
+        escalate = not last
+    else:
+        grade_start = time.perf_counter()
+        (passed, score), = grader.grade([(item.question, item.answer)])
+        EVALUATION_LATENCY.observe(time.perf_counter() - grade_start, domain=item.domain)
+        escalate = not last and not (passed and not low_confidence(grader, score))
+        pipeline.router.record(tier, item.domain, passed, item.latency_ms, escalate)
+        item.grade = (passed, score)
+    if escalate:
+        item.escalations += 1
+    return escalate
+
+
+def grade_answers(pipeline, chunks):
+    """Grades each chunk in one grader call and attaches a ResultRecord to every item.
+
+    Items graded earlier (by the tiered query) keep their grade, and items
+    the agent could not answer become ``Evaluation.ERROR`` results.
+    """
+    grader = pipeline.grader
+    for chunk in chunks:
+        ungraded = [item for item in chunk if item.grade is None and item.error is None]
+        if ungraded:
+            with tracing.span("evaluation", parent=chunk[0].run.span, grader=grader.name, answers=len(ungraded)):
+                grade_start = time.perf_counter()
+                graded = grader.grade([(item.question, item.answer) for item in ungraded])
+                grade_seconds = (time.perf_counter() - grade_start) / len(ungraded)
+            for item, grade in zip(ungraded, graded):
+                item.grade = grade
+                EVALUATION_LATENCY.observe(grade_seconds, domain=item.domain)
+        for item in chunk:
+            if item.error is not None:
+                evaluation, score = Evaluation.ERROR, None
+            else:
+                passed, score = item.grade
+                evaluation = Evaluation.PASS if passed else Evaluation.FAIL
+            EVALUATIONS.inc(domain=item.domain, evaluation=evaluation)
+            extra = {"latency_ms": round(item.latency_ms, 3)}
+            if item.batch_size > 1:
+                extra["batch_size"] = item.batch_size
+            if score is not None:
+                extra["score"] = score
+            if item.first_token_ms is not None:
+                extra["first_token_ms"] = round(item.first_token_ms, 3)
+            if item.stopped_early:
+                extra["stopped_early"] = True
+            if item.timed_out:
+                extra["timed_out"] = True
+            if item.tier is not None:
+                extra["tier"] = item.tier
+            if item.escalations:
+                extra["escalations"] = item.escalations
+            if item.error is not None:
+                extra["error"] = item.error
+            item.record = ResultRecord(
+                question=item.question["question"],
+                answer=item.answer,
+                evaluation=evaluation,
+                keywords=item.question["keywords"],
+                domain=item.domain,
+                extra=extra
+            )
+        yield chunk
+
+
+def log_results(pipeline, chunks):
+    """Appends results to the training log (unless ``log=False``) and checkpoints the session."""
+    session = pipeline.session
+    for chunk in chunks:
+        for item in chunk:
+            if pipeline.log:
+                with tracing.span("log_test_result", parent=item.run.span, domain=item.domain,
+                                  evaluation=item.record.evaluation):
+                    log_test_result(pipeline.agent_name, item.domain, item.record)
+            if session is not None:
+                session.mark_done(item.domain, item.question["question"])
+        yield chunk
+
+
+DEFAULT_STAGES = (select_questions, query_agent, grade_answers, log_results)
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _threaded(stream, pipeline, name):
+    """Runs ``stream`` on its own thread and yields its chunks through a bounded queue.
+
+    An exception in the stage is re-raised here, in the consuming thread.
+    """
+    chunks = queue.Queue(pipeline.queue_size)
+    closed = threading.Event()
+
+    def put(value):
+        while not closed.is_set():
+            try:
+                chunks.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for chunk in stream:
+                if not put(chunk):
+                    return
+            put(_END)
+        except BaseException as e:
+            put(_Failure(e))
+
+    thread = threading.Thread(target=produce, name=f"overseer-{name}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                chunk = chunks.get(timeout=0.1)
+            except queue.Empty:
+                if not thread.is_alive() and chunks.empty():
+                    return
+                continue
+            if chunk is _END:
+                return
+            if isinstance(chunk, _Failure):
+                raise chunk.error
+            yield chunk
+    finally:
+        closed.set()
+
+
+class Pipeline:
+    """One certification session run through the stages.
+
+    The agent is looked up in the registry by ``agent_name`` unless
+    ``agent_callback`` is given (KeyError or AgentLoadError reach the caller).
+    ``iterations`` None runs until ``stop()``; a ``session`` (see
+    overseer_core.checkpoint) replaces it with the session's checkpointed
+    plan. ``interval`` seconds pass between iterations. ``streaming`` and
+    ``early_stop`` default to OVERSEER_STREAMING and OVERSEER_STREAM_EARLY_STOP,
+    ``hedging`` to OVERSEER_HEDGING. With ``wait_for_circuit=False``, questions
+    asked while the agent's circuit is open fail fast as errors instead of
+    waiting for it.
+    """
+
+    def __init__(self, agent_name=None, agent_callback=None, iterations=1, session=None, interval=None,
+                 batch_size=None, grader=None, log=True, stages=DEFAULT_STAGES, concurrent=True,
+                 queue_size=QUEUE_SIZE, rng=random, streaming=None, early_stop=None, on_partial=None,
+                 hedging=None, wait_for_circuit=True):
+        if agent_callback is None:
+            agent_callback = AGENTS[agent_name]
+        if batch_size is None:
+            batch_size = AGENTS.spec(agent_name).batch_size if agent_name in AGENTS else 0
+        self.agent_name = agent_name or getattr(agent_callback, "__name__", "agent")
+        self.agent_callback = agent_callback
+        self.max_iterations = None if session is not None else iterations
+        self.session = session
+        self.interval = interval
+        self.batch_size = batch_size
+        self.grader = grader or get_grader()
+        self.log = log
+        self.stages = stages
+        self.concurrent = concurrent
+        self.queue_size = queue_size
+        self.rng = rng
+        if streaming is None:
+            streaming = get_streaming_enabled()
+        self.tiers = getattr(agent_callback, "tiers", None)
+        self.router = get_router() if self.tiers is not None else None
+        self.streaming = streaming and (hasattr(agent_callback, "stream") or
+                                        any(hasattr(tier.callback, "stream") for tier in self.tiers or ()))
+        self.early_stop = get_stream_early_stop() if early_stop is None else early_stop
+        self.on_partial = on_partial
+        if hedging is None:
+            hedging = get_hedging_enabled()
+        self.hedger = get_hedger() if hedging else None
+        self.wait_for_circuit = wait_for_circuit
+        self._stop = threading.Event()
+        self._idle = threading.Condition()
+        self._pending = 0
+
+    # --- Control ---
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def stop(self):
+        """Stops asking questions; answers already received are still graded, logged and emitted."""
+        self._stop.set()
+        with self._idle:
+            self._idle.notify_all()
+
+    def wait(self, seconds):
+        """Sleeps between iterations; returns early on stop()."""
+        return self._stop.wait(seconds)
+
+    def wait_for_agent(self):
+        """Sleeps while the circuit of the agent (of every tier, for a tiered agent) is open."""
+        names = [tier.name for tier in self.tiers] if self.tiers is not None else [self.agent_name]
+        while self.wait_for_circuit and not self.stopped:
+            delay = min(get_breaker(name).retry_in() for name in names)
+            if delay <= 0:
+                return
+            self.wait(delay)
+
+    # --- Iteration bookkeeping ---
+    def start_run(self, iteration, size):
+        span = tracing.TRACER.start_span("certification_run", agent=self.agent_name, iteration=iteration)
+        with self._idle:
+            self._pending += size
+        return IterationRun(iteration, size, span)
+
+    def wait_idle(self):
+        """Blocks until every item handed out so far has been emitted, or until stop()."""
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0 or self._stop.is_set())
+
+    def _finish(self, item):
+        run = item.run
+        run.pending -= 1
+        if run.pending == 0:
+            run.span.end()
+            CERTIFICATION_RUN_LATENCY.observe(time.perf_counter() - run.started, agent=self.agent_name)
+            CERTIFICATION_RUNS.inc(agent=self.agent_name)
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    # --- Emit ---
+    def __iter__(self):
+        """Yields every WorkItem once it has passed all stages."""
+        source, *stages = self.stages
+        stream = source(self)
+        for stage in stages:
+            if self.concurrent:
+                stream = _threaded(stream, self, source.__name__)
+            stream = stage(self, stream)
+            source = stage
+        if self.concurrent:
+            stream = _threaded(stream, self, source.__name__)
+        try:
+            for chunk in stream:
+                for item in chunk:
+                    self._finish(item)
+                    yield item
+        finally:
+            self.stop()
+            if self.router is not None:
+                self.router.save()
+
+    def iterations(self):
+        """Yields ``(iteration, {domain: ResultRecord})`` as each iteration completes.
+
+        After stop(), a partly answered iteration is yielded with the results it has.
+        """
+        current, results = None, {}
+        for item in self:
+            if current is not None and item.run is not current:
+                yield current.iteration, results
+                results = {}
+            current = item.run
+            results[item.domain] = item.record
+            if current.pending == 0:
+                yield current.iteration, results
+                current, results = None, {}
+        if results:
+            yield current.iteration, results
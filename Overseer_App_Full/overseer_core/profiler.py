@@ -0,0 +1,259 @@
+"""On-demand sampling profiler for a running Overseer process.
+
+``SamplingProfiler`` wakes every ``interval`` seconds and records the Python
+stack of every other thread (certification and training workers, agent
+requests, pipeline stages, log writers, the GUI thread). On ``stop()`` it
+writes two files to ``logs/profiles/``:
+
+* ``profile-<time>.collapsed``: one ``thread;outer;...;inner count`` line
+  per distinct stack, the input format of flamegraph.pl and speedscope;
+* ``profile-<time>.txt``: the functions with the most samples, by self and
+  total (inclusive) samples.
+
+Samples are wall-clock: a thread blocked on a queue or a socket is counted
+where it waits, which is what a slow session usually needs to show.
+
+A process that calls ``watch()`` (the main window, the training view and the
+service) can be switched from another shell, without a restart:
+
+    python -m overseer_core.cli profile start --seconds 60
+    python -m overseer_core.cli profile stop
+
+The CLI drops a request in ``logs/profile.request``. The watcher picks it up
+within a second and reports in ``logs/profile.status``.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from overseer_core import metrics
+
+PROFILE_DIR = os.path.join("logs", "profiles")
+CONTROL_PATH = os.path.join("logs", "profile.request")
+STATUS_PATH = os.path.join("logs", "profile.status")
+DEFAULT_INTERVAL = 0.01
+WATCH_INTERVAL = 0.5
+
+PROFILER_SAMPLES = metrics.counter("overseer_profiler_samples_total", "Thread stacks sampled by the profiler.")
+
+
+def _thread_label(thread):
+    """The thread name, or its class for default ``Thread-N`` names (e.g. CertificationWorker)."""
+    if thread is None:
+        return "unknown"
+    name = thread.name
+    if name.startswith("Thread-") and type(thread) is not threading.Thread:
+        return type(thread).__name__
+    return name.split(" (")[0]
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval=DEFAULT_INTERVAL, output_dir=PROFILE_DIR):
+        self.interval = interval
+        self.output_dir = output_dir
+        self.samples = 0
+        self.started = None
+        self._stacks = Counter()     # (thread label, code objects outermost first) -> samples
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self.started = time.time()
+        self._thread = threading.Thread(target=self._run, name="overseer-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        own = threading.get_ident()
+        stacks = self._stacks
+        while not self._stop.wait(self.interval):
+            threads = {thread.ident: thread for thread in threading.enumerate()}
+            sampled = 0
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.reverse()
+                stacks[(_thread_label(threads.get(ident)), tuple(codes))] += 1
+                sampled += 1
+            self.samples += sampled
+            PROFILER_SAMPLES.inc(sampled)
+
+    def stop(self):
+        """Stops sampling and writes the profile; returns ``(collapsed_path, summary_path)``."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.write()
+
+    # --- Output ---
+    def collapsed(self):
+        """Lines in the collapsed-stack format, one per distinct stack."""
+        labels = {}
+        lines = []
+        for (thread, codes), count in sorted(self._stacks.items(), key=lambda item: -item[1]):
+            frames = [labels.get(code) or labels.setdefault(code, _frame_label(code)) for code in codes]
+            lines.append(";".join([thread] + frames).replace(" ", "_") + f" {count}")
+        return lines
+
+    def summary(self, limit=30):
+        self_counts, total_counts, thread_counts = Counter(), Counter(), Counter()
+        for (thread, codes), count in self._stacks.items():
+            thread_counts[thread] += count
+            if codes:
+                self_counts[codes[-1]] += count
+            for code in set(codes):
+                total_counts[code] += count
+        total = sum(thread_counts.values()) or 1
+        elapsed = time.time() - self.started if self.started else 0.0
+        lines = [f"{self.samples} samples over {elapsed:.1f}s at {1000 * self.interval:g} ms", "", "Samples by thread:"]
+        lines += [f"  {count:8d} {100 * count / total:5.1f}%  {thread}" for thread, count in thread_counts.most_common()]
+        for title, counts in (("Top functions by self samples:", self_counts),
+                              ("Top functions by total samples:", total_counts)):
+            lines += ["", title]
+            lines += [f"  {count:8d} {100 * count / total:5.1f}%  {_frame_label(code)}"
+                      for code, count in counts.most_common(limit)]
+        return lines
+
+    def write(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stem = os.path.join(self.output_dir, "profile-" + time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started)))
+        collapsed_path, summary_path = stem + ".collapsed", stem + ".txt"
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.summary()) + "\n")
+        return collapsed_path, summary_path
+
+
+# --- Process-wide toggle ---
+_active = None
+_active_lock = threading.Lock()
+_stop_timer = None
+
+
+def is_profiling():
+    return _active is not None
+
+
+def start_profiling(interval=DEFAULT_INTERVAL, seconds=None):
+    """Starts the process-wide profiler (no-op if running); ``seconds`` stops it automatically."""
+    global _active, _stop_timer
+    with _active_lock:
+        if _active is None:
+            _active = SamplingProfiler(interval).start()
+            if seconds:
+                _stop_timer = threading.Timer(seconds, stop_profiling)
+                _stop_timer.daemon = True
+                _stop_timer.start()
+    _write_status()
+
+
+def stop_profiling():
+    """Stops the process-wide profiler; returns the written paths, or None if it was not running."""
+    global _active, _stop_timer
+    with _active_lock:
+        profiler, _active = _active, None
+        if _stop_timer is not None:
+            _stop_timer.cancel()
+            _stop_timer = None
+    if profiler is None:
+        return None
+    paths = profiler.stop()
+    _write_status(paths)
+    print(f"[Profiler] Wrote {paths[0]} and {paths[1]}")
+    return paths
+
+
+def _write_status(paths=None):
+    status = {"pid": os.getpid(), "running": is_profiling(), "updated": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    if paths:
+        status["output"] = list(paths)
+    os.makedirs(os.path.dirname(STATUS_PATH), exist_ok=True)
+    tmp_path = STATUS_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(status, f)
+    os.replace(tmp_path, STATUS_PATH)
+
+
+# --- Remote control ---
+_watcher = None
+
+
+def _handle_request():
+    try:
+        with open(CONTROL_PATH, "r", encoding="utf-8") as f:
+            request = json.load(f)
+        os.remove(CONTROL_PATH)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        print(f"[Profiler] Ignoring unreadable request {CONTROL_PATH}: {e}")
+        try:
+            os.remove(CONTROL_PATH)
+        except OSError:
+            pass
+        return
+    if request.get("action") == "start":
+        start_profiling(request.get("interval_ms", DEFAULT_INTERVAL * 1000) / 1000.0, request.get("seconds"))
+    elif request.get("action") == "stop":
+        if stop_profiling() is None:
+            _write_status()
+
+
+def watch():
+    """Starts the background thread that serves ``cli profile`` requests (once per process)."""
+    global _watcher
+    if _watcher is not None:
+        return
+
+    def poll():
+        while True:
+            if os.path.exists(CONTROL_PATH):
+                _handle_request()
+            time.sleep(WATCH_INTERVAL)
+
+    _watcher = threading.Thread(target=poll, name="overseer-profiler-watch", daemon=True)
+    _watcher.start()
+
+
+def request(action, interval_ms=None, seconds=None, timeout=10.0):
+    """Asks a watching process to start or stop profiling; returns its status, or None if nobody answered."""
+    os.makedirs(os.path.dirname(CONTROL_PATH), exist_ok=True)
+    before = os.path.getmtime(STATUS_PATH) if os.path.exists(STATUS_PATH) else None
+    payload = {"action": action}
+    if interval_ms:
+        payload["interval_ms"] = interval_ms
+    if seconds:
+        payload["seconds"] = seconds
+    tmp_path = CONTROL_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, CONTROL_PATH)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if not os.path.exists(CONTROL_PATH) and os.path.exists(STATUS_PATH) \
+                and os.path.getmtime(STATUS_PATH) != before:
+            with open(STATUS_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        time.sleep(0.1)
+    try:
+        os.remove(CONTROL_PATH)
+    except FileNotFoundError:
+        pass
+    return None
@@ -0,0 +1,339 @@
+"""Typed result records and a fast codec for the JSON Lines logs.
+
+``ResultRecord`` replaces the per-result dicts that flow from the engine to the
+loggers. It uses ``__slots__``, interns the small label fields (agent, domain,
+evaluation and question text) and still answers ``record["question"]`` so the
+GUI code keeps working unchanged.
+
+The JSON codec writes exactly the line format ``log_test_result`` has always
+produced, and uses orjson for decoding when it is installed. Given a blob
+store, it writes long questions and answers as ``question_ref`` /
+``answer_ref`` hashes instead (see overseer_core.blob_store). Decoded records
+resolve those hashes the first time the text is read. The binary codec
+is a compact length-prefixed form that round-trips with the JSON lines.
+"""
+
+import json
+import os
+import struct
+import sys
+from json.encoder import encode_basestring_ascii
+
+from overseer_core.blob_store import MIN_BLOB_CHARS, BlobRef, get_blob_store
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+class Evaluation:
+    PASS = sys.intern("pass")
+    FAIL = sys.intern("fail")
+    ERROR = sys.intern("error")
+
+
+_EVALUATION_CODES = {None: 0, Evaluation.PASS: 1, Evaluation.FAIL: 2, Evaluation.ERROR: 3}
+_EVALUATION_NAMES = {code: name for name, code in _EVALUATION_CODES.items()}
+
+
+_keyword_tuples = {}
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_keywords(keywords):
+    """Returns one shared tuple per distinct keyword list."""
+    key = tuple(keywords)
+    shared = _keyword_tuples.get(key)
+    if shared is None:
+        if len(_keyword_tuples) > 4096:
+            _keyword_tuples.clear()
+        shared = _keyword_tuples[key] = tuple(_intern(k) for k in key)
+    return shared
+
+
+class ResultRecord:
+    """One graded answer, optionally stamped with the agent and time it was logged."""
+    __slots__ = ("timestamp", "agent", "domain", "_question", "_answer", "evaluation", "keywords", "extra")
+    _FIELDS = frozenset(("timestamp", "agent", "domain", "question", "answer", "evaluation", "keywords"))
+
+    # Log files call the keyword list "keywords_used"; engine results call it "keywords".
+    _ALIASES = {"keywords_used": "keywords"}
+    _LOG_FIELDS = ("timestamp", "agent", "domain", "question", "answer", "evaluation", "keywords_used")
+    _KNOWN_KEYS = frozenset(_LOG_FIELDS + ("keywords", "question_ref", "answer_ref"))
+
+    def __init__(self, question=None, answer=None, evaluation=None, keywords=(), domain=None,
+                 agent=None, timestamp=None, extra=None):
+        self.timestamp = timestamp
+        self.agent = _intern(agent)
+        self.domain = _intern(domain)
+        self._question = _intern(question)
+        self._answer = answer
+        self.evaluation = _intern(evaluation)
+        self.keywords = keywords
+        self.extra = extra
+
+    # --- Texts that may still be blob references ---
+    @property
+    def question(self):
+        value = self._question
+        if value.__class__ is BlobRef:
+            value = self._question = value.resolve()
+        return value
+
+    @question.setter
+    def question(self, value):
+        self._question = _intern(value)
+
+    @property
+    def answer(self):
+        value = self._answer
+        if value.__class__ is BlobRef:
+            value = self._answer = value.resolve()
+        return value
+
+    @answer.setter
+    def answer(self, value):
+        self._answer = value
+
+    # --- Mapping compatibility ---
+    def __getitem__(self, key):
+        name = self._ALIASES.get(key, key)
+        if name in self._FIELDS:
+            return getattr(self, name)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def __eq__(self, other):
+        if isinstance(other, ResultRecord):
+            return self.to_log_dict() == other.to_log_dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ResultRecord({self.to_log_dict()!r})"
+
+    # --- Conversion ---
+    def stamped(self, agent, timestamp, domain=None):
+        """Returns a copy tagged with the agent and log timestamp."""
+        return ResultRecord(self._question, self._answer, self.evaluation, self.keywords, domain or self.domain,
+                            agent, timestamp, self.extra)
+
+    def to_result_dict(self):
+        """The engine's plain-dict result shape: question, answer, evaluation, keywords."""
+        result = {
+            "question": self.question,
+            "answer": self.answer,
+            "evaluation": self.evaluation,
+            "keywords": list(self.keywords or []),
+        }
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def to_log_dict(self):
+        entry = {
+            "timestamp": self.timestamp,
+            "agent": self.agent,
+            "domain": self.domain,
+            "question": self.question,
+            "answer": self.answer,
+            "evaluation": self.evaluation,
+            "keywords_used": list(self.keywords or []),
+        }
+        if self.extra:
+            entry.update(self.extra)
+        return entry
+
+    @classmethod
+    def from_dict(cls, data, store=None):
+        """Builds a record from a log line or an engine result dict.
+
+        Blob references stay unresolved until the text is read; ``store`` is the
+        blob store of the log's directory (default ``logs/``).
+        """
+        extra = None
+        known = cls._KNOWN_KEYS
+        for key in data:
+            if key not in known:
+                if extra is None:
+                    extra = {}
+                extra[key] = data[key]
+        question = data.get("question")
+        answer = data.get("answer")
+        if question is None and "question_ref" in data:
+            question = BlobRef(data["question_ref"], store or get_blob_store())
+        if answer is None and "answer_ref" in data:
+            answer = BlobRef(data["answer_ref"], store or get_blob_store())
+        return cls(
+            question=question,
+            answer=answer,
+            evaluation=data.get("evaluation"),
+            keywords=_intern_keywords(data.get("keywords_used", data.get("keywords")) or ()),
+            domain=data.get("domain"),
+            agent=data.get("agent"),
+            timestamp=data.get("timestamp"),
+            extra=extra,
+        )
+
+
+# --- JSON Lines codec ---
+_keyword_cache = {}
+
+
+def _encode_str(value):
+    return "null" if value is None else encode_basestring_ascii(value)
+
+
+def _encode_keywords(keywords):
+    key = tuple(keywords or ())
+    encoded = _keyword_cache.get(key)
+    if encoded is None:
+        if len(_keyword_cache) > 4096:
+            _keyword_cache.clear()
+        encoded = _keyword_cache[key] = json.dumps(list(key))
+    return encoded
+
+
+def _encode_text(name, value, store):
+    """Encodes a question or answer field, as a blob reference when a store is given."""
+    if store is not None:
+        if value.__class__ is BlobRef:
+            if value.store is store:
+                return ', "' + name + '_ref": "' + value.hash + '"'
+            value = value.resolve()
+        if value is not None and len(value) >= MIN_BLOB_CHARS:
+            return ', "' + name + '_ref": "' + store.put(value) + '"'
+    elif value.__class__ is BlobRef:
+        value = value.resolve()
+    return ', "' + name + '": ' + _encode_str(value)
+
+
+def encode_json(record, store=None):
+    """Encodes a record as one log line.
+
+    Without a store the line is identical to ``json.dumps(entry)`` of the old dicts.
+    """
+    line = (
+        '{"timestamp": ' + _encode_str(record.timestamp)
+        + ', "agent": ' + _encode_str(record.agent)
+        + ', "domain": ' + _encode_str(record.domain)
+        + _encode_text("question", record._question, store)
+        + _encode_text("answer", record._answer, store)
+        + ', "evaluation": ' + _encode_str(record.evaluation)
+        + ', "keywords_used": ' + _encode_keywords(record.keywords)
+    )
+    if record.extra:
+        line += ", " + json.dumps(record.extra)[1:-1]
+    return line + "}"
+
+
+def decode_json(line, store=None):
+    """Decodes one log line (str or bytes) into a ResultRecord.
+
+    Raises ValueError for a line that is not a JSON object of record fields, so
+    readers skip it like any other corrupt line.
+    """
+    data = orjson.loads(line) if orjson is not None else json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError(f"Log line is a JSON {type(data).__name__}, not an object.")
+    try:
+        return ResultRecord.from_dict(data, store)
+    except TypeError as e:
+        raise ValueError(f"Log line has a malformed field: {e}") from e
+
+
+# --- Binary codec ---
+# Layout: u8 version, u8 evaluation code, u16 keyword count, then length-prefixed
+# UTF-8 strings (u32 length, 0xFFFFFFFF for None): timestamp, agent, domain,
+# question, answer, extra JSON, keywords...
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<BBH")
+_LENGTH = struct.Struct("<I")
+_NONE = 0xFFFFFFFF
+
+
+def _pack_str(parts, value):
+    if value is None:
+        parts.append(_LENGTH.pack(_NONE))
+    else:
+        data = value.encode("utf-8")
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+
+
+def encode_binary(record):
+    keywords = list(record.keywords or ())
+    parts = [_BINARY_HEADER.pack(_BINARY_VERSION, _EVALUATION_CODES.get(record.evaluation, 0), len(keywords))]
+    extra = dict(record.extra or {})
+    if record.evaluation not in _EVALUATION_CODES:
+        extra["evaluation"] = record.evaluation
+    for value in (record.timestamp, record.agent, record.domain, record.question, record.answer,
+                  json.dumps(extra) if extra else None):
+        _pack_str(parts, value)
+    for keyword in keywords:
+        _pack_str(parts, keyword)
+    body = b"".join(parts)
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode_binary(buffer, offset=0):
+    """Decodes one record; returns ``(record, next_offset)``."""
+    (size,) = _LENGTH.unpack_from(buffer, offset)
+    position = offset + _LENGTH.size
+    end = position + size
+    version, code, keyword_count = _BINARY_HEADER.unpack_from(buffer, position)
+    if version != _BINARY_VERSION:
+        raise ValueError(f"Unsupported binary record version {version}.")
+    position += _BINARY_HEADER.size
+    values = []
+    for _ in range(6 + keyword_count):
+        (length,) = _LENGTH.unpack_from(buffer, position)
+        position += _LENGTH.size
+        if length == _NONE:
+            values.append(None)
+        else:
+            values.append(bytes(buffer[position:position + length]).decode("utf-8"))
+            position += length
+    timestamp, agent, domain, question, answer, extra_json = values[:6]
+    extra = json.loads(extra_json) if extra_json else None
+    evaluation = _EVALUATION_NAMES.get(code)
+    if extra and "evaluation" in extra:
+        evaluation = extra.pop("evaluation")
+    record = ResultRecord(question, answer, evaluation, _intern_keywords(values[6:]), domain,
+                          agent, timestamp, extra or None)
+    return record, end
+
+
+def iter_binary(buffer):
+    """Yields every record in a buffer of concatenated binary records."""
+    offset = 0
+    while offset < len(buffer):
+        record, offset = decode_binary(buffer, offset)
+        yield record
+
+
+def convert_jsonl_to_binary(jsonl_path, binary_path):
+    store = get_blob_store(os.path.dirname(jsonl_path))
+    with open(jsonl_path, "rb") as src, open(binary_path, "wb") as dst:
+        for line in src:
+            if line.strip():
+                dst.write(encode_binary(decode_json(line, store)))
+
+
+def convert_binary_to_jsonl(binary_path, jsonl_path):
+    with open(binary_path, "rb") as src:
+        data = src.read()
+    with open(jsonl_path, "w", encoding="utf-8") as dst:
+        for record in iter_binary(data):
+            dst.write(encode_json(record) + "\n")
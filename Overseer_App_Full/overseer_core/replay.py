@@ -0,0 +1,240 @@
+"""Replays past failures from ``failure_memory.jsonl`` as a regression check.
+
+The failure log is streamed and deduplicated by ``(agent, domain, question)``,
+keeping the latest failure and the failure count. Each unique question is asked
+again in parallel, of the agent that failed it or of a ``target`` agent (for
+example a new build registered in ``agents.json``). Replays run through the
+certification pipeline (overseer_core.pipeline) as training runs do, so
+tiered agents escalate, batched agents batch, and answers are graded with the
+current grader. Each replay is classified as:
+
+* ``fixed`` - it passes now;
+* ``regressed`` - it fails now, but the latest result for that question in
+  the training log was a pass. That is the asked agent's own latest result,
+  or, for a target with no history of the question (a new build), the latest
+  result of the agent that failed it;
+* ``still_failing`` - it fails now, as it did before;
+* ``error`` - the agent raised, timed out or its circuit was open (see
+  overseer_core.breaker), or it is no longer registered.
+
+    report = replay_failures(target="GeminiAgent-v2", workers=16)
+    print(report.format())
+
+From the command line:
+
+    python -m overseer_core.cli replay --target GeminiAgent-v2 --since 7d --workers 16 --json report.json
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from overseer_core import metrics, tracing
+from overseer_core.agents import AGENTS, AgentLoadError
+from overseer_core.cert_engine import find_question, get_grader
+from overseer_core.history_query import HistoryQuery, iter_history
+from overseer_core.pipeline import DEFAULT_STAGES, Pipeline, planned_questions
+from overseer_core.records import Evaluation
+from overseer_core.training_log import FAILURE_LOG_PATH, TRAINING_LOG_PATH
+
+OUTCOMES = ("fixed", "regressed", "still_failing", "error")
+DEFAULT_WORKERS = 8
+
+REPLAYS = metrics.counter("overseer_replays_total", "Replayed failures by agent and outcome.")
+
+
+class ReplayItem:
+    """One unique failed question and the result of asking it again."""
+    __slots__ = ("agent", "domain", "question", "failures", "last_failed", "target", "answer", "outcome",
+                 "latency_ms", "error")
+
+    def __init__(self, agent, domain, question, last_failed):
+        self.agent = agent
+        self.domain = domain
+        self.question = question          # the question dict asked again
+        self.failures = 1
+        self.last_failed = last_failed
+        self.target = None
+        self.answer = None
+        self.outcome = None
+        self.latency_ms = None
+        self.error = None
+
+    def to_dict(self):
+        return {"agent": self.agent, "target": self.target, "domain": self.domain,
+                "question": self.question["question"], "failures": self.failures,
+                "last_failed": self.last_failed, "outcome": self.outcome, "answer": self.answer,
+                "latency_ms": self.latency_ms, "error": self.error}
+
+
+class ReplayReport:
+    def __init__(self, items, seconds):
+        self.items = items
+        self.seconds = seconds
+
+    def counts(self):
+        counts = dict.fromkeys(OUTCOMES, 0)
+        for item in self.items:
+            counts[item.outcome] += 1
+        return counts
+
+    def format(self, limit=20):
+        counts = self.counts()
+        lines = [f"Replayed {len(self.items)} unique failures in {self.seconds:.1f}s: "
+                 + ", ".join(f"{outcome} {counts[outcome]}" for outcome in OUTCOMES)]
+        for outcome in ("regressed", "still_failing", "error"):
+            items = [item for item in self.items if item.outcome == outcome]
+            if not items:
+                continue
+            lines.append("")
+            lines.append(f"{outcome.replace('_', ' ').title()}:")
+            for item in items[:limit]:
+                detail = f"  [{item.target}] {item.domain}: {item.question['question'][:70]}"
+                if item.error:
+                    detail += f" ({item.error})"
+                lines.append(detail)
+            if len(items) > limit:
+                lines.append(f"  ... and {len(items) - limit} more")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {"seconds": round(self.seconds, 3), "counts": self.counts(),
+                "items": [item.to_dict() for item in self.items]}
+
+
+def collect_failures(agent=None, domain=None, since=None, until=None, log_path=None):
+    """Streams the failure log into one ReplayItem per ``(agent, domain, question)``."""
+    items = {}
+    for record in iter_history(agent=agent, domain=domain, since=since, until=until,
+                               log_path=log_path or FAILURE_LOG_PATH):
+        key = (record.agent, record.domain, record.question)
+        item = items.get(key)
+        if item is None:
+            # The current bank entry has the up-to-date keywords and references.
+            question = find_question(record.domain, record.question) or \
+                {"question": record.question, "keywords": list(record.keywords or ())}
+            items[key] = ReplayItem(record.agent, record.domain, question, record.timestamp)
+        else:
+            item.failures += 1
+            item.last_failed = max(item.last_failed or "", record.timestamp or "")
+    return list(items.values())
+
+
+def _latest_evaluations(items, log_path=None):
+    """The newest training-log evaluation of each replayed question, by the target and by the failing agent.
+
+    Keys are ``(agent, domain, question)``.
+    """
+    wanted = {}
+    for item in items:
+        key = (item.domain, item.question["question"])
+        wanted.setdefault(item.target, set()).add(key)
+        wanted.setdefault(item.agent, set()).add(key)
+    latest = {}
+    for agent, keys in wanted.items():
+        found = 0
+        for record in HistoryQuery(agent=agent, newest_first=True, log_path=log_path or TRAINING_LOG_PATH):
+            key = (record.domain, record.question)
+            if key in keys and (agent,) + key not in latest:
+                latest[(agent,) + key] = record.evaluation
+                found += 1
+                if found == len(keys):
+                    break
+    return latest
+
+
+def _batch_size(name, callback):
+    """Questions to send through one pipeline run, so batched agents and tiers still batch."""
+    tiers = getattr(callback, "tiers", None)
+    sizes = [tier.batch_size for tier in tiers] if tiers is not None else [AGENTS.spec(name).batch_size]
+    return max([1] + sizes)
+
+
+def _mark_replayed(pipeline, chunks):
+    """Pipeline stage that flags replayed results in the training log."""
+    for chunk in chunks:
+        for item in chunk:
+            item.record.extra["replay"] = True
+        yield chunk
+
+
+def replay_failures(target=None, agent=None, domain=None, since=None, until=None, workers=DEFAULT_WORKERS,
+                    grader=None, log=False, on_progress=None, failure_log=None, training_log=None):
+    """Asks every unique past failure again and returns a ReplayReport.
+
+    ``agent``, ``domain``, ``since`` and ``until`` filter the failures.
+    ``target`` None asks each question of the agent that failed it. With
+    ``log`` the new results are appended to the training log as usual.
+    ``on_progress(done, total)`` is called as replays complete.
+    """
+    start = time.perf_counter()
+    items = collect_failures(agent, domain, since, until, failure_log)
+    for item in items:
+        item.target = target or item.agent
+    previous = _latest_evaluations(items, training_log)
+    if target is not None:
+        AGENTS[target]  # An unknown --target is the caller's mistake, not one item's.
+    callbacks, unavailable = {}, {}
+    for name in {item.target for item in items}:
+        try:
+            callbacks[name] = AGENTS[name]
+        except KeyError:
+            unavailable[name] = f"unknown agent '{name}'"
+        except AgentLoadError as e:
+            unavailable[name] = str(e)
+    grader = grader or get_grader()
+    done_lock = threading.Lock()
+    done = [0]
+
+    def replay(target, chunk):
+        callback = callbacks.get(target)
+        if callback is None:
+            # Renamed, removed or imported agents: report the items and replay the rest.
+            for item in chunk:
+                _finish(item, "error", unavailable[target])
+            return
+        # Each item gets its own copy of the question, to find it again among the pipeline's results.
+        asked, picks = {}, []
+        for item in chunk:
+            question = dict(item.question)
+            asked[id(question)] = item
+            picks.append((item.domain, question))
+        stages = (planned_questions(picks),) + DEFAULT_STAGES[1:3] + \
+            ((_mark_replayed, DEFAULT_STAGES[3]) if log else ())
+        pipeline = Pipeline(target, callback, grader=grader, log=log, stages=stages, concurrent=False,
+                            streaming=False, wait_for_circuit=False)
+        with tracing.span("replay", agent=target, questions=len(chunk)):
+            for work in pipeline:
+                item, record = asked.pop(id(work.question)), work.record
+                item.answer = record.answer
+                item.latency_ms = record.extra.get("latency_ms")
+                if record.evaluation == Evaluation.ERROR:
+                    error = record.extra.get("error") or {}
+                    _finish(item, "error", f"{error.get('type')}: {error.get('message')}")
+                elif record.evaluation == Evaluation.PASS:
+                    _finish(item, "fixed")
+                else:
+                    prompt = item.question["question"]
+                    before = previous.get((target, item.domain, prompt))
+                    if before is None:
+                        before = previous.get((item.agent, item.domain, prompt))
+                    _finish(item, "regressed" if before == Evaluation.PASS else "still_failing")
+
+    def _finish(item, outcome, error=None):
+        item.outcome, item.error = outcome, error
+        REPLAYS.inc(agent=item.target, outcome=outcome)
+        if on_progress is not None:
+            with done_lock:
+                done[0] += 1
+                on_progress(done[0], len(items))
+
+    chunks = []
+    for name in {item.target for item in items}:
+        own = [item for item in items if item.target == name]
+        size = _batch_size(name, callbacks[name]) if name in callbacks else len(own)
+        chunks.extend((name, own[i:i + size]) for i in range(0, len(own), size))
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="overseer-replay") as pool:
+            for future in as_completed([pool.submit(replay, target, chunk) for target, chunk in chunks]):
+                future.result()
+    return ReplayReport(items, time.perf_counter() - start)
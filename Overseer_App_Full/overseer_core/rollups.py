@@ -0,0 +1,275 @@
+"""Pre-aggregated time-series rollups of the training history.
+
+Every logged result updates per-minute, per-hour and per-day buckets for its
+agent and domain, holding pass/fail counts and latency aggregates. Older
+minute and hour buckets are pruned (the coarser buckets already hold their
+totals), so trend views read a few hundred buckets instead of scanning the log.
+
+Rollups are persisted to ``logs/rollups.json`` with the byte offset of the
+training log they cover, and always count exactly the log up to that offset.
+Several processes (the GUI, the service, a CLI replay) append to the same
+log. A process that appends at a later offset than its rollups cover first
+reads the lines in between from the log, so every line is counted once,
+whoever wrote it. Any saved copy is therefore consistent. ``save()`` keeps a
+copy on disk that covers more of the log, and on load the rollups catch up on
+any lines written since.
+"""
+
+import json
+import os
+import threading
+import time
+
+from overseer_core.log_index import JsonlLogReader, parse_timestamp
+from overseer_core.records import Evaluation
+
+RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+# How long each resolution is kept; None keeps it forever.
+RETENTION = {"minute": 2 * 86400, "hour": 90 * 86400, "day": None}
+ALL = "*"
+
+
+class Bucket:
+    __slots__ = ("passes", "fails", "errors", "latency_count", "latency_sum", "latency_min", "latency_max")
+
+    def __init__(self, passes=0, fails=0, errors=0, latency_count=0, latency_sum=0.0,
+                 latency_min=None, latency_max=None):
+        self.passes = passes
+        self.fails = fails
+        self.errors = errors
+        self.latency_count = latency_count
+        self.latency_sum = latency_sum
+        self.latency_min = latency_min
+        self.latency_max = latency_max
+
+    def add(self, evaluation, latency_ms):
+        if evaluation == Evaluation.PASS:
+            self.passes += 1
+        elif evaluation == Evaluation.FAIL:
+            self.fails += 1
+        elif evaluation == Evaluation.ERROR:
+            self.errors += 1
+        if latency_ms is not None:
+            self.latency_count += 1
+            self.latency_sum += latency_ms
+            self.latency_min = latency_ms if self.latency_min is None else min(self.latency_min, latency_ms)
+            self.latency_max = latency_ms if self.latency_max is None else max(self.latency_max, latency_ms)
+
+    def merge(self, other):
+        self.passes += other.passes
+        self.fails += other.fails
+        self.errors += other.errors
+        if other.latency_count:
+            self.latency_count += other.latency_count
+            self.latency_sum += other.latency_sum
+            self.latency_min = other.latency_min if self.latency_min is None else min(self.latency_min, other.latency_min)
+            self.latency_max = other.latency_max if self.latency_max is None else max(self.latency_max, other.latency_max)
+
+    @property
+    def total(self):
+        return self.passes + self.fails
+
+    @property
+    def pass_rate(self):
+        return self.passes / self.total if self.total else 0.0
+
+    @property
+    def latency_avg(self):
+        return self.latency_sum / self.latency_count if self.latency_count else None
+
+    def to_list(self):
+        return [self.passes, self.fails, self.errors, self.latency_count, self.latency_sum,
+                self.latency_min, self.latency_max]
+
+
+class RollupEngine:
+    def __init__(self, path=None, log_path=None):
+        self.path = path
+        self.log_path = log_path
+        self.log_offset = 0     # bytes of the log counted
+        self._lock = threading.Lock()
+        # Held while the log is read or log_offset moves, so each line is counted once.
+        self._log_lock = threading.RLock()
+        self._reader = None
+        # resolution -> {(agent, domain, bucket_start): Bucket}
+        self._buckets = {name: {} for name in RESOLUTIONS}
+        self._dirty = 0
+        self._last_prune = 0.0
+
+    # --- Updates ---
+    def add(self, entry, timestamp=None):
+        """Counts one result (a ResultRecord or log dict); see add_logged for results just written to the log."""
+        if not entry.get("domain") or not entry.get("evaluation"):
+            return
+        if timestamp is None:
+            try:
+                timestamp = parse_timestamp(entry.get("timestamp")) if entry.get("timestamp") else time.time()
+            except ValueError:
+                timestamp = time.time()
+        agent = entry.get("agent") or "unknown"
+        domain = entry["domain"]
+        evaluation = entry["evaluation"]
+        latency_ms = entry.get("latency_ms")
+        with self._lock:
+            for name, width in RESOLUTIONS.items():
+                start = int(timestamp // width) * width
+                buckets = self._buckets[name]
+                key = (agent, domain, start)
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = Bucket()
+                bucket.add(evaluation, latency_ms)
+            self._dirty += 1
+
+    def prune(self, now=None):
+        """Drops buckets older than their resolution's retention window."""
+        now = now or time.time()
+        with self._lock:
+            for name, keep in RETENTION.items():
+                if keep is None:
+                    continue
+                cutoff = now - keep
+                buckets = self._buckets[name]
+                for key in [k for k in buckets if k[2] < cutoff]:
+                    del buckets[key]
+            self._last_prune = now
+
+    def add_logged(self, entries, start, end):
+        """Counts ``entries`` that were just appended to the log at bytes ``start`` to ``end``.
+
+        Lines appended before them by other processes (or threads) are read
+        from the log first; entries already read that way are not added again.
+        """
+        with self._log_lock:
+            if start > self.log_offset:
+                self.catch_up()
+            if start == self.log_offset:
+                for entry in entries:
+                    self.add(entry)
+                self.log_offset = end
+
+    def catch_up(self):
+        """Folds in training log lines written since ``log_offset``, by any process."""
+        if not self.log_path or not os.path.exists(self.log_path):
+            return 0
+        with self._log_lock:
+            if self._reader is None:
+                self._reader = JsonlLogReader(self.log_path)
+            reader = self._reader
+            reader.refresh()
+            if self.log_offset > reader.indexed_bytes:
+                # The log was rotated or truncated; rebuild from scratch.
+                with self._lock:
+                    self._buckets = {name: {} for name in RESOLUTIONS}
+                self.log_offset = 0
+            added = 0
+            for i in range(reader.line_at(self.log_offset), reader.count()):
+                entry = reader.decode(i)
+                if isinstance(entry, dict):
+                    self.add(entry, timestamp=reader.timestamp(i))
+                    added += 1
+            self.log_offset = reader.indexed_bytes
+        self.prune()
+        return added
+
+    # --- Queries ---
+    def series(self, resolution="minute", agent=ALL, domain=ALL, since=None):
+        """Returns [(bucket_start, Bucket)] in time order, merged over agents/domains as requested."""
+        merged = {}
+        with self._lock:
+            for (b_agent, b_domain, start), bucket in self._buckets[resolution].items():
+                if since is not None and start < since:
+                    continue
+                if agent != ALL and b_agent != agent:
+                    continue
+                if domain != ALL and b_domain != domain:
+                    continue
+                target = merged.get(start)
+                if target is None:
+                    target = merged[start] = Bucket()
+                target.merge(bucket)
+        return sorted(merged.items())
+
+    def totals(self):
+        """Lifetime pass/fail per domain from the day buckets, shaped like analyze_agent_performance()."""
+        summary = {}
+        with self._lock:
+            for (_, domain, _), bucket in self._buckets["day"].items():
+                counts = summary.setdefault(domain, {"pass": 0, "fail": 0})
+                counts["pass"] += bucket.passes
+                counts["fail"] += bucket.fails
+        return summary
+
+    # --- Persistence ---
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if "log_offset" not in data:
+            return False  # Counted by lines before; rebuilt from the log.
+        with self._lock:
+            self.log_offset = data["log_offset"]
+            for name in RESOLUTIONS:
+                self._buckets[name] = {
+                    (agent, domain, start): Bucket(*values)
+                    for agent, domain, start, *values in data.get("buckets", {}).get(name, [])
+                }
+        return True
+
+    def save(self):
+        """Writes the rollups, unless the copy on disk (saved by another process) covers more of the log."""
+        if not self.path:
+            return
+        with self._log_lock, self._lock:
+            data = {
+                "log_offset": self.log_offset,
+                "buckets": {
+                    name: [[agent, domain, start] + bucket.to_list()
+                           for (agent, domain, start), bucket in buckets.items()]
+                    for name, buckets in self._buckets.items()
+                },
+            }
+            self._dirty = 0
+            if _saved_offset(self.path) > data["log_offset"]:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # One temporary file per process, so concurrent writers never replace each other's.
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def maybe_save(self, every=200, prune_interval=3600):
+        """Saves after ``every`` unsaved updates; prunes at most once per ``prune_interval`` seconds."""
+        if time.time() - self._last_prune > prune_interval:
+            self.prune()
+        if self._dirty >= every:
+            self.save()
+
+
+def _saved_offset(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("log_offset", 0)
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_rollups(log_path=os.path.join("logs", "training_logs.jsonl")):
+    """Returns the shared rollup engine for a training log, loading and catching it up once."""
+    with _engines_lock:
+        engine = _engines.get(log_path)
+        if engine is None:
+            engine = RollupEngine(os.path.join(os.path.dirname(log_path), "rollups.json"), log_path)
+            engine.load()
+            engine.catch_up()
+            _engines[log_path] = engine
+        return engine
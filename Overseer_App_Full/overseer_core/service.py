@@ -0,0 +1,366 @@
+"""Localhost HTTP service for running certifications programmatically.
+
+Built on asyncio streams so one process can hold many concurrent clients and
+event streams. Each job runs on a bounded thread pool through the same
+certification pipeline (overseer_core.pipeline) and logging as the GUI.
+
+    POST   /jobs               {"agent": "MockAgent", "iterations": 10}  -> 202 {"id": ..., "status": "queued"}
+    GET    /jobs               list of job summaries
+    GET    /jobs/<id>          status, counts and the last RESULT_WINDOW results
+    GET    /jobs/<id>/events   Server-Sent Events: the last RESULT_WINDOW results, then new ones as they arrive
+    DELETE /jobs/<id>          cancel: no new questions are asked; answers already received are still logged
+    GET    /agents             names accepted by POST /jobs
+    GET    /health
+
+    python -m overseer_core.cli serve --port 8731 --workers 4
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from overseer_core import metrics, profiler
+from overseer_core.agents import AGENTS
+from overseer_core.pipeline import Pipeline
+from overseer_core.records import ResultRecord
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_ITERATIONS = 10_000
+SUBSCRIBER_QUEUE = 1000
+RESULT_WINDOW = 1000  # results kept per job; counts cover all of them
+
+# --- Metrics ---
+SERVICE_REQUESTS = metrics.counter("overseer_service_requests_total", "HTTP requests by method and status.")
+SERVICE_JOBS = metrics.counter("overseer_service_jobs_total", "Certification jobs by final status.")
+SERVICE_QUEUED = metrics.gauge("overseer_service_jobs_queued", "Jobs waiting for a worker.")
+SERVICE_RUNNING = metrics.gauge("overseer_service_jobs_running", "Jobs currently running.")
+SERVICE_STREAMS = metrics.gauge("overseer_service_event_streams", "Open Server-Sent Event streams.")
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+# --- Jobs ---
+class Job:
+    def __init__(self, agent, iterations):
+        self.id = uuid.uuid4().hex[:12]
+        self.agent = agent
+        self.iterations = iterations
+        self.status = "queued"
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.completed_iterations = 0
+        self.results = deque(maxlen=RESULT_WINDOW)
+        self.counts = {"pass": 0, "fail": 0, "error": 0}
+        self.cancelled = False
+        self.pipeline = None
+        self._subscribers = set()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "agent": self.agent,
+            "status": self.status,
+            "iterations": self.iterations,
+            "completed_iterations": self.completed_iterations,
+            "counts": dict(self.counts),
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+    # --- Event fan-out (event loop thread only) ---
+    def subscribe(self):
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event, data):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                # A client that cannot keep up is dropped instead of buffering without bound.
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("overflow", {"error": "Client fell too far behind; reconnect to resume."}))
+
+    def add_results(self, iteration, results):
+        self.completed_iterations = max(self.completed_iterations, iteration)
+        for domain, result in results.items():
+            item = result.to_result_dict() if isinstance(result, ResultRecord) else dict(result)
+            item["domain"] = domain
+            item["iteration"] = iteration
+            evaluation = item.get("evaluation")
+            self.counts[evaluation if evaluation in self.counts else "error"] += 1
+            self.results.append(item)
+            self.publish("result", item)
+
+    def set_status(self, status, error=None):
+        self.status = status
+        self.error = error
+        if status == "running":
+            self.started = time.time()
+        elif self.done:
+            self.finished = time.time()
+        self.publish("status", self.summary())
+
+
+def run_certification_job(job, on_results):
+    """Runs every iteration of a job through the certification pipeline (blocking).
+
+    ``on_results(iteration, results)`` is called from this thread as each iteration completes.
+    """
+    job.pipeline = Pipeline(job.agent, iterations=job.iterations)
+    if job.cancelled:
+        job.pipeline.stop()
+    for iteration, results in job.pipeline.iterations():
+        on_results(iteration, results)
+
+
+class CertificationService:
+    def __init__(self, workers=4, max_queued=100, max_finished=1000):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self.jobs = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="overseer-service")
+        self._slots = None
+        self._server = None
+        self._queued = 0
+        self._tasks = set()
+
+    # --- Job execution ---
+    def submit(self, agent, iterations=1):
+        if agent not in AGENTS:
+            raise HttpError(400, f"Unknown agent {agent!r}; expected one of {sorted(AGENTS)}.")
+        if isinstance(iterations, bool) or not isinstance(iterations, int) \
+                or not 1 <= iterations <= MAX_ITERATIONS:
+            raise HttpError(400, f"iterations must be an integer from 1 to {MAX_ITERATIONS}.")
+        if self._queued >= self.max_queued:
+            raise HttpError(429, "Too many queued jobs; retry later.")
+        job = Job(agent, iterations)
+        self.jobs[job.id] = job
+        self._prune_finished()
+        self._queued += 1
+        SERVICE_QUEUED.inc()
+        task = asyncio.get_running_loop().create_task(self._run_job(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run_job(self, job):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._slots:
+                self._queued -= 1
+                SERVICE_QUEUED.dec()
+                if job.cancelled:
+                    job.set_status("cancelled")
+                    return
+                SERVICE_RUNNING.inc()
+                try:
+                    job.set_status("running")
+                    def on_results(iteration, results):
+                        # Back to the event loop thread, which owns the subscribers.
+                        loop.call_soon_threadsafe(job.add_results, iteration, results)
+
+                    await loop.run_in_executor(self._executor, run_certification_job, job, on_results)
+                    job.set_status("cancelled" if job.cancelled else "done")
+                finally:
+                    SERVICE_RUNNING.dec()
+        except Exception as e:
+            job.set_status("failed", error=f"{type(e).__name__}: {e}")
+        finally:
+            SERVICE_JOBS.inc(status=job.status)
+            job.publish("end", job.summary())
+
+    def cancel(self, job):
+        job.cancelled = True
+        if job.pipeline is not None:
+            job.pipeline.stop()
+
+    def _prune_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HttpError(404, f"No job {job_id!r}.")
+        return job
+
+    # --- HTTP ---
+    async def start(self, host="127.0.0.1", port=8731):
+        self._slots = asyncio.Semaphore(self.workers)
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server
+
+    async def serve_forever(self, host="127.0.0.1", port=8731):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle_client(self, reader, writer):
+        method = "?"
+        try:
+            method, path, body = await self._read_request(reader)
+            await self._route(method, path, body, writer)
+        except HttpError as e:
+            await self._send_json(writer, e.status, {"error": str(e)}, method)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            await self._send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"}, method)
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise HttpError(400, "Malformed request line.")
+        method, target, _ = parts
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length must be an integer.")
+        if length < 0:
+            raise HttpError(400, "Content-Length must not be negative.")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), urlsplit(target).path.rstrip("/") or "/", body
+
+    async def _route(self, method, path, body, writer):
+        parts = path.strip("/").split("/")
+        if path == "/health":
+            return await self._send_json(writer, 200, {"status": "ok", "jobs": len(self.jobs)}, method)
+        if path == "/agents":
+            return await self._send_json(writer, 200, sorted(AGENTS), method)
+        if parts[0] != "jobs":
+            raise HttpError(404, f"No route for {path}.")
+        if len(parts) == 1:
+            if method == "GET":
+                return await self._send_json(writer, 200, [job.summary() for job in self.jobs.values()], method)
+            if method == "POST":
+                try:
+                    payload = json.loads(body or b"{}")
+                except ValueError:
+                    raise HttpError(400, "Body must be JSON.")
+                if not isinstance(payload, dict):
+                    raise HttpError(400, "Body must be a JSON object.")
+                job = self.submit(payload.get("agent"), payload.get("iterations", 1))
+                return await self._send_json(writer, 202, job.summary(), method)
+        elif len(parts) == 2:
+            job = self.get_job(parts[1])
+            if method == "GET":
+                return await self._send_json(writer, 200, dict(job.summary(), results=list(job.results)), method)
+            if method == "DELETE":
+                self.cancel(job)
+                return await self._send_json(writer, 202, job.summary(), method)
+        elif len(parts) == 3 and parts[2] == "events":
+            if method == "GET":
+                return await self._stream_events(self.get_job(parts[1]), writer)
+        else:
+            raise HttpError(404, f"No route for {path}.")
+        raise HttpError(405, f"{method} is not supported on {path}.")
+
+    async def _send_json(self, writer, status, payload, method="GET"):
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+        SERVICE_REQUESTS.inc(method=method, status=str(status))
+
+    async def _stream_events(self, job, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        SERVICE_REQUESTS.inc(method="GET", status="200")
+        # Results are published on this loop's thread, so nothing can arrive between
+        # taking the backlog and subscribing.
+        queue = job.subscribe()
+        backlog = list(job.results)
+        finished = job.done
+        with SERVICE_STREAMS.track():
+            try:
+                _write_event(writer, "status", job.summary())
+                for item in backlog:
+                    _write_event(writer, "result", item)
+                await writer.drain()
+                if finished:
+                    _write_event(writer, "end", job.summary())
+                    await writer.drain()
+                    return
+                while True:
+                    try:
+                        event, data = await asyncio.wait_for(queue.get(), timeout=15)
+                    except asyncio.TimeoutError:
+                        writer.write(b": keep-alive\n\n")
+                        await writer.drain()
+                        continue
+                    _write_event(writer, event, data)
+                    await writer.drain()
+                    if event in ("end", "overflow"):
+                        return
+            finally:
+                job.unsubscribe(queue)
+
+
+def _write_event(writer, event, data):
+    writer.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+
+
+def run_service(host="127.0.0.1", port=8731, workers=4, max_queued=100):
+    """Runs the service until interrupted."""
+    service = CertificationService(workers=workers, max_queued=max_queued)
+    profiler.watch()
+    print(f"Overseer service listening on http://{host}:{port}")
+    try:
+        asyncio.run(service.serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
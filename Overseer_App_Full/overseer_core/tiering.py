@@ -0,0 +1,218 @@
+"""Model tiering: cheap models first, stronger ones only when needed.
+
+A tiered agent lists other agents as its tiers, cheapest first:
+
+    {"Cascade": {"tiers": ["LocalModel", "RemoteModel"]},
+     "LocalModel": {"target": "my_models.llama:create_agent", "factory": true, "cost": 0.1}, ...}
+
+GeminiAgent is tiered over ``Gemini/<model>`` when OVERSEER_GEMINI_MODELS lists
+several models. The pipeline asks each question of the cheapest promising tier
+and grades the answer at once. The question goes to the next tier when the
+answer fails, or when it passes with a grader score within CONFIDENCE_MARGIN
+of the pass threshold. A tier with a ``batch_size`` above 1 gets the questions
+routed or escalated to it in one iteration packed into shared requests.
+
+The ``TierRouter`` keeps, per tier and domain, a decayed pass rate and latency,
+plus totals of answers, passes, escalations and cost, in ``logs/tiering.json``.
+With pass rate ``p``, trying tier ``i`` before tier ``i + 1`` is expected to
+cost less only if ``p > cost_i / cost_i+1``, and to be faster only if
+``p > latency_i / latency_i+1``. A tier that falls short of either threshold
+in a domain is skipped there, except for one question in EXPLORE_EVERY, which
+keeps its pass rate current.
+"""
+
+import json
+import os
+import threading
+import time
+
+from overseer_core import metrics
+from overseer_core.training_log import LOG_DIR
+
+TIERING_PATH = os.path.join(LOG_DIR, "tiering.json")
+# Weight kept by older answers on each new one, so the pass rates follow the models.
+DECAY = 0.98
+# Decayed answers a tier needs in a domain before it may be skipped there.
+MIN_SAMPLES = 10
+EXPLORE_EVERY = 20
+CONFIDENCE_MARGIN = 0.05
+SAVE_INTERVAL = 5.0
+
+TIER_REQUESTS = metrics.counter("overseer_tier_requests_total", "Questions answered by each model tier, by domain.")
+TIER_ESCALATIONS = metrics.counter("overseer_tier_escalations_total", "Answers passed on to a stronger tier, by tier and domain.")
+TIER_SKIPS = metrics.counter("overseer_tier_skips_total", "Questions routed past a tier, by tier and domain.")
+TIER_COST = metrics.counter("overseer_tier_cost_total", "Relative cost of the requests sent to each tier.")
+
+
+class Tier:
+    __slots__ = ("name", "callback", "cost", "batch_size")
+
+    def __init__(self, name, callback, cost=1.0, batch_size=0):
+        self.name = name
+        self.callback = callback
+        self.cost = cost
+        self.batch_size = batch_size
+
+
+class TieredAgent:
+    """An agent over its ``tiers``. Plain calls go to the cheapest tier; the pipeline escalates."""
+
+    def __init__(self, name, tiers):
+        if not tiers:
+            raise ValueError(f"Tiered agent '{name}' has no tiers.")
+        self.name = name
+        self.tiers = tiers
+
+    def __call__(self, prompt):
+        return self.tiers[0].callback(prompt)
+
+
+def low_confidence(grader, score):
+    """True when a passing score is too close to the grader's threshold to trust."""
+    threshold = getattr(grader, "threshold", None)
+    return score is not None and threshold is not None and score < threshold + CONFIDENCE_MARGIN
+
+
+class _TierDomain:
+    """Routing statistics of one tier in one domain."""
+    __slots__ = ("weight", "passes", "latency_ms", "answers", "passed", "escalated", "cost")
+
+    def __init__(self, weight=0.0, passes=0.0, latency_ms=None, answers=0, passed=0, escalated=0, cost=0.0):
+        self.weight = weight          # decayed answers
+        self.passes = passes          # decayed passes
+        self.latency_ms = latency_ms  # decayed mean latency
+        self.answers = answers
+        self.passed = passed
+        self.escalated = escalated
+        self.cost = cost
+
+    @property
+    def pass_rate(self):
+        return self.passes / self.weight if self.weight else 0.0
+
+    def add(self, passed, latency_ms, escalated, cost):
+        self.weight = self.weight * DECAY + 1.0
+        self.passes = self.passes * DECAY + passed
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += (latency_ms - self.latency_ms) / self.weight
+        self.answers += 1
+        self.passed += passed
+        self.escalated += escalated
+        self.cost += cost
+
+    def to_list(self):
+        return [round(self.weight, 4), round(self.passes, 4), self.latency_ms and round(self.latency_ms, 3),
+                self.answers, self.passed, self.escalated, round(self.cost, 6)]
+
+
+class TierRouter:
+    """Picks the tier each question starts at, from per-domain statistics of every tier."""
+
+    def __init__(self, path=TIERING_PATH):
+        self.path = path
+        self._stats = {}     # (tier name, domain) -> _TierDomain
+        self._routed = {}    # domain -> questions routed
+        self._lock = threading.Lock()
+        self._saved = time.monotonic()
+        self._dirty = False
+
+    def _threshold(self, tier, next_tier, domain):
+        """The pass rate ``tier`` needs in ``domain`` to be worth asking before ``next_tier``."""
+        threshold = tier.cost / next_tier.cost if next_tier.cost > 0 else 0.0
+        stats, next_stats = self._stats.get((tier.name, domain)), self._stats.get((next_tier.name, domain))
+        if stats is not None and next_stats is not None and stats.latency_ms and next_stats.latency_ms:
+            threshold = max(threshold, stats.latency_ms / next_stats.latency_ms)
+        return threshold
+
+    def start_tier(self, tiers, domain):
+        """Index of the first tier worth asking for a question in ``domain``."""
+        with self._lock:
+            routed = self._routed[domain] = self._routed.get(domain, 0) + 1
+            if routed % EXPLORE_EVERY == 0:
+                return 0
+            for index, tier in enumerate(tiers[:-1]):
+                stats = self._stats.get((tier.name, domain))
+                if stats is None or stats.weight < MIN_SAMPLES or \
+                        stats.pass_rate >= self._threshold(tier, tiers[index + 1], domain):
+                    return index
+                TIER_SKIPS.inc(agent=tier.name, domain=domain)
+            return len(tiers) - 1
+
+    def record(self, tier, domain, passed, latency_ms, escalated):
+        with self._lock:
+            stats = self._stats.get((tier.name, domain))
+            if stats is None:
+                stats = self._stats[(tier.name, domain)] = _TierDomain()
+            stats.add(passed, latency_ms, escalated, tier.cost)
+            self._dirty = True
+            save = time.monotonic() - self._saved >= SAVE_INTERVAL
+        TIER_REQUESTS.inc(agent=tier.name, domain=domain)
+        TIER_COST.inc(tier.cost, agent=tier.name)
+        if escalated:
+            TIER_ESCALATIONS.inc(agent=tier.name, domain=domain)
+        if save:
+            self.save()
+
+    # --- Reporting ---
+    def rows(self):
+        """``(tier, domain, answers, pass_rate, mean_latency_ms, escalated, cost)`` rows by tier and domain."""
+        with self._lock:
+            return sorted((tier, domain, s.answers, s.passed / s.answers if s.answers else 0.0, s.latency_ms,
+                           s.escalated, s.cost) for (tier, domain), s in self._stats.items())
+
+    def format(self):
+        rows = self.rows()
+        if not rows:
+            return "No tiered answers yet."
+        lines = [f"{'Tier':<24} {'Domain':<24} {'Answers':>7} {'Pass':>5} {'Latency':>9} {'Escal.':>6} {'Cost':>9}"]
+        for tier, domain, answers, pass_rate, latency_ms, escalated, cost in rows:
+            latency = f"{latency_ms:7.0f}ms" if latency_ms is not None else "-"
+            lines.append(f"{tier:<24} {domain:<24} {answers:7d} {pass_rate:5.0%} {latency:>9} {escalated:6d} {cost:9.2f}")
+        return "\n".join(lines)
+
+    # --- Persistence ---
+    def save(self):
+        """Atomically writes the statistics if they changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": 1, "stats": {f"{tier}\t{domain}": s.to_list() for (tier, domain), s in self._stats.items()}}
+            self._dirty = False
+            self._saved = time.monotonic()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + f".{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path=TIERING_PATH):
+        """Loads the saved statistics, or returns an empty router."""
+        router = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, values in data.get("stats", {}).items():
+                tier, _, domain = key.partition("\t")
+                router._stats[(tier, domain)] = _TierDomain(*values)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[Tiering] Starting with empty routing statistics; could not read {path}: {e}")
+            router._stats.clear()
+        return router
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """The process-wide router, loaded from ``logs/tiering.json`` on first use."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = TierRouter.load()
+        return _router
@@ -0,0 +1,253 @@
+"""Tournament mode: every agent answers the same questions in one parallel pass.
+
+Each round picks one question per domain and sends the same picks to every
+agent at once, each agent on its own thread running an inline certification
+pipeline. Every answer is graded once and logged under its agent as usual.
+
+The ``Leaderboard`` is updated from each round's results alone and never
+re-reads the history. It keeps:
+
+* passes and answers per agent and domain;
+* Elo ratings, where on each question every pair of agents plays a match
+  (a pass beats a fail, equal grades draw);
+* pairwise scores, from which ``bradley_terry()`` fits strengths over the
+  agents x agents table rather than the history.
+
+It is saved to ``logs/leaderboard.json`` after every round:
+
+    {"rounds": 12, "ratings": {"GeminiAgent": 1531.2, ...},
+     "domains": {"GeminiAgent": {"debugging": [9, 12], ...}, ...},
+     "scores": {"GeminiAgent": {"MockAgent": 7.5, ...}, ...}}
+"""
+
+import json
+import math
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+from overseer_core import metrics
+from overseer_core.agents import AGENTS, AgentLoadError
+from overseer_core.cert_engine import pick_questions
+from overseer_core.pipeline import DEFAULT_STAGES, Pipeline, planned_questions
+from overseer_core.records import Evaluation
+from overseer_core.training_log import LOG_DIR
+
+LEADERBOARD_PATH = os.path.join(LOG_DIR, "leaderboard.json")
+INITIAL_RATING = 1500.0
+ELO_K = 16.0
+
+TOURNAMENT_ROUNDS = metrics.counter("overseer_tournament_rounds_total", "Completed tournament rounds.")
+TOURNAMENT_ROUND_LATENCY = metrics.histogram("overseer_tournament_round_seconds", "Duration of a tournament round.")
+
+
+class Leaderboard:
+    """Incrementally updated standings for the agents in tournaments."""
+
+    def __init__(self, path=LEADERBOARD_PATH, k=ELO_K):
+        self.path = path
+        self.k = k
+        self.rounds = 0
+        self.ratings = {}   # agent -> Elo rating
+        self.domains = {}   # agent -> {domain: [passes, answers]}
+        self.scores = {}    # agent -> {opponent: points won against it, draws counting half}
+        self._lock = threading.Lock()
+
+    # --- Updates ---
+    def record_round(self, results):
+        """Adds one round, ``{agent: {domain: ResultRecord}}``, to the standings.
+
+        Errors (the agent could not answer) are left out, so an outage does not cost rating.
+        """
+        results = {agent: {domain: record for domain, record in by_domain.items()
+                           if record.evaluation != Evaluation.ERROR}
+                   for agent, by_domain in results.items()}
+        with self._lock:
+            for agent, by_domain in results.items():
+                self.ratings.setdefault(agent, INITIAL_RATING)
+                counts = self.domains.setdefault(agent, {})
+                for domain, record in by_domain.items():
+                    tally = counts.setdefault(domain, [0, 0])
+                    tally[0] += record.evaluation == Evaluation.PASS
+                    tally[1] += 1
+            # Every match of the round is scored against the ratings from before it.
+            deltas = {}
+            domains = {domain for by_domain in results.values() for domain in by_domain}
+            for domain in domains:
+                players = sorted(agent for agent, by_domain in results.items() if domain in by_domain)
+                for a, b in combinations(players, 2):
+                    passed_a = results[a][domain].evaluation == Evaluation.PASS
+                    passed_b = results[b][domain].evaluation == Evaluation.PASS
+                    score = 0.5 if passed_a == passed_b else float(passed_a)
+                    expected = 1.0 / (1.0 + 10 ** ((self.ratings[b] - self.ratings[a]) / 400.0))
+                    deltas[a] = deltas.get(a, 0.0) + self.k * (score - expected)
+                    deltas[b] = deltas.get(b, 0.0) - self.k * (score - expected)
+                    self.scores.setdefault(a, {})[b] = self.scores.get(a, {}).get(b, 0.0) + score
+                    self.scores.setdefault(b, {})[a] = self.scores.get(b, {}).get(a, 0.0) + 1.0 - score
+            for agent, delta in deltas.items():
+                self.ratings[agent] += delta
+            self.rounds += 1
+
+    # --- Standings ---
+    def bradley_terry(self, iterations=200, prior=0.5):
+        """Bradley-Terry strengths on the Elo scale, fitted to the pairwise scores.
+
+        ``prior`` adds that many drawn points to every pair that has played, so an
+        agent that never won still gets a finite strength.
+        """
+        with self._lock:
+            agents = sorted(self.ratings)
+            wins = {a: {b: s + prior for b, s in self.scores.get(a, {}).items()} for a in agents}
+        strength = {a: 1.0 for a in agents}
+        for _ in range(iterations):
+            updated = {}
+            for a in agents:
+                games = sum((wins[a][b] + wins[b][a]) / (strength[a] + strength[b]) for b in wins[a])
+                updated[a] = sum(wins[a].values()) / games if games else strength[a]
+            scale = math.exp(sum(math.log(v) for v in updated.values()) / len(updated)) if updated else 1.0
+            strength = {a: v / scale for a, v in updated.items()}
+        return {a: INITIAL_RATING + 400.0 * math.log10(v) for a, v in strength.items()}
+
+    def standings(self):
+        """Rows of ``(agent, elo, bradley_terry, pass_rate, {domain: pass_rate})``, best first."""
+        strengths = self.bradley_terry()
+        rows = []
+        with self._lock:
+            for agent, rating in self.ratings.items():
+                counts = self.domains.get(agent, {})
+                passes = sum(p for p, _ in counts.values())
+                answers = sum(n for _, n in counts.values())
+                rows.append((agent, rating, strengths.get(agent, INITIAL_RATING),
+                             passes / answers if answers else 0.0,
+                             {domain: p / n for domain, (p, n) in counts.items() if n}))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+    def format(self):
+        rows = self.standings()
+        if not rows:
+            return "No tournament results yet."
+        lines = [f"{'Agent':<16} {'Elo':>7} {'B-T':>7} {'Pass':>6}   Weakest domain",
+                 f"{'-' * 16} {'-' * 7} {'-' * 7} {'-' * 6}   {'-' * 24}"]
+        for agent, rating, strength, pass_rate, by_domain in rows:
+            weakest = min(by_domain.items(), key=lambda item: item[1]) if by_domain else None
+            weakest = f"{weakest[0]} ({weakest[1]:.0%})" if weakest else "-"
+            lines.append(f"{agent:<16} {rating:7.1f} {strength:7.1f} {pass_rate:6.0%}   {weakest}")
+        lines.append(f"({self.rounds} rounds)")
+        return "\n".join(lines)
+
+    # --- Persistence ---
+    def to_dict(self):
+        with self._lock:
+            return {"rounds": self.rounds, "ratings": dict(self.ratings),
+                    "domains": {a: {d: list(t) for d, t in c.items()} for a, c in self.domains.items()},
+                    "scores": {a: dict(s) for a, s in self.scores.items()}}
+
+    def save(self):
+        """Atomically replaces the saved leaderboard."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path=LEADERBOARD_PATH):
+        """Loads the saved leaderboard, or returns an empty one."""
+        board = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return board
+        except (OSError, ValueError) as e:
+            print(f"[Tournament] Starting a new leaderboard; could not read {path}: {e}")
+            return board
+        board.rounds = data.get("rounds", 0)
+        board.ratings = {a: float(r) for a, r in data.get("ratings", {}).items()}
+        board.domains = {a: {d: list(t) for d, t in c.items()} for a, c in data.get("domains", {}).items()}
+        board.scores = {a: dict(s) for a, s in data.get("scores", {}).items()}
+        return board
+
+
+class Tournament:
+    """Runs rounds in which every agent answers the same questions in parallel.
+
+    ``agents`` defaults to ``AGENTS.listed()``; agents that fail to load are
+    left out and listed in ``skipped``. ``iterations`` None runs until
+    ``stop()``, with ``interval`` seconds between rounds. ``on_result(round,
+    agent, {domain: record})`` is called (from the agent's thread) as each agent
+    finishes a round. Iterating yields ``(round, {agent: {domain: record}})``
+    once the round is on the leaderboard.
+    """
+
+    def __init__(self, agents=None, iterations=1, interval=None, grader=None, log=True, leaderboard=None,
+                 on_result=None, rng=random):
+        self.callbacks = {}
+        self.skipped = {}
+        for name in agents or AGENTS.listed():
+            try:
+                self.callbacks[name] = AGENTS[name]
+            except (KeyError, AgentLoadError) as e:
+                self.skipped[name] = str(e)
+        self.iterations = iterations
+        self.interval = interval
+        self.grader = grader
+        self.log = log
+        self.leaderboard = leaderboard if leaderboard is not None else Leaderboard.load()
+        self.on_result = on_result
+        self.rng = rng
+        self._stop = threading.Event()
+        self._pipelines = []
+        self._pipelines_lock = threading.Lock()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def stop(self):
+        """Stops after the current round; answers already received are still logged."""
+        self._stop.set()
+        with self._pipelines_lock:
+            for pipeline in self._pipelines:
+                pipeline.stop()
+
+    def _play(self, round_number, agent, picks):
+        pipeline = Pipeline(agent, self.callbacks[agent], grader=self.grader, log=self.log,
+                            stages=(planned_questions(picks, round_number),) + DEFAULT_STAGES[1:],
+                            concurrent=False, streaming=False)
+        with self._pipelines_lock:
+            if self.stopped:
+                return {}
+            self._pipelines.append(pipeline)
+        try:
+            results = {item.domain: item.record for item in pipeline}
+        finally:
+            with self._pipelines_lock:
+                self._pipelines.remove(pipeline)
+        if results and self.on_result is not None:
+            self.on_result(round_number, agent, results)
+        return results
+
+    def __iter__(self):
+        if not self.callbacks:
+            return
+        round_number = 0
+        with ThreadPoolExecutor(max_workers=len(self.callbacks), thread_name_prefix="overseer-tournament") as pool:
+            while not self.stopped and (self.iterations is None or round_number < self.iterations):
+                round_number += 1
+                picks = pick_questions(self.rng)
+                with TOURNAMENT_ROUND_LATENCY.time():
+                    futures = {agent: pool.submit(self._play, round_number, agent, picks) for agent in self.callbacks}
+                    results = {agent: future.result() for agent, future in futures.items()}
+                # Only complete rounds are scored, so a stop mid-round cannot skew the ratings.
+                if any(len(by_domain) != len(picks) for by_domain in results.values()):
+                    return
+                self.leaderboard.record_round(results)
+                self.leaderboard.save()
+                TOURNAMENT_ROUNDS.inc()
+                yield round_number, results
+                if self.interval and (self.iterations is None or round_number < self.iterations):
+                    self._stop.wait(self.interval)
@@ -0,0 +1,190 @@
+"""Lightweight span tracing for certification runs.
+
+Spans nest per thread, carry attributes and are sampled once per root span, so a
+sampled run is recorded completely and an unsampled one costs almost nothing.
+Finished spans are exported in the Chrome trace event format, which opens
+directly in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import collections
+import json
+import os
+import random
+import threading
+import time
+
+from overseer_core.config import get_trace_file, get_trace_sample_rate
+
+
+class _NoopSpan:
+    """Returned when tracing is off or the current trace is not sampled."""
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    recording = True
+
+    def __init__(self, tracer, name, attrs):
+        self._tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self._tracer._stack().append(self)
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        stack = self._tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self._tracer._record(self, self._start, end)
+        return False
+
+    def set_attribute(self, key, value):
+        self.attrs[key] = value
+
+    def end(self):
+        """Finishes a span opened with ``Tracer.start_span``."""
+        self._tracer._record(self, self._start, time.perf_counter_ns())
+
+
+class _UnsampledRoot(_NoopSpan):
+    """Sits on the span stack so that children of an unsampled root stay unrecorded."""
+
+    def __init__(self, tracer):
+        self._tracer = tracer
+
+    def __enter__(self):
+        self._tracer._stack().append(self)
+        return self
+
+    def __exit__(self, *exc):
+        stack = self._tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        return False
+
+
+class Tracer:
+    def __init__(self, sample_rate=0.0, max_events=500_000):
+        self.sample_rate = sample_rate
+        self._events = collections.deque(maxlen=max_events)
+        self._thread_names = {}
+        self._local = threading.local()
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    @property
+    def enabled(self):
+        return self.sample_rate > 0
+
+    def configure(self, sample_rate):
+        self.sample_rate = sample_rate
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_span(self):
+        """Returns the innermost open span on this thread, to hand to work on other threads."""
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def span(self, name, parent=None, **attrs):
+        """Opens a span. Roots make the sampling decision and children inherit it.
+
+        ``parent`` continues a trace started on another thread.
+        """
+        if self.sample_rate <= 0:
+            return NOOP_SPAN
+        explicit_parent = parent is not None
+        if not explicit_parent:
+            stack = getattr(self._local, "stack", None)
+            parent = stack[-1] if stack else None
+        if parent is None:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return _UnsampledRoot(self)
+        elif not parent.recording:
+            # Work handed to another thread needs its own marker to stay unsampled.
+            return _UnsampledRoot(self) if explicit_parent else NOOP_SPAN
+        return Span(self, name, attrs)
+
+    def start_span(self, name, parent=None, **attrs):
+        """Opens a span outside this thread's stack, for work that ends on another thread; call ``end()``.
+
+        Children attach to it by passing it as ``parent``.
+        """
+        span = self.span(name, parent=parent, **attrs)
+        if span.recording:
+            span._start = time.perf_counter_ns()
+        return span
+
+    def _record(self, span, start, end):
+        thread = threading.current_thread()
+        self._thread_names.setdefault(thread.ident, thread.name)
+        self._events.append((span.name, start, end, thread.ident, span.attrs))
+
+    def clear(self):
+        self._events.clear()
+
+    def to_chrome_trace(self):
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._thread_names.items()
+        ]
+        for name, start, end, tid, attrs in list(self._events):
+            events.append({
+                "name": name,
+                "cat": "overseer",
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": self._pid,
+                "tid": tid,
+                "args": {key: value if isinstance(value, (int, float, bool)) else str(value)
+                         for key, value in attrs.items()},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """Writes all recorded spans as a Chrome/Perfetto JSON trace file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+        os.replace(tmp_path, path)
+        return path
+
+
+TRACER = Tracer(sample_rate=get_trace_sample_rate())
+span = TRACER.span
+
+
+def export_trace(path=None):
+    """Exports the global tracer to OVERSEER_TRACE_FILE (or ``path``) if tracing is on."""
+    if not TRACER.enabled:
+        return None
+    return TRACER.export_chrome_trace(path or get_trace_file())
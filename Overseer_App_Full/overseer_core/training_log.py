@@ -0,0 +1,189 @@
+"""Thread-safe JSON Lines logging of test results and analysis of the training history."""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from functools import partial
+
+from overseer_core import metrics, tracing
+from overseer_core.blob_store import get_blob_store
+from overseer_core.config import get_blob_store_enabled
+from overseer_core.log_index import JsonlLogReader
+from overseer_core.records import Evaluation, ResultRecord, decode_json, encode_json, orjson
+from overseer_core.rollups import get_rollups
+
+# --- Thread-Safe Logging & Analysis ---
+log_lock = threading.Lock()
+LOG_DIR = "logs"
+TRAINING_LOG_PATH = os.path.join(LOG_DIR, "training_logs.jsonl")
+FAILURE_LOG_PATH = os.path.join(LOG_DIR, "failure_memory.jsonl")
+
+# --- Metrics ---
+LOG_WRITES = metrics.counter("overseer_log_writes_total", "Log entries appended, by log file.")
+LOG_BYTES = metrics.counter("overseer_log_bytes_total", "Bytes appended to log files.")
+LOG_WRITE_LATENCY = metrics.histogram("overseer_log_write_seconds", "Time spent writing a log entry while holding log_lock.")
+LOG_LOCK_WAIT = metrics.histogram("overseer_log_lock_wait_seconds", "Time spent waiting to acquire log_lock.")
+LOG_LOCK_WAITERS = metrics.gauge("overseer_log_lock_waiters", "Threads currently queued on log_lock.")
+
+def _append_to_log(log_path, entry):
+    """Helper to append a single entry to a JSON Lines file in a thread-safe way."""
+    _append_entries(log_path, (entry,))
+
+def _append_entries(log_path, entries):
+    """Appends entries (ResultRecords or plain dicts) with a single write under log_lock.
+
+    Returns the ``(start, end)`` byte offsets of the lines written.
+    """
+    log_name = os.path.basename(log_path)
+    with tracing.span("log_write", log=log_name, entries=len(entries)):
+        store = None
+        if get_blob_store_enabled() and any(isinstance(entry, ResultRecord) for entry in entries):
+            # Blobs are written before the lines that refer to them.
+            store = get_blob_store(os.path.dirname(log_path))
+        data = "".join((encode_json(entry, store) if isinstance(entry, ResultRecord) else json.dumps(entry)) + "\n"
+                       for entry in entries).encode("utf-8")
+        wait_start = time.perf_counter()
+        with tracing.span("log_lock_wait"), LOG_LOCK_WAITERS.track():
+            log_lock.acquire()
+        try:
+            LOG_LOCK_WAIT.observe(time.perf_counter() - wait_start)
+            with tracing.span("log_io", bytes=len(data)), LOG_WRITE_LATENCY.time(log=log_name):
+                # Unbuffered: the one append write lands at the end even if another process
+                # wrote since, and tell() is then where it ended.
+                with open(log_path, "ab", buffering=0) as f:
+                    f.write(data)
+                    end = f.tell()
+        finally:
+            log_lock.release()
+    LOG_WRITES.inc(len(entries), log=log_name)
+    LOG_BYTES.inc(len(data), log=log_name)
+    return end - len(data), end
+
+def log_test_result(agent, domain, result):
+    """Logs a test result to the appropriate log files."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    record = result if isinstance(result, ResultRecord) else ResultRecord.from_dict(result)
+    entry = record.stamped(agent, datetime.utcnow().isoformat(), domain=domain)
+    # Loaded before appending, so the first catch-up does not have to read this entry back.
+    rollups = get_rollups(TRAINING_LOG_PATH)
+    start, end = _append_entries(TRAINING_LOG_PATH, (entry,))
+    rollups.add_logged((entry,), start, end)
+    rollups.maybe_save()
+    # Errors (the agent could not answer) are not failures to learn from.
+    if entry.evaluation == Evaluation.FAIL:
+        _append_to_log(FAILURE_LOG_PATH, entry)
+
+def log_records(records):
+    """Appends records that already carry their agent and timestamp (e.g. imported history) in one batch."""
+    if not records:
+        return
+    os.makedirs(LOG_DIR, exist_ok=True)
+    rollups = get_rollups(TRAINING_LOG_PATH)
+    start, end = _append_entries(TRAINING_LOG_PATH, records)
+    rollups.add_logged(records, start, end)
+    rollups.maybe_save()
+    failures = [record for record in records if record.evaluation == Evaluation.FAIL]
+    if failures:
+        _append_entries(FAILURE_LOG_PATH, failures)
+
+def _load_jsonl_log(log_path):
+    """Helper to load all entries from a JSON Lines file as ResultRecords."""
+    if not os.path.exists(log_path):
+        return []
+    # The reader only sees complete lines, so writers never wait on log_lock for a full load.
+    with JsonlLogReader(log_path) as reader:
+        return list(reader.iter_decoded(decoder=partial(decode_json, store=get_blob_store(os.path.dirname(log_path)))))
+
+# Lines counted between two partial summaries.
+SUMMARY_CHUNK_LINES = 20000
+SUMMARY_CACHE_NAME = "summary_cache.json"
+_SUMMARY_KEYS = (Evaluation.PASS, Evaluation.FAIL, Evaluation.ERROR)
+
+def _summary_cache_path(log_path):
+    return os.path.join(os.path.dirname(log_path), SUMMARY_CACHE_NAME)
+
+def load_cached_summary(log_path=None):
+    """The last saved summary of a training log, ``{"summary", "lines", "signature", "updated"}``, or None."""
+    try:
+        with open(_summary_cache_path(log_path or TRAINING_LOG_PATH), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached if isinstance(cached, dict) and isinstance(cached.get("summary"), dict) else None
+
+def _save_cached_summary(log_path, summary, lines, signature):
+    cache_path = _summary_cache_path(log_path)
+    tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "lines": lines, "signature": signature,
+                   "updated": datetime.now().isoformat(timespec="seconds")}, f)
+    os.replace(tmp_path, cache_path)
+
+def iter_agent_performance(log_path=None, chunk_lines=SUMMARY_CHUNK_LINES, cancelled=None, cache=True):
+    """Yields ``(summary, lines_done, total_lines)`` as the training log is counted, chunk by chunk.
+
+    Each summary is a copy, ``{domain: {"pass": n, "fail": n, "error": n}}``;
+    errors (the agent could not answer) are not failures. With ``cache``
+    counting resumes from the cached summary when the log has only been appended
+    to since, and the cache is updated at the end. Setting the ``cancelled``
+    Event stops between chunks.
+    """
+    log_path = log_path or TRAINING_LOG_PATH
+    if not os.path.exists(log_path):
+        yield {}, 0, 0
+        return
+    with JsonlLogReader(log_path) as reader:
+        total, summary, start = reader.count(), {}, 0
+        cached = load_cached_summary(log_path) if cache else None
+        if cached and cached.get("signature") == reader.signature and 0 < cached.get("lines", 0) <= total:
+            summary, start = {d: dict(c) for d, c in cached["summary"].items()}, cached["lines"]
+        if start == total:
+            yield summary, total, total
+            return
+        loads = orjson.loads if orjson is not None else json.loads
+        for chunk_start in range(start, total, chunk_lines):
+            if cancelled is not None and cancelled.is_set():
+                return
+            chunk_stop = min(chunk_start + chunk_lines, total)
+            for entry in reader.iter_decoded(chunk_start, chunk_stop, decoder=loads):
+                if not isinstance(entry, dict):
+                    continue
+                domain, evaluation = entry.get("domain"), entry.get("evaluation")
+                if not domain or not evaluation:
+                    continue
+                counts = summary.get(domain)
+                if counts is None:
+                    counts = summary[domain] = {"pass": 0, "fail": 0, "error": 0}
+                if evaluation in _SUMMARY_KEYS:
+                    counts[evaluation] = counts.get(evaluation, 0) + 1
+            yield {d: dict(c) for d, c in summary.items()}, chunk_stop, total
+        if cache:
+            _save_cached_summary(log_path, summary, total, reader.signature)
+
+def analyze_agent_performance():
+    """Analyzes performance from the main training log."""
+    summary = {}
+    for summary, _, _ in iter_agent_performance(cache=False):
+        pass
+    return summary
+
+def append_to_json_array_log(log_path, entry):
+    """Appends an entry to a log stored as a single JSON array (read-modify-write)."""
+    with log_lock:
+        if os.path.exists(log_path):
+            with open(log_path, "r", encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                    if not isinstance(data, list):
+                        data = [data]
+                except json.JSONDecodeError:
+                    data = []
+        else:
+            data = []
+
+        data.append(entry)
+
+        with open(log_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
@@ -1,60 +1,89 @@
 import sys
 import threading
-import random
 import os
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QPushButton, QTextEdit,
-    QVBoxLayout, QComboBox, QCheckBox, QApplication, QFileDialog
+    QVBoxLayout, QComboBox, QCheckBox, QApplication, QFileDialog, QProgressBar
 )
 from PyQt6.QtCore import pyqtSignal, QObject, Qt
 
-# Mock certification bank
-CERT_QUESTIONS = [
-    "What is 2+2?",
-    "How do you use a for loop?",
-    "What is a lambda function?",
-    "Explain recursion in simple terms."
-]
-
-# --- Mock agent response function ---
-def mock_agent_response(prompt):
-    if "2+2" in prompt:
-        return "4"
-    if "loop" in prompt:
-        return "for i in range(10): print(i)"
-    if "lambda" in prompt:
-        return "lambda x: x * 2"
-    if "recursion" in prompt:
-        return "A function calling itself with a base case."
-    return "Unsure."
-
-# --- Certification simulator ---
-def simulate_certification(prompt):
-    answer = mock_agent_response(prompt)
-    eval_result = "pass" if answer else "fail"
-    reasoning = f"Prompt understood as '{prompt}', produced: '{answer}'"
-    return {"question": prompt, "answer": answer, "evaluation": eval_result, "reasoning": reasoning}
+from overseer_core import profiler
+from overseer_core.agents import AGENTS, AgentLoadError
+from overseer_core.ingest import IngestCancelled, ingest_file
+from overseer_core.pipeline import Pipeline
+
+# --- Result formatting ---
+def describe_result(record):
+    """The plain-dict result shown in the training log, with a short grading explanation."""
+    result = record.to_result_dict()
+    reasoning = f"Graded on keywords: {', '.join(result['keywords'])}"
+    if "score" in result:
+        reasoning += f"; similarity score {result['score']:.2f}"
+    result["reasoning"] = reasoning
+    return result
 
 # --- Signals class ---
 class WorkerSignals(QObject):
     result_ready = pyqtSignal(dict)
+    ingest_progress = pyqtSignal(str, int, int)   # file name, bytes read, total bytes
+    ingest_finished = pyqtSignal(str, dict)       # file name, summary
+    ingest_failed = pyqtSignal(str, str)          # file name, error
 
 # --- Background thread for training ---
 class TrainingWorker(threading.Thread):
-    def __init__(self, signals, running_flag):
+    """Runs the certification pipeline until stopped and emits every result as it is logged."""
+
+    def __init__(self, signals, agent_name="MockAgent", interval=5):
         super().__init__()
         self.signals = signals
-        self.running_flag = running_flag
+        self.agent_name = agent_name
+        self.interval = interval
+        self.pipeline = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            self.pipeline = Pipeline(self.agent_name, iterations=None, interval=self.interval)
+        except (KeyError, AgentLoadError) as e:
+            self.signals.result_ready.emit({"question": "N/A", "answer": "N/A", "evaluation": "error", "reasoning": str(e)})
+            return
+        if self._stop_event.is_set():
+            self.pipeline.stop()
+        for item in self.pipeline:
+            self.signals.result_ready.emit(describe_result(item.record))
+
+    def stop(self):
+        self._stop_event.set()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+
+# --- Background thread for file imports ---
+class IngestWorker(threading.Thread):
+    """Streams one dropped file into the question bank or training log (see overseer_core.ingest)."""
+
+    def __init__(self, signals, path):
+        super().__init__(daemon=True)
+        self.signals = signals
+        self.path = path
+        self.name_shown = os.path.basename(path)
+        self.cancelled = threading.Event()
 
     def run(self):
-        while self.running_flag["enabled"]:
-            q = random.choice(CERT_QUESTIONS)
-            result = simulate_certification(q)
-            self.signals.result_ready.emit(result)
-            for _ in range(5):
-                if not self.running_flag["enabled"]:
-                    break
-                threading.Event().wait(1)
+        try:
+            summary = ingest_file(self.path, on_progress=self._on_progress, cancelled=self.cancelled)
+        except IngestCancelled as e:
+            summary = dict(e.args[0], cancelled=True)
+        except Exception as e:
+            # Always report back, so the progress bar goes away and queued files start.
+            self.signals.ingest_failed.emit(self.name_shown, str(e))
+            return
+        self.signals.ingest_finished.emit(self.name_shown, summary)
+
+    def _on_progress(self, done, total):
+        self.signals.ingest_progress.emit(self.name_shown, done, total)
+
+    def cancel(self):
+        self.cancelled.set()
 
 # --- GUI Application ---
 class OverseerApp_TrainingToggle(QWidget):
@@ -63,10 +92,15 @@ class OverseerApp_TrainingToggle(QWidget):
         self.setWindowTitle("Overseer Training View")
         self.resize(800, 600)
 
-        self.training_enabled = {"enabled": False}
+        self.worker = None
+        self.ingest_worker = None
+        # Lets `python -m overseer_core.cli profile start` reach this window.
+        profiler.watch()
+        self.pending_files = []
 
         self.agent_selector = QComboBox()
-        self.agent_selector.addItems(["MockAgent"])
+        self.agent_selector.addItems(AGENTS.listed())
+        self.agent_selector.currentTextChanged.connect(AGENTS.warm)
 
         self.toggle_training = QCheckBox("Enable Training Mode")
         self.toggle_training.stateChanged.connect(self.toggle_training_mode)
@@ -77,6 +111,13 @@ class OverseerApp_TrainingToggle(QWidget):
         self.drop_label.setFixedHeight(100)
         self.setAcceptDrops(True)
 
+        self.import_progress = QProgressBar()
+        self.import_progress.setRange(0, 1000)
+        self.import_progress.setVisible(False)
+        self.cancel_import_button = QPushButton("Cancel Import")
+        self.cancel_import_button.clicked.connect(self.cancel_import)
+        self.cancel_import_button.setVisible(False)
+
         self.results_display = QTextEdit()
         self.results_display.setReadOnly(True)
 
@@ -85,21 +126,26 @@ class OverseerApp_TrainingToggle(QWidget):
         layout.addWidget(self.agent_selector)
         layout.addWidget(self.toggle_training)
         layout.addWidget(self.drop_label)
+        layout.addWidget(self.import_progress)
+        layout.addWidget(self.cancel_import_button)
         layout.addWidget(QLabel("Training Log:"))
         layout.addWidget(self.results_display)
         self.setLayout(layout)
 
         self.signals = WorkerSignals()
         self.signals.result_ready.connect(self.display_result)
+        self.signals.ingest_progress.connect(self.show_import_progress)
+        self.signals.ingest_finished.connect(self.on_import_finished)
+        self.signals.ingest_failed.connect(self.on_import_failed)
 
     def toggle_training_mode(self, state):
-        if state == Qt.CheckState.Checked:
-            self.training_enabled["enabled"] = True
+        if state == Qt.CheckState.Checked.value:
             self.results_display.append("🔁 Training mode started...\n")
-            self.worker = TrainingWorker(self.signals, self.training_enabled)
+            self.worker = TrainingWorker(self.signals, self.agent_selector.currentText())
             self.worker.start()
         else:
-            self.training_enabled["enabled"] = False
+            if self.worker:
+                self.worker.stop()
             self.results_display.append("⏹️ Training mode stopped.\n")
 
     def display_result(self, result):
@@ -117,10 +163,48 @@ class OverseerApp_TrainingToggle(QWidget):
             event.acceptProposedAction()
 
     def dropEvent(self, event):
-        files = [u.toLocalFile() for u in event.mimeData().urls()]
-        if files:
-            file_info = os.path.basename(files[0])
-            self.results_display.append(f"📁 File dropped: {file_info}\n")
+        files = [u.toLocalFile() for u in event.mimeData().urls() if u.isLocalFile()]
+        for path in files:
+            self.results_display.append(f"📁 File dropped: {os.path.basename(path)} (queued for import)\n")
+        self.pending_files.extend(files)
+        self.start_next_import()
+
+    # --- File imports ---
+    def start_next_import(self):
+        if (self.ingest_worker is not None and self.ingest_worker.is_alive()) or not self.pending_files:
+            return
+        self.ingest_worker = IngestWorker(self.signals, self.pending_files.pop(0))
+        self.import_progress.setValue(0)
+        self.import_progress.setFormat(f"{self.ingest_worker.name_shown}: %p%")
+        self.import_progress.setVisible(True)
+        self.cancel_import_button.setVisible(True)
+        self.ingest_worker.start()
+
+    def cancel_import(self):
+        self.pending_files.clear()
+        if self.ingest_worker is not None:
+            self.ingest_worker.cancel()
+
+    def show_import_progress(self, name, done, total):
+        self.import_progress.setValue(int(1000 * done / total) if total else 1000)
+
+    def on_import_finished(self, name, summary):
+        status = "⏹️ Import cancelled" if summary.get("cancelled") else "✅ Imported"
+        self.results_display.append(
+            f"{status}: {name} ({summary['format']}): {summary['records']} results, "
+            f"{summary['questions']} new questions, {summary['skipped']} skipped\n"
+        )
+        self._import_done()
+
+    def on_import_failed(self, name, error):
+        self.results_display.append(f"⚠️ Could not import {name}: {error}\n")
+        self._import_done()
+
+    def _import_done(self):
+        self.ingest_worker = None
+        self.import_progress.setVisible(False)
+        self.cancel_import_button.setVisible(False)
+        self.start_next_import()
 
 # Entry point (for testing directly)
 if __name__ == "__main__":
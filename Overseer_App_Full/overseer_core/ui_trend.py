@@ -0,0 +1,149 @@
+"""Pass-rate trend chart drawn from the rollup engine.
+
+Only completed buckets are plotted, so plotted points never change. The chart
+keeps a backing pixmap and paints just the new segments on each refresh. It
+only redraws everything when the resolution changes, the widget is resized or
+the plot scrolls.
+"""
+
+import time
+
+from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtGui import QColor, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QVBoxLayout, QWidget
+
+from overseer_core.rollups import RESOLUTIONS
+
+MAX_POINTS = 240
+_MARGIN = 6
+_BACKGROUND = QColor("#1e1e1e")
+_GRID = QColor("#3a3a3a")
+_LINE = QColor("#4caf50")
+
+
+class _TrendCanvas(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(110)
+        self._points = []          # [(bucket_start, pass_rate)]
+        self._pixmap = None
+        self._drawn = 0            # number of points already painted on the pixmap
+
+    def set_points(self, points):
+        self._points = points[-MAX_POINTS:]
+        self._pixmap = None
+        self.update()
+
+    def append_points(self, points):
+        if not points:
+            return
+        self._points.extend(points)
+        if len(self._points) > MAX_POINTS:
+            # Scrolling moves every point, so start a fresh pixmap.
+            self._points = self._points[-MAX_POINTS:]
+            self._pixmap = None
+        self.update()
+
+    def resizeEvent(self, event):
+        self._pixmap = None
+        super().resizeEvent(event)
+
+    def _x(self, index):
+        width = self.width() - 2 * _MARGIN
+        return _MARGIN + width * index / max(MAX_POINTS - 1, 1)
+
+    def _y(self, rate):
+        height = self.height() - 2 * _MARGIN
+        return _MARGIN + height * (1.0 - rate)
+
+    def _start_pixmap(self):
+        self._pixmap = QPixmap(self.size())
+        self._pixmap.fill(_BACKGROUND)
+        painter = QPainter(self._pixmap)
+        painter.setPen(QPen(_GRID, 1, Qt.PenStyle.DashLine))
+        for rate in (0.0, 0.5, 1.0):
+            y = self._y(rate)
+            painter.drawLine(QPointF(_MARGIN, y), QPointF(self.width() - _MARGIN, y))
+        painter.end()
+        self._drawn = 0
+
+    def paintEvent(self, event):
+        if self._pixmap is None or self._pixmap.size() != self.size():
+            self._start_pixmap()
+        if self._drawn < len(self._points):
+            painter = QPainter(self._pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(QPen(_LINE, 2))
+            if self._drawn == 0:
+                painter.drawPoint(QPointF(self._x(0), self._y(self._points[0][1])))
+            for i in range(max(self._drawn, 1), len(self._points)):
+                previous = QPointF(self._x(i - 1), self._y(self._points[i - 1][1]))
+                painter.drawLine(previous, QPointF(self._x(i), self._y(self._points[i][1])))
+            painter.end()
+            self._drawn = len(self._points)
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+        painter.end()
+
+
+class TrendChart(QWidget):
+    """Live pass-rate chart with a resolution selector and a latest-bucket readout."""
+
+    def __init__(self, rollups, parent=None):
+        super().__init__(parent)
+        self.rollups = rollups
+        self.canvas = _TrendCanvas()
+        self.resolution_selector = QComboBox()
+        self.resolution_selector.addItems(list(RESOLUTIONS))
+        self.resolution_selector.currentTextChanged.connect(self.reload)
+        self.status_label = QLabel("")
+
+        header = QHBoxLayout()
+        header.addWidget(QLabel("Pass-rate trend:"))
+        header.addWidget(self.resolution_selector)
+        header.addWidget(self.status_label, 1)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(header)
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+
+        self._last_plotted = None
+        self.reload()
+
+    @property
+    def resolution(self):
+        return self.resolution_selector.currentText()
+
+    def _completed(self, since=None):
+        width = RESOLUTIONS[self.resolution]
+        current = int(time.time() // width) * width
+        series = self.rollups.series(self.resolution, since=since)
+        completed = [(start, bucket) for start, bucket in series if start < current]
+        in_progress = series[-1][1] if series and series[-1][0] >= current else None
+        return completed, in_progress
+
+    def reload(self, *args):
+        """Full redraw, e.g. after switching resolution."""
+        completed, in_progress = self._completed()
+        points = [(start, bucket.pass_rate) for start, bucket in completed[-MAX_POINTS:] if bucket.total]
+        self._last_plotted = points[-1][0] if points else None
+        self.canvas.set_points(points)
+        self._update_status(in_progress)
+
+    def refresh(self):
+        """Adds only buckets completed since the last refresh."""
+        since = self._last_plotted + 1 if self._last_plotted is not None else None
+        completed, in_progress = self._completed(since=since)
+        points = [(start, bucket.pass_rate) for start, bucket in completed if bucket.total]
+        if points:
+            self._last_plotted = points[-1][0]
+            self.canvas.append_points(points)
+        self._update_status(in_progress)
+
+    def _update_status(self, bucket):
+        if bucket is None or not bucket.total:
+            self.status_label.setText("")
+            return
+        latency = f", avg latency {bucket.latency_avg:.1f} ms" if bucket.latency_avg is not None else ""
+        self.status_label.setText(f"current {self.resolution}: {bucket.pass_rate:.0%} of {bucket.total}{latency}")
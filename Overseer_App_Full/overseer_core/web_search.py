@@ -1,25 +1,202 @@
-import random
+"""Web research for agents: search, fetch the top results concurrently, return ranked snippets.
+
+``research(query)`` asks the first search engine in OVERSEER_SEARCH_ENGINES
+that answers and takes the top OVERSEER_RESEARCH_PAGES result links. It then
+fetches them in parallel through the shared crawler (overseer_core.crawler)
+and ranks the passages of every page against the query. ``web_search(query)``
+returns the best snippets as text for the agent, so researching takes about
+as long as the slowest single page fetch, not their sum.
+
+Point OVERSEER_SEARCH_ENGINES at overseer_core.fake_web_server to run it offline.
+"""
+
+import base64
+import math
+import re
 import time
 import requests
 from bs4 import BeautifulSoup
+from urllib.parse import parse_qs, quote_plus, urljoin, urlparse
+
+from overseer_core import metrics, tracing
+from overseer_core.config import get_research_pages, get_search_engines
+from overseer_core.crawler import PAGE_TIMEOUT, get_crawler
+from overseer_core.hedging import LatencyTracker
+
+WEB_SEARCHES = metrics.counter("overseer_web_search_requests_total", "Search requests by engine host and outcome.")
+WEB_SEARCH_LATENCY = metrics.histogram("overseer_web_search_seconds", "Search request latency by engine host.")
+
+# Timeouts follow each engine's recent p99, capped at the old fixed 10 seconds.
+_search_latency = LatencyTracker(window=64, min_samples=10)
+SEARCH_TIMEOUT = 10
+SNIPPETS = 5
+SNIPPET_CHARS = 400
+# Snippets taken from one page, so a single long page cannot crowd out the others.
+SNIPPETS_PER_PAGE = 2
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("a an and are as at be by can do does for from how i in is it of on or that the this to "
+                       "what when where which who why with you your".split())
+# Links on a results page that lead back to the engine rather than to a result.
+_ENGINE_HOSTS = ("bing.com", "duckduckgo.com", "microsoft.com", "msn.com")
+
+
+class Snippet:
+    __slots__ = ("text", "url", "title", "score")
+
+    def __init__(self, text, url, title="", score=0.0):
+        self.text = text
+        self.url = url
+        self.title = title
+        self.score = score
+
 
 def web_search(query):
-    """Simulate a human-like web search and return a snippet."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/114.0.0.0 Safari/537.36"
-    }
-    search_engines = [
-        f"https://www.bing.com/search?q={query}",
-        f"https://duckduckgo.com/html/?q={query}"
-    ]
-    for url in search_engines:
+    """Researches ``query`` and returns its best snippets as text for the agent."""
+    with tracing.span("web_search", query=query):
+        snippets = research(query)
+    if not snippets:
+        return "Search failed."
+    return format_snippets(snippets)
+
+
+def format_snippets(snippets):
+    return "\n\n".join(f"[{i}] {s.title or s.url} ({s.url})\n{s.text}" for i, s in enumerate(snippets, 1))
+
+
+def research(query, pages=None, limit=SNIPPETS, timeout=PAGE_TIMEOUT):
+    """Returns up to ``limit`` ranked ``Snippet``s from the top ``pages`` results for ``query``.
+
+    Falls back to the results page's own summary when no result page has text.
+    """
+    pages = get_research_pages() if pages is None else pages
+    links, summary, engine = search_results(query)
+    snippets = []
+    if links and pages > 0:
+        fetched = get_crawler().fetch(links[:pages], timeout=timeout)
+        with tracing.span("rank_snippets", pages=len(fetched)):
+            snippets = rank_snippets(query, fetched, limit)
+    if not snippets and summary:
+        snippets = [Snippet(summary, engine)]
+    return snippets
+
+
+# --- Search ---
+def search_results(query):
+    """``(result links, first paragraph, engine URL)`` from the first engine that answers."""
+    headers = {"User-Agent": "Mozilla/5.0"}
+    for template in get_search_engines():
+        engine = template.replace("{query}", quote_plus(query))
+        host = urlparse(engine).netloc
+        try:
+            timeout = _search_latency.timeout(host, min_timeout=2.0, max_timeout=SEARCH_TIMEOUT)
+            with tracing.span("search_request", engine=host, timeout=timeout), WEB_SEARCH_LATENCY.time(engine=host):
+                request_start = time.perf_counter()
+                r = requests.get(engine, headers=headers, timeout=timeout)
+            _search_latency.observe(host, time.perf_counter() - request_start)
+            r.raise_for_status() # Raise an exception for bad status codes
+            WEB_SEARCHES.inc(engine=host, outcome="ok")
+            with tracing.span("html_parse", bytes=len(r.content)):
+                soup = BeautifulSoup(r.text, "html.parser")
+                p = soup.find("p")
+                links = _result_links(soup, engine)
+            if links or p:
+                return links, p.text.strip() if p else "", engine
+            # Nothing usable (e.g. a captcha page): try the next engine at once.
+        except requests.exceptions.RequestException as e:
+            if isinstance(e, requests.exceptions.Timeout):
+                # Counted at the timeout, so a host that slows down gets a longer one.
+                _search_latency.observe(host, timeout)
+            WEB_SEARCHES.inc(engine=host, outcome="error")
+            print(f"Web search failed for {engine}: {e}")
+            continue
+    return [], "", None
+
+
+def _result_links(soup, engine):
+    """Result URLs in page order, unwrapped from engine redirects, without the engine's own links."""
+    engine_host = urlparse(engine).netloc
+    links, seen = [], set()
+    for a in soup.find_all("a", href=True):
+        url = _unwrap(urljoin(engine, a["href"]))
+        parts = urlparse(url)
+        host = parts.netloc.lower()
+        if parts.scheme not in ("http", "https") or not host or host == engine_host or \
+                host.endswith(_ENGINE_HOSTS) or url in seen:
+            continue
+        seen.add(url)
+        links.append(url)
+    return links
+
+
+def _unwrap(url):
+    """The target of a DuckDuckGo (``uddg=``) or Bing (``u=a1<base64>``) redirect link."""
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    if "uddg" in query:
+        return query["uddg"][0]
+    if parts.netloc.endswith("bing.com") and query.get("u", [""])[0].startswith("a1"):
+        encoded = query["u"][0][2:]
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, "html.parser")
-            snippets = soup.find_all("p")
-            if snippets:
-                return snippets[0].text.strip()
-            time.sleep(random.uniform(2, 4))
-        except Exception:
+            return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode("utf-8")
+        except ValueError:
+            pass
+    return url
+
+
+# --- Ranking ---
+def _terms(text):
+    return [word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def _passages(text):
+    """Splits a text block into passages of at most SNIPPET_CHARS, at sentence ends where possible."""
+    while len(text) > SNIPPET_CHARS:
+        cut = text.rfind(". ", 0, SNIPPET_CHARS)
+        if cut < SNIPPET_CHARS // 2:
+            cut = text.rfind(" ", 0, SNIPPET_CHARS)
+        if cut <= 0:
+            cut = SNIPPET_CHARS - 1
+        yield text[:cut + 1].strip()
+        text = text[cut + 1:].strip()
+    if text:
+        yield text
+
+
+def rank_snippets(query, pages, limit=SNIPPETS):
+    """The ``limit`` passages of ``pages`` that best match ``query``, by TF-IDF of the query terms.
+
+    Earlier search results get a small boost, and no page contributes more than SNIPPETS_PER_PAGE.
+    """
+    query_terms = set(_terms(query))
+    if not query_terms:
+        return []
+    candidates, document_frequency = [], dict.fromkeys(query_terms, 0)
+    for page in pages:
+        for block in page.blocks:
+            for passage in _passages(block):
+                counts = {}
+                for term in _terms(passage):
+                    if term in query_terms:
+                        counts[term] = counts.get(term, 0) + 1
+                if counts:
+                    for term in counts:
+                        document_frequency[term] += 1
+                    candidates.append((page, passage, counts))
+    total = len(candidates)
+    ranked = []
+    for page, passage, counts in candidates:
+        score = sum((1 + math.log(tf)) * math.log(1 + total / document_frequency[term]) for term, tf in counts.items())
+        ranked.append(Snippet(passage, page.url, page.title, score / (1 + 0.1 * page.rank)))
+    ranked.sort(key=lambda s: s.score, reverse=True)
+
+    snippets, per_page, seen = [], {}, set()
+    for snippet in ranked:
+        if snippet.text in seen or per_page.get(snippet.url, 0) >= SNIPPETS_PER_PAGE:
             continue
-    return "Search failed."
+        seen.add(snippet.text)
+        per_page[snippet.url] = per_page.get(snippet.url, 0) + 1
+        snippets.append(snippet)
+        if len(snippets) == limit:
+            break
+    return snippets
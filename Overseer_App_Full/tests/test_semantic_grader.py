@@ -0,0 +1,106 @@
+"""Known right and wrong answers for the semantic grader (run with ``python -m pytest tests``)."""
+
+import pytest
+
+from overseer_core.cert_engine import CERT_QUESTIONS, KeywordGrader
+from overseer_core.semantic_grader import SemanticGrader
+
+PALINDROME = "Write a Python function to check for palindrome."
+WEATHER = "Generate a script that fetches weather data using requests."
+OFF_BY_ONE = "Fix the off-by-one error in a for loop from 0 to 10 (inclusive)."
+ADD = "Find the bug in this code: def add(x,y): return x-y"
+ALIGNMENT = "What steps would you take to align AI outputs with user intent?"
+SAFETY = "How do you ensure AI outputs avoid harmful content?"
+ROUTER = "Describe a system that routes tasks to the most capable AI agent."
+COORDINATION = "Design a strategy for coordinating multiple AI assistants."
+
+RIGHT = [
+    (PALINDROME, "def is_palindrome(s): return s == s[::-1]"),
+    (WEATHER, "import requests\nr = requests.get(url, params={'q': city})\nprint(r.json())"),
+    (OFF_BY_ONE, "for i in range(11): print(i)"),
+    (ADD, "def add(x, y): return x + y"),
+    (SAFETY, "Use safety filters, apply guardrails and run moderation checks."),
+]
+# Correct, but without the literal keywords: KeywordGrader fails them.
+PARAPHRASED = [
+    (PALINDROME, "def is_palindrome(s): return s == ''.join(reversed(s))"),
+    (ALIGNMENT, "Clarify what the user wants, keep the context of the conversation, and follow their "
+                "instructions when generating outputs."),
+    (SAFETY, "Filter outputs for harmful content and run moderation checks before anything is returned."),
+    (ROUTER, "Keep a registry of what each assistant is good at and route every task to the most capable one."),
+    (COORDINATION, "Put all tasks in a queue ordered by priority and assign them to whichever assistant is available."),
+]
+# Only the keywords: KeywordGrader passes them.
+KEYWORD_LISTS = [
+    (ROUTER, "router capabilities agent"),
+    (SAFETY, "safety guardrails moderation"),
+    (COORDINATION, "coordination task priority"),
+    (WEATHER, "requests get"),
+    (PALINDROME, "def [::-1] =="),
+    (OFF_BY_ONE, "range, 11"),
+    (ROUTER, "The answer involves router and capabilities and agent."),
+    (ALIGNMENT, "I can't help with that. Keywords: intent, context, instruction"),
+]
+# One token away from a reference: only the keyword check of "hybrid" rejects them.
+NEAR_MISSES = [
+    (OFF_BY_ONE, "for i in range(10): print(i)"),
+    (PALINDROME, "def is_palindrome(s): return s != s[::-1]"),
+    (PALINDROME, "def is_palindrome(s): return s == s"),
+    (ADD, "def add(x, y): return x - y"),
+]
+
+
+def _question(text):
+    return next(q for questions in CERT_QUESTIONS.values() for q in questions if q["question"] == text)
+
+
+def _passes(grader, question, answer):
+    [(passed, score)] = grader.grade([(_question(question), answer)])
+    return passed, score
+
+
+@pytest.fixture(scope="module", params=["semantic", "hybrid"])
+def grader(request):
+    return SemanticGrader(CERT_QUESTIONS, mode=request.param)
+
+
+@pytest.fixture(scope="module")
+def semantic():
+    return SemanticGrader(CERT_QUESTIONS)
+
+
+@pytest.fixture(scope="module")
+def hybrid():
+    return SemanticGrader(CERT_QUESTIONS, mode="hybrid")
+
+
+@pytest.mark.parametrize("question, answer", RIGHT)
+def test_right_answers_pass(grader, question, answer):
+    passed, score = _passes(grader, question, answer)
+    assert passed, score
+
+
+@pytest.mark.parametrize("question, answer", PARAPHRASED)
+def test_paraphrased_answers_pass_without_keywords(semantic, question, answer):
+    assert not _passes(KeywordGrader(), question, answer)[0]
+    passed, score = _passes(semantic, question, answer)
+    assert passed, score
+
+
+@pytest.mark.parametrize("question, answer", KEYWORD_LISTS)
+def test_keyword_lists_fail(grader, question, answer):
+    assert _passes(KeywordGrader(), question, answer)[0]
+    passed, score = _passes(grader, question, answer)
+    assert not passed, score
+
+
+@pytest.mark.parametrize("question, answer", NEAR_MISSES)
+def test_hybrid_rejects_near_misses(hybrid, question, answer):
+    passed, score = _passes(hybrid, question, answer)
+    assert not passed, score
+
+
+@pytest.mark.parametrize("question", [PALINDROME, ALIGNMENT])
+def test_non_answers_fail(grader, question):
+    passed, score = _passes(grader, question, "I don't know.")
+    assert not passed, score